@@ -0,0 +1,41 @@
+"""
+Allocations per hand when reading the canonical card list - before (create_french_cards on every access) and after (shared card table)
+
+Run with `python benchmarks/bench_card_table.py`
+"""
+
+from playingcardsplus.MultiplayerGames.deck import MultiPlayerDeck
+from playingcardsplus.utils import create_french_cards
+
+import time
+import tracemalloc
+
+
+HANDS = 10_000
+
+
+def measure(name, read_cards):
+    kept = [] # keep every result alive so tracemalloc sees what each hand allocated
+    tracemalloc.start()
+    start_bytes, _ = tracemalloc.get_traced_memory()
+    start_blocks = len(tracemalloc.take_snapshot().traces)
+    for _ in range(HANDS):
+        kept.append(read_cards())
+    end_bytes, _ = tracemalloc.get_traced_memory()
+    end_blocks = len(tracemalloc.take_snapshot().traces)
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for _ in range(HANDS):
+        read_cards()
+    elapsed = time.perf_counter() - started
+
+    print("{:<28} {:>10.1f} bytes/hand {:>8.2f} blocks/hand {:>8.2f} us/hand".format(
+        name, (end_bytes - start_bytes) / HANDS, (end_blocks - start_blocks) / HANDS, elapsed / HANDS * 1e6
+    ))
+
+
+if __name__ == "__main__":
+    deck = MultiPlayerDeck(name="Benchmark_Deck", joker_count=2)
+    measure("before: create_french_cards", lambda: create_french_cards(joker_count=deck.joker_count))
+    measure("after: deck.cards", lambda: deck.cards)
@@ -0,0 +1,42 @@
+"""
+Cost per game of building a fresh Dynamite game vs resetting a finished one (Game.reset), and Simulator throughput with reuse_games
+
+Run with `python benchmarks/bench_game_reuse.py` from the repository root
+"""
+
+import time
+
+from playingcardsplus.MultiplayerGames.games.dynamite import make_dynamite_game, make_dynamite_instruction_set
+from playingcardsplus.MultiplayerGames.simulator import Simulator
+
+
+GAMES = 2000
+MAX_HANDS = 10
+
+
+def measure_setup():
+    started = time.perf_counter()
+    for seed in range(GAMES):
+        make_dynamite_game(seed)
+    built = (time.perf_counter() - started) / GAMES
+
+    game = make_dynamite_game(0)
+    started = time.perf_counter()
+    for seed in range(GAMES):
+        game.reset(seed)
+    reset = (time.perf_counter() - started) / GAMES
+    print("{:<24} {:>8.1f} us/game".format("build", built * 1e6))
+    print("{:<24} {:>8.1f} us/game ({:.1f}x)".format("reset", reset * 1e6, built / reset))
+
+
+def measure_simulator(reuse_games):
+    simulator = Simulator(make_dynamite_game, make_dynamite_instruction_set(), game_count=GAMES, worker_count=0, max_hands=MAX_HANDS, reuse_games=reuse_games)
+    for _ in simulator.run():
+        pass
+    print("{:<24} {:>8.1f} games/s".format("simulator, reuse" if reuse_games else "simulator", simulator.report.games_per_second))
+
+
+if __name__ == "__main__":
+    measure_setup()
+    measure_simulator(False)
+    measure_simulator(True)
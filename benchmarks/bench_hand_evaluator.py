@@ -0,0 +1,37 @@
+"""
+Hands/sec of the 7 card evaluators - lookup tables (one at a time & batched) against the mask-based batch evaluator & the reference
+
+Run with `python benchmarks/bench_hand_evaluator.py` from the repository root. The first run builds the tables into the cache directory
+"""
+
+import time
+
+import numpy as np
+
+from playingcardsplus.MultiplayerGames.games.hand_evaluator import HandEvaluator, load_tables
+from playingcardsplus.MultiplayerGames.games.poker_hands import evaluate_best, evaluate_seven_batch
+
+
+HAND_COUNT = 1_000_000
+
+
+def measure(name, func, hand_count):
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    print("{:<24} {:>14,.0f} hands/sec".format(name, hand_count / elapsed))
+
+
+if __name__ == "__main__":
+    started = time.perf_counter()
+    load_tables()
+    print("tables loaded in {:.3f} s".format(time.perf_counter() - started))
+
+    hands = np.random.default_rng(0).random((HAND_COUNT, 52)).argsort(axis=1)[:, :7]
+    evaluator = HandEvaluator()
+    few = hands[:HAND_COUNT // 20].tolist()
+
+    measure("lookup batch", lambda: evaluator.evaluate_batch(hands), HAND_COUNT)
+    measure("mask batch", lambda: evaluate_seven_batch(hands), HAND_COUNT)
+    measure("lookup one at a time", lambda: [evaluator.evaluate(hand) for hand in few], len(few))
+    measure("reference", lambda: [evaluate_best(hand) for hand in few[:len(few) // 10]], len(few) // 10)
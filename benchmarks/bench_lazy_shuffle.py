@@ -0,0 +1,63 @@
+"""
+Cost of shuffling & drawing a Hold'em hand's worth of cards (2 per player + 5 board + 3 burns) - full shuffle vs lazy_shuffle.
+Measured for the unused pile alone & for a whole MultiPlayerDeck, where pydantic construction takes most of the time
+
+Run with `python benchmarks/bench_lazy_shuffle.py` from the repository root
+"""
+
+import time
+from collections import deque
+
+from playingcardsplus.MultiplayerGames.deck import LazyUnusedPile, MultiPlayerDeck
+from playingcardsplus.deck import DeckType, get_card_table
+from playingcardsplus.rng import make_rng
+
+
+DECKS = 20_000
+PLAYERS = 6
+DRAWN = 2 * PLAYERS + 5 + 3
+
+
+def full_shuffle_pile(rng):
+    cards = list(get_card_table(DeckType.FRENCH, 0))
+    rng.shuffle(cards)
+    return deque(cards)
+
+
+def lazy_pile(rng):
+    return LazyUnusedPile(get_card_table(DeckType.FRENCH, 0), rng)
+
+
+def whole_deck(lazy_shuffle):
+    def build(rng):
+        deck = MultiPlayerDeck(name="French_Multi_Player_Deck_NoJoker", joker_count=0, lazy_shuffle=lazy_shuffle, rng=rng)
+        deck._toggle_dealer_assignment()
+        return deck
+    return build
+
+
+def measure(name, build, draw):
+    started = time.perf_counter()
+    for seed in range(DECKS):
+        draw(build(make_rng(seed)))
+    elapsed = time.perf_counter() - started
+    print("{:<28} {:>8.1f} us".format(name, elapsed / DECKS * 1e6))
+    return elapsed
+
+
+def draw_pile(pile):
+    for _ in range(DRAWN):
+        pile.pop()
+
+
+def draw_deck(deck):
+    deck._take_from_unused(DRAWN)
+
+
+if __name__ == "__main__":
+    eager = measure("pile, full shuffle", full_shuffle_pile, draw_pile)
+    lazy = measure("pile, lazy shuffle", lazy_pile, draw_pile)
+    print("speedup: {:.2f}x".format(eager / lazy))
+    eager = measure("deck, full shuffle", whole_deck(False), draw_deck)
+    lazy = measure("deck, lazy shuffle", whole_deck(True), draw_deck)
+    print("speedup: {:.2f}x".format(eager / lazy))
@@ -0,0 +1,27 @@
+"""
+Games per second over a process pool - Simulator sending every hand's records back vs run_into_arena writing final states to shared memory
+
+Run with `python benchmarks/bench_shared_state.py` from the repository root
+"""
+
+import os
+
+from playingcardsplus.MultiplayerGames.games.dynamite import make_dynamite_game, make_dynamite_instruction_set
+from playingcardsplus.MultiplayerGames.shared_state import ArenaLayout, SharedGameArena, run_into_arena
+from playingcardsplus.MultiplayerGames.simulator import Simulator
+
+
+GAMES = 500
+MAX_HANDS = 40
+WORKERS = os.cpu_count() or 1
+
+
+if __name__ == "__main__":
+    simulator = Simulator(make_dynamite_game, make_dynamite_instruction_set(), game_count=GAMES, worker_count=WORKERS, max_hands=MAX_HANDS)
+    for _ in simulator.run():
+        pass
+    print("{:<24} {:>10.1f} games/s".format("Simulator", simulator.report.games_per_second))
+
+    with SharedGameArena.create(ArenaLayout.for_game(make_dynamite_game(seed=0)), row_count=GAMES) as arena:
+        report = run_into_arena(arena, make_dynamite_game, make_dynamite_instruction_set(), worker_count=WORKERS, max_hands=MAX_HANDS)
+        print("{:<24} {:>10.1f} games/s ({} bytes/game)".format("shared memory arena", report.games_per_second, arena.layout.dtype.itemsize))
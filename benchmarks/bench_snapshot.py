@@ -0,0 +1,33 @@
+"""
+Cost of cloning a Dynamite game mid play - Game.snapshot()/restore()/fork() against copy.deepcopy
+
+Run with `python benchmarks/bench_snapshot.py` from the repository root
+"""
+
+import copy
+import timeit
+
+from playingcardsplus.MultiplayerGames.games.dynamite import make_dynamite_game, make_dynamite_instruction_set
+
+
+NUMBER = 2000
+
+
+def measure(name, func, number=NUMBER):
+    elapsed = timeit.timeit(func, number=number) / number
+    print("{:<12} {:>10.1f} us".format(name, elapsed * 1e6))
+    return elapsed
+
+
+if __name__ == "__main__":
+    instruction_implementer = make_dynamite_instruction_set()
+    game = make_dynamite_game(seed=0)
+    game.start_game(instruction_implementer)
+    game.next_hand(instruction_implementer)
+    snapshot = game.snapshot()
+
+    measure("snapshot", game.snapshot)
+    measure("restore", lambda: game.restore(snapshot))
+    fork = measure("fork", game.fork)
+    deepcopy = measure("deepcopy", lambda: copy.deepcopy(game), number=NUMBER // 20)
+    print("fork is {:.0f}x faster than deepcopy".format(deepcopy / fork))
@@ -0,0 +1,37 @@
+"""
+Per-hand cost of Dynamite with and without pydantic validation of GameState/CollectibleData (Game.trusted)
+
+Run with `python benchmarks/bench_trusted_mode.py` from the repository root
+"""
+
+import time
+
+from playingcardsplus.MultiplayerGames.games.dynamite import make_dynamite_game, make_dynamite_instruction_set
+
+
+GAMES = 200
+MAX_HANDS = 40
+
+
+def measure(name, **game_kwargs):
+    instruction_implementer = make_dynamite_instruction_set()
+    hands, elapsed = 0, 0.0
+    for seed in range(GAMES):
+        game = make_dynamite_game(seed=seed, **game_kwargs)
+        started = time.perf_counter()
+        game.start_game(instruction_implementer)
+        played = 1
+        while played < MAX_HANDS and not game.is_over():
+            game.next_hand(instruction_implementer)
+            played += 1
+        elapsed += time.perf_counter() - started
+        hands += played
+    print("{:<32} {:>8.1f} us/hand".format(name, elapsed / hands * 1e6))
+    return elapsed / hands
+
+
+if __name__ == "__main__":
+    validated = measure("validated (default)")
+    sampled = measure("trusted, validate every 10th", trusted=True, validate_every=10)
+    trusted = measure("trusted", trusted=True)
+    print("savings per hand: {:.1f} us ({:.0%})".format((validated - trusted) * 1e6, 1 - trusted / validated))
@@ -0,0 +1,99 @@
+"""
+Vectorized dealing for Monte Carlo runs - deals a whole batch of games in one NumPy call
+
+Each game in the batch is a row of a (batch, deck_size) matrix of card IDs (see playingcardsplus.encoding) in draw order,
+meaning column 0 is the card on top of the unused pile - the first one Dealer.deal would pop.
+Rows are then sliced into player/board/trash pile/unused segments following rules.distribution_ordering & rules.distribution_methods,
+using the same deal plans as Dealer.deal (see deal_plan.py), so everything that comes back is a view into that one matrix rather than Python objects.
+
+Requires NumPy - install the `numpy` extra
+"""
+
+from playingcardsplus.MultiplayerGames.rules import Rules
+from playingcardsplus.MultiplayerGames.deck import Distributee
+from playingcardsplus.custom_error import DealerError
+
+import numpy as np
+from typing_extensions import NamedTuple, List, Optional, Tuple
+
+
+class BatchDeal(NamedTuple):
+    """Card IDs dealt in one hand for every game of the batch"""
+    players: np.ndarray  # (batch, player_count, cards_per_player) - in the order each player received them
+    board: np.ndarray  # (batch, board_count)
+    trash_pile: np.ndarray  # (batch, trash_pile_count)
+    unused: np.ndarray  # (batch, remaining) - top of the pile first
+
+
+class BatchDealer:
+    """
+    Deals `batch_size` games at once for a fixed Rules & player count.
+    Follows the same card flow as Dealer.deal - given the same unused pile it hands out the same cards to the same places
+    """
+
+    def __init__(self, rules: Rules, player_count: int):
+        rules.deal_plan(player_count=player_count, hand_index=0) # fails early on a player count the rules don't support
+        self.__rules = rules
+        self.__player_count = player_count
+
+    @property
+    def rules(self) -> Rules:
+        return self.__rules
+
+    @property
+    def player_count(self) -> int:
+        return self.__player_count
+
+    def permutations(self, batch_size: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """(batch_size, deck_size) matrix where every row is an independently shuffled deck of card IDs"""
+        rng = np.random.default_rng() if rng is None else rng
+        dtype = np.uint8 if self.__rules.deck_size <= 256 else np.uint16
+        deck = np.broadcast_to(np.arange(self.__rules.deck_size, dtype=dtype), (batch_size, self.__rules.deck_size))
+        return rng.permuted(deck, axis=1)
+
+    def __slice_hand(self, permutations: np.ndarray, offset: int, hand_index: int) -> Tuple[BatchDeal, int]:
+        batch_size = permutations.shape[0]
+        plan = self.__rules.deal_plan(player_count=self.__player_count, hand_index=hand_index)
+        if offset + plan.total > permutations.shape[1]:
+            raise DealerError("Ran out of cards while dealing hand {} - need {} but only {} left unused".format(
+                hand_index, plan.total, permutations.shape[1] - offset
+            ))
+
+        hand = permutations[:, offset:offset + plan.total]
+        players = hand[:, 0:0].reshape(batch_size, plan.player_count, 0)
+        board = trash_pile = hand[:, 0:0]
+        for segment in plan.segments:
+            dealt = hand[:, segment.start:segment.start + segment.length]
+            if segment.destination == Distributee.PLAYER:
+                if plan.player_ops and plan.player_ops[0].stride > 1: # one at a time - card j goes to player j % player_count
+                    players = dealt.reshape(batch_size, plan.cards_per_player, plan.player_count).transpose(0, 2, 1)
+                else: # lump - player p receives cards [p*k, (p+1)*k)
+                    players = dealt.reshape(batch_size, plan.player_count, plan.cards_per_player)
+            elif segment.destination == Distributee.BOARD:
+                board = dealt
+            else:
+                trash_pile = dealt
+
+        offset += plan.total
+        return BatchDeal(players=players, board=board, trash_pile=trash_pile, unused=permutations[:, offset:]), offset
+
+    def deal(self, batch_size: int, rng: Optional[np.random.Generator] = None, permutations: Optional[np.ndarray] = None) -> BatchDeal:
+        """Deals the first hand (hand 0) of every game"""
+        return self.deal_hands(batch_size=batch_size, hand_count=1, rng=rng, permutations=permutations)[0]
+
+    def deal_hands(self, batch_size: int, hand_count: int, rng: Optional[np.random.Generator] = None, permutations: Optional[np.ndarray] = None) -> List[BatchDeal]:
+        """
+        Deals hands 0 ~ hand_count-1 back to back from the same shuffled decks.
+        Pass `permutations` (top of the unused pile first) to deal from known decks instead of shuffling
+        """
+        if permutations is None:
+            permutations = self.permutations(batch_size=batch_size, rng=rng)
+        elif permutations.shape[0] != batch_size:
+            raise ValueError("Expected {} permutations but got {}".format(batch_size, permutations.shape[0]))
+
+        deals = []
+        offset = 0
+        for hand_index in range(hand_count):
+            dealt, offset = self.__slice_hand(permutations=permutations, offset=offset, hand_index=hand_index)
+            deals.append(dealt)
+        return deals
@@ -0,0 +1,216 @@
+"""
+Bitset-backed piles that work on card IDs (see playingcardsplus.encoding) - MultiPlayerDeck(backend=DeckBackend.BITSET) keeps its piles in one
+
+Each pile is an int bitmask over card IDs so add/remove/membership/count are bit operations.
+Piles where order matters (unused, board, trash pile) also keep a compact bytearray of card IDs - top of the pile is the end.
+The whole state is 4 ints + 3 short byte strings, so copying, hashing and snapshotting is close to free.
+"""
+
+from playingcardsplus.MultiplayerGames.piles import Distributee
+from playingcardsplus.encoding import CardEncoding
+from playingcardsplus.card import Card, JokerCard
+from playingcardsplus.custom_error import DuplicateCardError, DeckInlclusionError
+
+from typing_extensions import NamedTuple, Iterable, List, Self, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from playingcardsplus.MultiplayerGames.deck import MultiPlayerDeck
+
+
+class BitsetDeckSnapshot(NamedTuple):
+    """Immutable & hashable state of a BitsetDeck"""
+    unused: bytes
+    board: bytes
+    trash_pile: bytes
+    player_hands: int
+
+
+class BitsetDeck:
+    """
+    Piles over card IDs. Mirrors the dealer-facing operations of MultiPlayerDeck.
+    Player hands aren't ordered - just like MultiPlayerDeck, it only tracks what's been handed out to players
+    """
+    __slots__ = ("encoding", "unused", "board", "trash_pile", "unused_mask", "board_mask", "trash_pile_mask", "player_hands_mask")
+
+    def __init__(self, encoding: CardEncoding, unused: Iterable[int] = (), board: Iterable[int] = (), trash_pile: Iterable[int] = (), player_hands_mask: int = 0):
+        if encoding.size > 256:
+            raise ValueError("BitsetDeck stores card IDs as bytes - decks over 256 cards are not supported")
+        self.encoding = encoding
+        self.unused = bytearray(unused)
+        self.board = bytearray(board)
+        self.trash_pile = bytearray(trash_pile)
+        self.unused_mask = BitsetDeck.__mask(self.unused)
+        self.board_mask = BitsetDeck.__mask(self.board)
+        self.trash_pile_mask = BitsetDeck.__mask(self.trash_pile)
+        self.player_hands_mask = player_hands_mask
+
+    @classmethod
+    def __mask(cls, card_ids: Iterable[int]) -> int:
+        mask = 0
+        for card_id in card_ids:
+            mask |= 1 << card_id
+        return mask
+
+    @classmethod
+    def from_deck(cls, deck: "MultiPlayerDeck") -> Self:
+        encoding = deck.encoding
+        card_to_id = encoding.card_to_id
+        player_hands_mask = 0
+        for card, held in deck.player_hands.items():
+            if held:
+                player_hands_mask |= 1 << card_to_id[card]
+        return cls(
+            encoding=encoding,
+            unused=encoding.encode(deck.unused),
+            board=[card_to_id[card] for card, on_board in deck.board.items() if on_board],
+            trash_pile=encoding.encode(deck.trash_pile),
+            player_hands_mask=player_hands_mask,
+        )
+
+    # *** Counts & membership
+    @property
+    def unused_count(self) -> int:
+        return len(self.unused)
+
+    @property
+    def board_count(self) -> int:
+        return len(self.board)
+
+    @property
+    def trash_pile_count(self) -> int:
+        return len(self.trash_pile)
+
+    @property
+    def player_hand_count(self) -> int:
+        return self.player_hands_mask.bit_count()
+
+    def contains(self, distributee: Distributee, card_id: int) -> bool:
+        if distributee == Distributee.UNUSED:
+            return (self.unused_mask >> card_id) & 1 == 1
+        if distributee == Distributee.BOARD:
+            return (self.board_mask >> card_id) & 1 == 1
+        if distributee == Distributee.TRASH_PILE:
+            return (self.trash_pile_mask >> card_id) & 1 == 1
+        return (self.player_hands_mask >> card_id) & 1 == 1
+
+    # *** Same manipulations as MultiPlayerDeck, on card IDs
+    def take_from_unused(self, used_count: int) -> bytes:
+        """Pops from the top - first ID in the result is the card that was on top"""
+        if used_count > len(self.unused):
+            raise DeckInlclusionError("Cannot take {} cards from unused when there are {} left".format(used_count, len(self.unused)))
+        if used_count == 0:
+            return b""
+        used = bytes(self.unused[-used_count:][::-1])
+        del self.unused[-used_count:]
+        for card_id in used:
+            self.unused_mask ^= 1 << card_id
+        return used
+
+    def replenish_unused(self, replenishers: Iterable[int]):
+        """Puts cards at the bottom of unused, keeping their order"""
+        replenishers = bytes(replenishers)
+        for card_id in replenishers:
+            if (self.unused_mask >> card_id) & 1:
+                raise DuplicateCardError()
+            self.unused_mask |= 1 << card_id
+        self.unused[:0] = replenishers
+
+    def add_to_board(self, added: Iterable[int]):
+        for card_id in added:
+            bit = 1 << card_id
+            if self.board_mask & bit:
+                raise DuplicateCardError()
+            self.board_mask |= bit
+            self.board.append(card_id)
+
+    def remove_from_board(self, removed: Iterable[int]) -> bytes:
+        removed = bytes(removed)
+        for card_id in removed:
+            bit = 1 << card_id
+            if not self.board_mask & bit:
+                raise DeckInlclusionError()
+            self.board_mask ^= bit
+            del self.board[self.board.index(card_id)]
+        return removed
+
+    def add_trash(self, trashed: Iterable[int]):
+        for card_id in trashed:
+            bit = 1 << card_id
+            if self.trash_pile_mask & bit:
+                raise DuplicateCardError()
+            self.trash_pile_mask |= bit
+            self.trash_pile.append(card_id)
+
+    def burn_trash(self, burn_count: int) -> bytes:
+        if burn_count > len(self.trash_pile):
+            raise DeckInlclusionError("Cannot burn {} cards from the trash pile when there are {} in it".format(burn_count, len(self.trash_pile)))
+        if burn_count == 0:
+            return b""
+        burnt = bytes(self.trash_pile[-burn_count:][::-1])
+        del self.trash_pile[-burn_count:]
+        for card_id in burnt:
+            self.trash_pile_mask ^= 1 << card_id
+        return burnt
+
+    def give_to_players(self, distributed: Iterable[int]):
+        for card_id in distributed:
+            bit = 1 << card_id
+            if self.player_hands_mask & bit:
+                raise DuplicateCardError()
+            self.player_hands_mask |= bit
+
+    def take_from_players(self, removed: Iterable[int]) -> bytes:
+        removed = bytes(removed)
+        for card_id in removed:
+            bit = 1 << card_id
+            if not self.player_hands_mask & bit:
+                raise DeckInlclusionError()
+            self.player_hands_mask ^= bit
+        return removed
+
+    # *** Views as cards
+    def cards(self, distributee: Distributee) -> List[Card | JokerCard]:
+        if distributee == Distributee.UNUSED:
+            return self.encoding.decode(self.unused)
+        if distributee == Distributee.BOARD:
+            return self.encoding.decode(self.board)
+        if distributee == Distributee.TRASH_PILE:
+            return self.encoding.decode(self.trash_pile)
+        return self.encoding.from_mask(self.player_hands_mask)
+
+    # *** Snapshotting
+    def snapshot(self) -> BitsetDeckSnapshot:
+        return BitsetDeckSnapshot(
+            unused=bytes(self.unused),
+            board=bytes(self.board),
+            trash_pile=bytes(self.trash_pile),
+            player_hands=self.player_hands_mask,
+        )
+
+    def restore(self, snapshot: BitsetDeckSnapshot):
+        self.unused[:] = snapshot.unused
+        self.board[:] = snapshot.board
+        self.trash_pile[:] = snapshot.trash_pile
+        self.unused_mask = BitsetDeck.__mask(snapshot.unused)
+        self.board_mask = BitsetDeck.__mask(snapshot.board)
+        self.trash_pile_mask = BitsetDeck.__mask(snapshot.trash_pile)
+        self.player_hands_mask = snapshot.player_hands
+
+    def copy(self) -> Self:
+        clone = BitsetDeck.__new__(BitsetDeck)
+        clone.encoding = self.encoding
+        clone.unused = self.unused[:]
+        clone.board = self.board[:]
+        clone.trash_pile = self.trash_pile[:]
+        clone.unused_mask = self.unused_mask
+        clone.board_mask = self.board_mask
+        clone.trash_pile_mask = self.trash_pile_mask
+        clone.player_hands_mask = self.player_hands_mask
+        return clone
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BitsetDeck):
+            return NotImplemented
+        return self.encoding is other.encoding and self.snapshot() == other.snapshot()
+
+    __hash__ = None # Mutable - hash the snapshot instead
@@ -1,7 +1,7 @@
 from playingcardsplus.card import Card, JokerCard
 from playingcardsplus.deck import DeckType, CardCountMap
 
-from typing_extensions import Dict
+from typing_extensions import Dict, List
 from pydantic import BaseModel, NonNegativeInt, PositiveInt, model_validator, ValidationError
 
 
@@ -45,4 +45,7 @@ class GameState(BaseModel):
         return self
 
 class CheatingState(BaseModel): #TODO: prob includes some combination of - ordering of unused, trashpile, and what player hands
-    pass
+    """What a player could only know by cheating - every field is optional so games can leak as much as they like"""
+    unused: List[Card | JokerCard] = [] # in pile order, top of the pile last
+    trash_pile: List[Card | JokerCard] = []
+    player_hands: Dict[str, List[Card | JokerCard]] = {} # (k,v) = (player_name, cards they hold)
@@ -0,0 +1,239 @@
+"""
+Append-only binary storage for CollectibleData - one fixed-width record per hand, so memory stays flat no matter how many hands are played
+
+File layout
+-> header: b"PCPD" | version (uint16) | metadata length (uint32) | metadata JSON (deck type, joker count, player names, operations)
+-> records, each of them
+    hand index (uint32)
+    player/unused/board/trash pile states as little-endian bitmasks over card IDs (ceil(deck size / 8) bytes each)
+    player actions as float64 - player-major, operations sorted by name
+    scores as int64 - in the same player order
+
+Board ordering is not kept - bitmasks only say which cards are where
+"""
+
+from playingcardsplus.MultiplayerGames.data import CollectibleData
+from playingcardsplus.deck import DeckType
+from playingcardsplus.encoding import CardEncoding, get_card_encoding
+
+import json
+import mmap
+import struct
+from typing_extensions import NamedTuple, Tuple, Iterator, Dict, Self
+
+try:
+    import numpy as np
+except ImportError: # numpy is an optional extra - only as_arrays() needs it
+    np = None
+
+
+MAGIC = b"PCPD"
+VERSION = 1
+HEADER_PREFIX = struct.Struct("<4sHI")
+
+
+class StoredRecord(NamedTuple):
+    hand_index: int
+    player_state: int # bitmasks over card IDs
+    unused_state: int
+    board_state: int
+    trash_pile_state: int
+    player_actions: Tuple[float, ...] # player-major, (player_count x operation_count)
+    scores: Tuple[int, ...]
+
+
+class StreamMetadata(NamedTuple):
+    deck_type: DeckType
+    joker_count: int
+    player_names: Tuple[str, ...]
+    operations: Tuple[str, ...]
+
+    @property
+    def encoding(self) -> CardEncoding:
+        return get_card_encoding(self.deck_type, self.joker_count)
+
+    @property
+    def mask_size(self) -> int:
+        return (self.encoding.size + 7) // 8
+
+    @property
+    def record_struct(self) -> struct.Struct:
+        player_count = len(self.player_names)
+        return struct.Struct("<I{0}s{0}s{0}s{0}s{1}d{2}q".format(self.mask_size, player_count*len(self.operations), player_count))
+
+
+def _header(metadata: StreamMetadata) -> bytes:
+    payload = json.dumps({
+        "deck_type": metadata.deck_type.value,
+        "joker_count": metadata.joker_count,
+        "player_names": list(metadata.player_names),
+        "operations": list(metadata.operations),
+    }).encode("utf-8")
+    return HEADER_PREFIX.pack(MAGIC, VERSION, len(payload)) + payload
+
+
+class CollectibleDataWriter:
+    """
+    Buffered writer - flushes to disk every `flush_every` records and on close().
+    Appending to an existing file requires the same metadata it was created with
+    """
+
+    def __init__(self, path: str, metadata: StreamMetadata, flush_every: int = 256, buffer_size: int = 1 << 16):
+        self.__metadata = metadata
+        self.__record_struct = metadata.record_struct
+        self.__flush_every = flush_every
+        self.__unflushed = 0
+        self.__file = open(path, "ab", buffering=buffer_size)
+        if self.__file.tell() == 0:
+            self.__file.write(_header(metadata))
+        elif CollectibleDataReader.read_metadata(path) != metadata:
+            self.__file.close()
+            raise ValueError("'{}' was written with different metadata - cannot append to it".format(path))
+
+    @property
+    def metadata(self) -> StreamMetadata:
+        return self.__metadata
+
+    def __mask(self, state: Dict) -> bytes:
+        encoding = self.__metadata.encoding
+        return encoding.to_mask([card for card, present in state.items() if present]).to_bytes(self.__metadata.mask_size, "little")
+
+    def write(self, hand_index: int, data: CollectibleData):
+        actions = []
+        for player_name in self.__metadata.player_names:
+            player_actions = data.player_actions.get(player_name, {})
+            actions.extend(float(player_actions.get(operation, 0)) for operation in self.__metadata.operations)
+
+        self.__file.write(self.__record_struct.pack(
+            hand_index,
+            self.__mask(data.player_state),
+            self.__mask(data.unused_state),
+            self.__mask(data.board_state),
+            self.__mask(data.trash_pile_state),
+            *actions,
+            *(data.scores.get(player_name, 0) for player_name in self.__metadata.player_names),
+        ))
+
+        self.__unflushed += 1
+        if self.__unflushed >= self.__flush_every:
+            self.flush()
+
+    def flush(self):
+        self.__file.flush()
+        self.__unflushed = 0
+
+    def close(self):
+        if not self.__file.closed:
+            self.flush()
+            self.__file.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CollectibleDataReader:
+    """Memory-maps a file written by CollectibleDataWriter. Records are decoded lazily"""
+
+    def __init__(self, path: str):
+        self.__metadata, self.__offset = CollectibleDataReader.__read_header(path)
+        self.__record_struct = self.__metadata.record_struct
+        with open(path, "rb") as file:
+            self.__mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @classmethod
+    def __read_header(cls, path: str) -> Tuple[StreamMetadata, int]:
+        with open(path, "rb") as file:
+            magic, version, length = HEADER_PREFIX.unpack(file.read(HEADER_PREFIX.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("'{}' is not a CollectibleData stream (version {})".format(path, VERSION))
+            payload = json.loads(file.read(length).decode("utf-8"))
+        metadata = StreamMetadata(
+            deck_type=DeckType(payload["deck_type"]),
+            joker_count=payload["joker_count"],
+            player_names=tuple(payload["player_names"]),
+            operations=tuple(payload["operations"]),
+        )
+        return metadata, HEADER_PREFIX.size + length
+
+    @classmethod
+    def read_metadata(cls, path: str) -> StreamMetadata:
+        return CollectibleDataReader.__read_header(path)[0]
+
+    @property
+    def metadata(self) -> StreamMetadata:
+        return self.__metadata
+
+    def __len__(self) -> int:
+        return (len(self.__mmap) - self.__offset) // self.__record_struct.size
+
+    def __getitem__(self, index: int) -> StoredRecord:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        values = self.__record_struct.unpack_from(self.__mmap, self.__offset + index*self.__record_struct.size)
+        player_count = len(self.__metadata.player_names)
+        action_count = player_count*len(self.__metadata.operations)
+        return StoredRecord(
+            hand_index=values[0],
+            player_state=int.from_bytes(values[1], "little"),
+            unused_state=int.from_bytes(values[2], "little"),
+            board_state=int.from_bytes(values[3], "little"),
+            trash_pile_state=int.from_bytes(values[4], "little"),
+            player_actions=values[5:5 + action_count],
+            scores=values[5 + action_count:],
+        )
+
+    def __iter__(self) -> Iterator[StoredRecord]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def to_collectible_data(self, record: StoredRecord) -> CollectibleData:
+        """Back to the in-memory form - board ordering is by card ID"""
+        metadata = self.__metadata
+        encoding = metadata.encoding
+        operation_count = len(metadata.operations)
+        player_actions = {}
+        for player_index, player_name in enumerate(metadata.player_names):
+            actions = record.player_actions[player_index*operation_count:(player_index + 1)*operation_count]
+            player_actions[player_name] = dict(zip(metadata.operations, actions))
+        return CollectibleData(
+            player_actions=player_actions,
+            scores=dict(zip(metadata.player_names, record.scores)),
+            player_state={card: True for card in encoding.from_mask(record.player_state)},
+            unused_state=encoding.one_hot(encoding.from_mask(record.unused_state)),
+            board_state={card: True for card in encoding.from_mask(record.board_state)},
+            trash_pile_state=encoding.one_hot(encoding.from_mask(record.trash_pile_state)),
+        )
+
+    def as_arrays(self) -> "np.ndarray":
+        """
+        Zero-copy structured array over every record - the pile masks come out as raw bytes.
+        Drop the array before close() as it points into the memory map
+        """
+        if np is None:
+            raise ImportError("as_arrays() requires numpy - install the `numpy` extra")
+        metadata = self.__metadata
+        player_count = len(metadata.player_names)
+        dtype = np.dtype([
+            ("hand_index", "<u4"),
+            ("player_state", "V{}".format(metadata.mask_size)),
+            ("unused_state", "V{}".format(metadata.mask_size)),
+            ("board_state", "V{}".format(metadata.mask_size)),
+            ("trash_pile_state", "V{}".format(metadata.mask_size)),
+            ("player_actions", "<f8", (player_count, len(metadata.operations))),
+            ("scores", "<i8", (player_count,)),
+        ])
+        return np.frombuffer(self.__mmap, dtype=dtype, count=len(self), offset=self.__offset)
+
+    def close(self):
+        self.__mmap.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
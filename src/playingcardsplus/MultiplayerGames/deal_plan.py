@@ -0,0 +1,105 @@
+"""
+Rules compiled into flat, immutable dealing instructions per (player_count, hand_index)
+
+Every hand, the dealer draws `total` cards off the top of the unused pile then hands out slices of that draw -
+so dealing becomes a loop over precomputed slices with no rule lookups or string comparisons.
+Hands at or past len(rules.cards_per_player_early_hands) all share the steady-state (hand i) plan.
+
+Use Rules.deal_plan() rather than compile_deal_plan() directly, it memoizes per Rules instance
+"""
+
+from playingcardsplus.MultiplayerGames.deck import Distributee
+from playingcardsplus.dealer import CardDistributionMethod
+from playingcardsplus.custom_error import RuleViolationError, RuleIllFormedError
+
+from typing_extensions import NamedTuple, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from playingcardsplus.MultiplayerGames.rules import Rules
+
+
+class DealOp(NamedTuple):
+    """drawn[start : start + length*stride : stride] goes to the destination"""
+    destination: Distributee
+    recipient: int # player index for player ops, 0 otherwise
+    start: int
+    length: int
+    stride: int
+
+    @property
+    def stop(self) -> int:
+        return self.start + (self.length - 1)*self.stride + 1 if self.length else self.start
+
+
+class DealPlan(NamedTuple):
+    player_count: int
+    hand_index: int # the hand it was compiled for - steady state plans use len(early hands)
+    total: int # cards drawn from unused this hand
+    cards_per_player: int
+    segments: Tuple[DealOp, ...] # one contiguous slice per distributee, in distribution order - what the deck keeps track of
+    player_ops: Tuple[DealOp, ...] # one per player - what each player receives
+
+
+def steady_state_hand_index(rules: "Rules", hand_index: int) -> int:
+    return min(hand_index, len(rules.cards_per_player_early_hands))
+
+
+def compile_deal_plan(rules: "Rules", player_count: int, hand_index: int) -> DealPlan:
+    hand_index = steady_state_hand_index(rules, hand_index)
+    early_hands = len(rules.cards_per_player_early_hands)
+
+    if not rules.player_range[0] <= player_count <= rules.player_range[1]:
+        raise RuleViolationError(
+            "Number of players is out of range! It's suppsoed to support {} ~ {} players but we have {}".format(rules.player_range[0], rules.player_range[1], player_count)
+        )
+
+    cards_per_player = rules.cards_per_player_early_hands[hand_index] if hand_index < early_hands else rules.cards_per_player_hand_i
+    if isinstance(cards_per_player, dict):
+        try:
+            cards_per_player = cards_per_player[player_count]
+        except KeyError:
+            raise RuleViolationError(
+                "Number of players is out of range! It's suppsoed to support {} ~ {} players but we have {}".format(rules.player_range[0], rules.player_range[1], player_count)
+            )
+    elif not isinstance(cards_per_player, int):
+        raise RuleIllFormedError(
+            """Rule about how many cards are supposed to be distributed to each player is illformed."""
+            """ Check {} to see if it's formatted in a Positive Integer or a Dictionary of (K,V) = Player Count, Card to be Distributed""".format(
+                "rules.cards_per_player_early_hands" if hand_index < early_hands else "rules.cards_per_player_hand_i"
+            )
+        )
+    board_count = rules.board_distribution_early_hands[hand_index] if hand_index < early_hands else rules.board_distribution_hand_i
+    trash_pile_count = rules.trash_pile_distribution_early_hands[hand_index] if hand_index < early_hands else rules.trash_pile_distribution_hand_i
+
+    segments, player_ops = [], []
+    offset = 0
+    for distributee in rules.distribution_ordering:
+        if distributee == Distributee.UNUSED:
+            continue # nothing needs to happen where the dealer takes an action actively. May need to happen in reponse to player actions
+        count = {
+            Distributee.PLAYER: cards_per_player*player_count,
+            Distributee.BOARD: board_count,
+            Distributee.TRASH_PILE: trash_pile_count,
+        }[distributee]
+        segments.append(DealOp(destination=distributee, recipient=0, start=offset, length=count, stride=1))
+
+        if distributee == Distributee.PLAYER:
+            try:
+                distribution_method = rules.distribution_methods[distributee]
+            except KeyError:
+                raise RuleIllFormedError("Rules don't say how cards are meant to be distributed to '{}'".format(distributee.value))
+            for player_index in range(player_count):
+                if distribution_method == CardDistributionMethod.ONE_AT_A_TIME: # card j goes to player j % player_count
+                    player_ops.append(DealOp(destination=distributee, recipient=player_index, start=offset + player_index, length=cards_per_player, stride=player_count))
+                else: # each player receives all of their cards at once, one player after another
+                    player_ops.append(DealOp(destination=distributee, recipient=player_index, start=offset + player_index*cards_per_player, length=cards_per_player, stride=1))
+        offset += count
+
+    return DealPlan(
+        player_count=player_count,
+        hand_index=hand_index,
+        total=offset,
+        cards_per_player=cards_per_player,
+        segments=tuple(segments),
+        player_ops=tuple(player_ops),
+    )
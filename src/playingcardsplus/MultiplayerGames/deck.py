@@ -1,5 +1,9 @@
 from playingcardsplus.card import Card, JokerCard
 from playingcardsplus.deck import AbstractDeck
+from playingcardsplus.encoding import CardEncoding, get_card_encoding
+from playingcardsplus.MultiplayerGames.piles import Distributee
+from playingcardsplus.MultiplayerGames.bitset_deck import BitsetDeck
+from playingcardsplus.rng import ShuffleRNG
 from playingcardsplus.custom_error import (
     DuplicateCardError,
     DeckInlclusionError,
@@ -7,21 +11,113 @@ from playingcardsplus.custom_error import (
     DealerUnassignedError
 )
 
+import random
 from enum import Enum
-from typing_extensions import List, OrderedDict, Deque, Iterable, Self
+from itertools import chain
+from typing_extensions import List, OrderedDict, Deque, Iterable, Iterator, Self, Optional, Dict, NamedTuple, Callable
 from pydantic import PrivateAttr, NonNegativeInt, model_validator
 
 
-class Distributee(str, Enum):
-    PLAYER="player"
-    BOARD="board"
-    TRASH_PILE="trash_pile"
-    UNUSED="unused"
+class DeckBackend(str, Enum):
+    PILES="piles" # deques & ordered dicts of cards
+    BITSET="bitset" # card ID bitmasks & byte arrays - see bitset_deck.BitsetDeck
+
+
+class DeckSnapshot(NamedTuple):
+    """Every pile as packed card IDs (see CardEncoding.pack), in pile order"""
+    unused: bytes # bottom of the pile first
+    board: bytes
+    trash_pile: bytes
+    player_hands: bytes
+
+
+def _index_source(rng: Optional[ShuffleRNG]) -> Optional[Callable[[int], int]]:
+    """n -> uniform random index below n, from whatever the RNG has - None if it can only shuffle"""
+    rng = random if rng is None else rng
+    if hasattr(rng, "randrange"): # random.Random
+        return rng.randrange
+    if hasattr(rng, "integers"): # numpy.random.Generator
+        return lambda n: int(rng.integers(n))
+    return None
+
+
+class LazyUnusedPile:
+    """
+    Unused pile that gets shuffled as it's drawn from (incremental Fisher-Yates) - stands in for the unused deque, bottom of the pile first.
+    Cards that haven't been drawn or looked at yet have no order. pop() picks one of them uniformly at random,
+    so drawing k cards costs k random numbers instead of shuffling the whole deck.
+    Anything that needs the actual order (iterating, indexing, snapshots) settles the rest with the exact steps pop() would have taken,
+    so looking at the pile never changes what gets drawn
+    """
+
+    def __init__(self, pending: Iterable[Card | JokerCard], rng: Optional[ShuffleRNG], settled: Iterable[Card | JokerCard] = ()):
+        self.__settled = Deque[Card | JokerCard](settled) # in order, below the pending cards
+        self.__pending = list(pending) # no order yet - on top of the settled cards
+        self.__random_index = _index_source(rng)
+        if self.__random_index is None:
+            # Shuffle-only RNG - no way to draw one card at a time, so shuffle once up front like an ordinary deck
+            rng.shuffle(self.__pending)
+            self.__settled.extend(self.__pending)
+            self.__pending = []
+
+    @property
+    def pending_count(self) -> int:
+        """Cards that haven't been put in order yet"""
+        return len(self.__pending)
+
+    def settle(self):
+        """Puts every pending card in order - same random numbers, same order as popping them one by one would give"""
+        pending = self.__pending
+        for last in range(len(pending) - 1, 0, -1):
+            picked = self.__random_index(last + 1)
+            pending[picked], pending[last] = pending[last], pending[picked]
+        self.__settled.extend(pending)
+        self.__pending = []
+
+    def pop(self) -> Card | JokerCard:
+        pending = self.__pending
+        if not pending:
+            return self.__settled.pop()
+        if len(pending) == 1: # nothing left to pick from - settle() doesn't draw for it either
+            return pending.pop()
+        picked = self.__random_index(len(pending))
+        pending[picked], pending[-1] = pending[-1], pending[picked]
+        return pending.pop()
+
+    def appendleft(self, card: Card | JokerCard):
+        self.__settled.appendleft(card)
+
+    def unordered(self) -> Iterable[Card | JokerCard]:
+        """Every card in the pile without settling it - for counting & membership, the order means nothing"""
+        return chain(self.__settled, self.__pending)
+
+    def __len__(self) -> int:
+        return len(self.__settled) + len(self.__pending)
+
+    def __contains__(self, card) -> bool:
+        return card in self.__settled or card in self.__pending
+
+    def __iter__(self) -> Iterator[Card | JokerCard]:
+        self.settle()
+        return iter(self.__settled)
+
+    def __reversed__(self) -> Iterator[Card | JokerCard]:
+        self.settle()
+        return reversed(self.__settled)
+
+    def __getitem__(self, index: int) -> Card | JokerCard:
+        self.settle()
+        return self.__settled[index]
+
+    def __repr__(self) -> str:
+        return "LazyUnusedPile(settled={}, pending={})".format(len(self.__settled), len(self.__pending))
 
 
 class MultiPlayerDeck(AbstractDeck):
     # TODO: making sure we can track when Dealers or Game cheats?
-    __unused: Deque[Card | JokerCard] = PrivateAttr(
+    lazy_shuffle: bool = False # unused becomes a LazyUnusedPile - only the cards that get drawn are ever shuffled
+    backend: DeckBackend = DeckBackend.PILES # BITSET keeps every pile in a BitsetDeck - the pile properties then hand out copies
+    __unused: Deque[Card | JokerCard] | LazyUnusedPile = PrivateAttr(
         Deque[Card | JokerCard]()
     )  # Make it LIFO
     __board: OrderedDict[Card | JokerCard, bool] = PrivateAttr(
@@ -34,28 +130,105 @@ class MultiPlayerDeck(AbstractDeck):
         OrderedDict[Card | JokerCard, bool]()
     )  # Just track what cards are distriburted amongst players. This way the dealer doesn't have to track who has what hands
     __dealer_assigned: bool = PrivateAttr(default=False)  # TODO: eventually this has to be some kind of handshake auth thing btw dealer and deck
+    # Running totals kept up to date by every mutation below, so nobody has to rescan the piles to count them
+    __board_count: int = PrivateAttr(default=0)
+    __player_hand_count: int = PrivateAttr(default=0)
+    __version: int = PrivateAttr(default=0)  # bumped on every mutation - tells readers whether anything moved since they last looked
+    __board_version: int = PrivateAttr(default=0)
+    __board_snapshot: Optional[Dict[Card | JokerCard, bool]] = PrivateAttr(default=None)
+    __board_snapshot_version: int = PrivateAttr(default=-1)
+    __piles_ready: bool = PrivateAttr(default=False)
+    __bitset: Optional[BitsetDeck] = PrivateAttr(default=None)  # only with the BITSET backend, the piles above stay empty
 
     @model_validator(mode="after")
     def __move_cards_to_unused(self) -> Self:
-        self.__unused = Deque[Card | JokerCard](self.shuffled_cards)
+        # pydantic runs after validators again when a deck is handed to a model field (ie. Game.deck) - only shuffle the first time
+        if self.__piles_ready:
+            return self
+        self.__piles_ready = True
+        if self.backend == DeckBackend.BITSET:
+            if self.lazy_shuffle:
+                raise ValueError("lazy_shuffle only works with the piles backend")
+            self.__bitset = BitsetDeck(self.encoding, unused=self.encoding.encode(self.shuffled_cards))
+        elif self.lazy_shuffle:
+            self.__unused = LazyUnusedPile(self.cards, self.rng)
+        else:
+            self.__unused = Deque[Card | JokerCard](self.shuffled_cards)
         return self
 
     @property
-    def unused(self) -> Deque[Card | JokerCard]:
+    def unused(self) -> Deque[Card | JokerCard] | LazyUnusedPile:
+        bitset = self.__bitset
+        if bitset is not None:
+            return Deque[Card | JokerCard](bitset.cards(Distributee.UNUSED))
         return self.__unused
 
+    def unused_unordered(self) -> Iterable[Card | JokerCard]:
+        """Cards in unused in no particular order - doesn't make a lazily shuffled pile settle its order"""
+        bitset = self.__bitset
+        if bitset is not None:
+            return self.encoding.from_mask(bitset.unused_mask)
+        return self.__unused.unordered() if self.lazy_shuffle else self.__unused
+
     @property
     def board(self) -> OrderedDict[Card | JokerCard, bool]:
+        bitset = self.__bitset
+        if bitset is not None:
+            return OrderedDict[Card | JokerCard, bool]((card, True) for card in bitset.cards(Distributee.BOARD))
         return self.__board
 
     @property
     def trash_pile(self) -> Deque[Card | JokerCard]:
+        bitset = self.__bitset
+        if bitset is not None:
+            return Deque[Card | JokerCard](bitset.cards(Distributee.TRASH_PILE))
         return self.__trash_pile
 
     @property
     def player_hands(self) -> OrderedDict[Card | JokerCard, bool]:
+        bitset = self.__bitset
+        if bitset is not None:
+            return OrderedDict[Card | JokerCard, bool]((card, True) for card in bitset.cards(Distributee.PLAYER))
         return self.__player_hands
 
+    @property
+    def unused_count(self) -> int:
+        bitset = self.__bitset
+        return len(self.__unused) if bitset is None else bitset.unused_count
+
+    @property
+    def board_count(self) -> int:
+        bitset = self.__bitset
+        return self.__board_count if bitset is None else bitset.board_count
+
+    @property
+    def trash_pile_count(self) -> int:
+        bitset = self.__bitset
+        return len(self.__trash_pile) if bitset is None else bitset.trash_pile_count
+
+    @property
+    def player_hand_count(self) -> int:
+        bitset = self.__bitset
+        return self.__player_hand_count if bitset is None else bitset.player_hand_count
+
+    @property
+    def version(self) -> int:
+        return self.__version
+
+    def board_snapshot(self) -> Dict[Card | JokerCard, bool]:
+        """
+        Copy of the board that's only rebuilt when the board changes - it's shared between callers so don't mutate it
+        """
+        if self.__board_snapshot_version != self.__board_version:
+            self.__board_snapshot = dict(self.board)
+            self.__board_snapshot_version = self.__board_version
+        return self.__board_snapshot
+
+    @property
+    def encoding(self) -> CardEncoding:
+        """Card ID lookup tables shared by every deck of this type"""
+        return get_card_encoding(self.type, self.joker_count)
+
     @property
     def dealer_assigned(self) -> bool:
         return self.__dealer_assigned
@@ -63,28 +236,131 @@ class MultiPlayerDeck(AbstractDeck):
     def _toggle_dealer_assignment(self):
         self.__dealer_assigned = not self.__dealer_assigned
 
+    def __card_ids(self, cards: Iterable[Card | JokerCard]) -> List[int]:
+        card_to_id = self.encoding.card_to_id
+        try:
+            return [card_to_id[card] for card in cards]
+        except KeyError:
+            raise UnrecognizedCardError()
+
+
+    def snapshot(self) -> DeckSnapshot:
+        encoding = self.encoding
+        bitset = self.__bitset
+        if bitset is not None: # card IDs already fit in a byte, see BitsetDeck
+            return DeckSnapshot(
+                unused=bytes(bitset.unused),
+                board=bytes(bitset.board),
+                trash_pile=bytes(bitset.trash_pile),
+                player_hands=encoding.pack(bitset.cards(Distributee.PLAYER)),
+            )
+        return DeckSnapshot(
+            unused=encoding.pack(self.__unused),
+            board=encoding.pack(self.__board),
+            trash_pile=encoding.pack(self.__trash_pile),
+            player_hands=encoding.pack(self.__player_hands),
+        )
+
+    def restore(self, snapshot: DeckSnapshot):
+        """
+        Puts every pile back the way it was at snapshot() - the piles are new objects,
+        so anything holding on to the old ones (ie. another deck forked from this one) isn't touched
+        """
+        encoding = self.encoding
+        if self.backend == DeckBackend.BITSET:
+            self.__bitset = BitsetDeck(
+                encoding,
+                unused=snapshot.unused,
+                board=snapshot.board,
+                trash_pile=snapshot.trash_pile,
+                player_hands_mask=encoding.to_mask(encoding.unpack(snapshot.player_hands)),
+            )
+            self.__version += 1
+            self.__board_version += 1
+            return
+        if self.lazy_shuffle:
+            self.__unused = LazyUnusedPile((), self.rng, settled=encoding.unpack(snapshot.unused))
+        else:
+            self.__unused = Deque[Card | JokerCard](encoding.unpack(snapshot.unused))
+        self.__board = OrderedDict[Card | JokerCard, bool]((card, True) for card in encoding.unpack(snapshot.board))
+        self.__trash_pile = Deque[Card | JokerCard](encoding.unpack(snapshot.trash_pile))
+        self.__player_hands = OrderedDict[Card | JokerCard, bool]((card, True) for card in encoding.unpack(snapshot.player_hands))
+        self.__board_count = len(self.__board)
+        self.__player_hand_count = len(self.__player_hands)
+        self.__version += 1
+        self.__board_version += 1
+
+    def reset(self, rng: Optional[ShuffleRNG] = None):
+        """
+        Every card back into unused & reshuffled with `rng` (the deck's own when not given), like a freshly built deck.
+        Piles are cleared in place rather than rebuilt, so a deck can be reused game after game without going through pydantic again
+        """
+        rng = self.rng if rng is None else rng
+        if self.backend == DeckBackend.BITSET:
+            cards = list(self.cards)
+            (random if rng is None else rng).shuffle(cards)
+            self.__bitset = BitsetDeck(self.encoding, unused=self.encoding.encode(cards))
+            self.__version += 1
+            self.__board_version += 1
+            return
+        if self.lazy_shuffle:
+            self.__unused = LazyUnusedPile(self.cards, rng)
+        else:
+            cards = list(self.cards)
+            (random if rng is None else rng).shuffle(cards)
+            self.__unused.clear()
+            self.__unused.extend(cards)
+        self.__board.clear()
+        self.__trash_pile.clear()
+        self.__player_hands.clear()
+        self.__board_count = 0
+        self.__player_hand_count = 0
+        self.__version += 1
+        self.__board_version += 1
 
     # *** Below functions are meant to be used by the Dealer to manipulate the deck as needed
     def _take_from_unused(self, used_count: NonNegativeInt) -> Deque[Card | JokerCard]:  # When updating the Deck, this is the first or second thing that needs to occur
         if self.__dealer_assigned is False:
             raise DealerUnassignedError()
         # TODO: it's uncertain yet whether it needs to handle how it's being used here and match it againt instruction sets or this be done elsewhere
+        bitset = self.__bitset
+        if bitset is not None:
+            self.__version += 1
+            return Deque[Card | JokerCard](self.encoding.decode(bitset.take_from_unused(used_count)))
         used = Deque[Card | JokerCard]()
+        unused = self.__unused # private attributes go through pydantic's __getattr__, look it up once
         for i in range(used_count):
-            used.append(self.__unused.pop())
+            used.append(unused.pop())
             # TODO: might have to use a condition here that checks card for Deck Recognition - ie.does the deck include joker or not?
+        self.__version += 1
         return used
 
     def _replenish_unused(self, replenishers: List[Card | JokerCard]):  # This doesn't handle duplicates, IF it happens, then it's a problem with the Deck initiation and potential cheating
         if self.__dealer_assigned is False:
             raise DealerUnassignedError()
+        bitset = self.__bitset
+        if bitset is not None:
+            bitset.replenish_unused(self.__card_ids(replenishers))
+            self.__version += 1
+            return
         for card in replenishers[::-1]:
             self.__unused.appendleft(card)
+        self.__version += 1
 
     def _remove_from_board(self, removed: OrderedDict[Card | JokerCard, bool]) -> OrderedDict[Card | JokerCard, bool]:  # TODO: THIS forces to create some sort of aggregate List, let's see if it's efficient or it's better to list it othersie
         if self.__dealer_assigned is False:
             raise DealerUnassignedError()
         removed_cards = OrderedDict[Card | JokerCard, bool]()
+        bitset = self.__bitset
+        if bitset is not None:
+            removed_cards.update((card, True) for card, remove_status in removed.items() if remove_status is True)
+            card_ids = self.__card_ids(removed_cards)
+            if not all(bitset.contains(Distributee.BOARD, card_id) for card_id in card_ids):
+                raise UnrecognizedCardError()
+            bitset.remove_from_board(card_ids)
+            self.__version += 1
+            self.__board_version += 1
+            return removed_cards
         for card, remove_status in removed.items():
             if remove_status is True:
                 removed_card = self.__board.pop(card, "Not Found")
@@ -94,35 +370,67 @@ class MultiPlayerDeck(AbstractDeck):
                     raise UnrecognizedCardError()
                 else:
                     removed_cards[card] = True
+                    self.__board_count -= 1
+        self.__version += 1
+        self.__board_version += 1
         return removed_cards  # this needs to be like reverse of removed
 
     def _add_to_board(self, added: Iterable[Card | JokerCard]):
         if self.__dealer_assigned is False:
             raise DealerUnassignedError()
+        bitset = self.__bitset
+        if bitset is not None:
+            bitset.add_to_board(self.__card_ids(added))
+            self.__version += 1
+            self.__board_version += 1
+            return
         for card in added:  #
-            if self.__board[card] is True:  # how can you add it if it's already there?
+            if self.__board.get(card) is True:  # how can you add it if it's already there?
                 raise DuplicateCardError()
             self.__board[card] = True
+            self.__board_count += 1
+        self.__version += 1
+        self.__board_version += 1
 
     def _burn_trash(self, burn_count: NonNegativeInt) -> Deque[Card | JokerCard]:  #
         if self.__dealer_assigned is False:
             raise DealerUnassignedError()
+        bitset = self.__bitset
+        if bitset is not None:
+            self.__version += 1
+            return Deque[Card | JokerCard](self.encoding.decode(bitset.burn_trash(burn_count)))
         burnt = Deque[Card | JokerCard]()
         for i in range(burn_count):
             burnt.append(self.__trash_pile.pop())
             # TODO: might have to use a condition here that checks card for Deck Recognition - ie.does the deck include joker or not?
+        self.__version += 1
         return burnt
 
     def _add_trash(self, trashed: Iterable[Card | JokerCard]):
         if self.__dealer_assigned is False:
             raise DealerUnassignedError()
+        bitset = self.__bitset
+        if bitset is not None:
+            bitset.add_trash(self.__card_ids(trashed))
+            self.__version += 1
+            return
         for card in trashed:
             self.__trash_pile.append(card)
+        self.__version += 1
 
     def _take_from_players(self, removed: OrderedDict[Card | JokerCard, bool]) -> OrderedDict[Card | JokerCard, bool]:
         if self.__dealer_assigned is False:
             raise DealerUnassignedError()
         taken_cards = OrderedDict[Card | JokerCard, bool]()
+        bitset = self.__bitset
+        if bitset is not None:
+            taken_cards.update((card, True) for card, remove_status in removed.items() if remove_status is True)
+            card_ids = self.__card_ids(taken_cards)
+            if not all(bitset.contains(Distributee.PLAYER, card_id) for card_id in card_ids):
+                raise UnrecognizedCardError()
+            bitset.take_from_players(card_ids)
+            self.__version += 1
+            return taken_cards
         for card, remove_status in removed.items():
             if remove_status is True:
                 removed_card = self.__player_hands.pop(card, "Not Found")
@@ -132,14 +440,23 @@ class MultiPlayerDeck(AbstractDeck):
                     raise UnrecognizedCardError()
                 else:
                     taken_cards[card] = True
+                    self.__player_hand_count -= 1
+        self.__version += 1
         return taken_cards  # this needs to be like reverse of removed
 
     def _give_to_players(self, distributed: Iterable[Card | JokerCard]):
         if self.__dealer_assigned is False:
             raise DealerUnassignedError()
+        bitset = self.__bitset
+        if bitset is not None:
+            bitset.give_to_players(self.__card_ids(distributed))
+            self.__version += 1
+            return
         for card in distributed:
             if (
-                self.__player_hands[card] is True
+                self.__player_hands.get(card) is True
             ):  # how can you add it if it's already there?
                 raise DuplicateCardError()
             self.__player_hands[card] = True
+            self.__player_hand_count += 1
+        self.__version += 1
@@ -0,0 +1,121 @@
+"""
+Exact enumeration of every way the remaining cards can be dealt - for late game spots where there are few enough deals to try them all
+
+A deal fills `slot_sizes` slots (ie. 2 hole cards of an unknown opponent, then the 1 card river) from a pool of card IDs, usually
+what's left of a MultiPlayerDeck's unused pile: `deck.encoding.encode(deck.unused_unordered())`, which doesn't make a lazily shuffled
+pile settle. Order within a slot doesn't matter.
+
+Suit isomorphism: swapping suits around doesn't change a hand's value, so deals that turn into each other under a suit permutation
+which leaves every known pile (`fixed_groups`) & the pool as they were are worth the same. Only the smallest deal of each such
+family is yielded, weighted by how many deals it stands for - the weights of a full enumeration add up to deal_count().
+Jokers (IDs 52 and up) have no suit and stay put.
+
+Deals are streamed in chunks from generators so enumerations that don't fit in memory can still be walked through
+
+Requires NumPy - install the `numpy` extra
+"""
+
+from playingcardsplus.card import Suit
+
+import math
+from itertools import chain, combinations, islice, permutations
+import numpy as np
+from typing_extensions import NamedTuple, Iterator, Sequence, Tuple
+
+
+REGULAR_CARD_COUNT = 52
+
+
+class DealChunk(NamedTuple):
+    deals: np.ndarray # (chunk, sum(slot_sizes)) card IDs - slots one after another, each slot sorted
+    weights: np.ndarray # (chunk,) how many deals each row stands for
+
+
+def deal_count(card_count: int, slot_sizes: Sequence[int]) -> int:
+    """How many different deals there are of `card_count` cards into the slots"""
+    total, remaining = 1, card_count
+    for size in slot_sizes:
+        total *= math.comb(remaining, size)
+        remaining -= size
+    return total
+
+
+def suit_symmetries(pool: Sequence[int], fixed_groups: Sequence[Sequence[int]] = ()) -> np.ndarray:
+    """
+    (symmetries, 52 + jokers) card ID maps of every suit permutation that maps the pool & each fixed group onto itself.
+    Row 0 is always the identity
+    """
+    card_count = max([REGULAR_CARD_COUNT - 1, *pool, *(card_id for group in fixed_groups for card_id in group)]) + 1
+    groups = [frozenset(pool)] + [frozenset(group) for group in fixed_groups]
+    suit_count = len(Suit)
+    maps = []
+    for suit_order in permutations(range(suit_count)):
+        mapping = np.arange(card_count)
+        regular = mapping[:REGULAR_CARD_COUNT]
+        mapping[:REGULAR_CARD_COUNT] = regular - regular % suit_count + np.asarray(suit_order)[regular % suit_count]
+        if all(frozenset(mapping[list(group)].tolist()) == group for group in groups):
+            maps.append(mapping)
+    return np.stack(maps)
+
+
+def __deal_tuples(pool: Tuple[int, ...], slot_sizes: Sequence[int], prefix: Tuple[int, ...] = ()) -> Iterator[Tuple[int, ...]]:
+    if len(slot_sizes) <= 1:
+        last = combinations(pool, slot_sizes[0]) if slot_sizes else [()]
+        # Most enumerations are a single slot - hand out combinations' own tuples rather than copying each one
+        yield from (last if not prefix else (prefix + deal for deal in last))
+        return
+    for first in combinations(pool, slot_sizes[0]):
+        taken = set(first)
+        rest = tuple(card_id for card_id in pool if card_id not in taken)
+        yield from __deal_tuples(rest, slot_sizes[1:], prefix + first)
+
+
+def _lexicographically_less(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    different = left != right
+    first = different.argmax(axis=1)
+    rows = np.arange(left.shape[0])
+    return different.any(axis=1) & (left[rows, first] < right[rows, first])
+
+
+def enumerate_deals(
+    pool: Sequence[int],
+    slot_sizes: Sequence[int],
+    fixed_groups: Sequence[Sequence[int]] = (),
+    chunk_size: int = 1 << 16,
+    reduce_suits: bool = True,
+) -> Iterator[DealChunk]:
+    """
+    Every deal of the pool into the slots, `chunk_size` deals (before suit reduction) at a time.
+    With reduce_suits, equivalent deals collapse into one weighted row - see the module docstring
+    """
+    if sum(slot_sizes) > len(pool):
+        raise ValueError("Can't deal {} cards out of {}".format(sum(slot_sizes), len(pool)))
+    symmetries = suit_symmetries(pool, fixed_groups)[1:] if reduce_suits else None
+    bounds = np.cumsum([0, *slot_sizes])
+    deals = __deal_tuples(tuple(sorted(pool)), list(slot_sizes))
+    width = int(bounds[-1])
+    if width == 0:
+        # Nothing left to deal - the one and only deal is the empty one
+        yield DealChunk(deals=np.zeros((1, 0), dtype=np.int64), weights=np.ones(1, dtype=np.int64))
+        return
+
+    while True:
+        chunk = np.fromiter(chain.from_iterable(islice(deals, chunk_size)), dtype=np.int64)
+        chunk = chunk.reshape(-1, width)
+        if chunk.shape[0] == 0:
+            return
+        if symmetries is None or len(symmetries) == 0:
+            yield DealChunk(deals=chunk, weights=np.ones(chunk.shape[0], dtype=np.int64))
+            continue
+
+        # Keep a deal only if no symmetry maps it to a smaller one. Its weight is the number of distinct deals it maps to
+        canonical = np.ones(chunk.shape[0], dtype=bool)
+        fixed_by = np.ones(chunk.shape[0], dtype=np.int64) # the identity
+        for mapping in symmetries:
+            image = mapping[chunk]
+            for start, stop in zip(bounds[:-1], bounds[1:]):
+                image[:, start:stop].sort(axis=1)
+            canonical &= ~_lexicographically_less(image, chunk)
+            fixed_by += (image == chunk).all(axis=1)
+        weights = (len(symmetries) + 1) // fixed_by
+        yield DealChunk(deals=chunk[canonical], weights=weights[canonical])
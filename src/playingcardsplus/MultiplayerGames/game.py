@@ -7,17 +7,21 @@ Each entity should be communicating via a specific data fields so they may be ho
 For being hosted on multiple envs, eventually need to support each entity communicating through various protocols like HTTPS, RPC, etc...
 """
 
-from playingcardsplus.MultiplayerGames.deck import MultiPlayerDeck
+from playingcardsplus.MultiplayerGames.deck import MultiPlayerDeck, DeckSnapshot
 from playingcardsplus.MultiplayerGames.dealer import Dealer
-from playingcardsplus.MultiplayerGames.player import Player
+from playingcardsplus.MultiplayerGames.player import Player, PolicyRequest, PlayerSnapshot
 from playingcardsplus.MultiplayerGames.rules import Rules
-from playingcardsplus.MultiplayerGames.instructions import InstructionSetImplementer
+from playingcardsplus.MultiplayerGames.instructions import Instruction, InstructionSetImplementer, CompiledInstructionSet, compile_instruction_set
 from playingcardsplus.MultiplayerGames.data import CollectibleData, GameState, CheatingState
+from playingcardsplus.MultiplayerGames.data_stream import CollectibleDataWriter, StreamMetadata
+from playingcardsplus.MultiplayerGames.history import GameStateHistory, HistoryView
 from playingcardsplus.custom_error import RuleViolationError
+from playingcardsplus.rng import ShuffleRNG, make_rng, derive_seed
 
-from typing_extensions import Dict, List, Iterable
+import copy
+from typing_extensions import Dict, List, Iterable, Optional, Tuple, Any, Generator, NamedTuple, Self
 from abc import ABC, abstractmethod
-from pydantic import BaseModel, Field, ConfigDict, model_validator
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr, NonNegativeInt, model_validator
 
 
 
@@ -33,6 +37,14 @@ class TurnBasedCircularList:
     A circular iterable with features for managing size, direction, and turns.
     """
 
+class GameSnapshot(NamedTuple):
+    """Everything that changes while a Game is played - a few bytes per pile & hand, restored with Game.restore()"""
+    hand_index: int
+    deck: DeckSnapshot
+    players: Tuple[PlayerSnapshot, ...] # roster order
+    scoreboard: Tuple[int, ...] # roster order
+
+
 class Game(BaseModel, ABC):
     """
     Game object is the primary interface for running games.
@@ -60,6 +72,17 @@ class Game(BaseModel, ABC):
     rules: Rules = Field(frozen=True)
     scoreboard: Dict[Player, int]  # Score should be kept by the Game. Trust this over what players keep track of - they're motivated by their behavior profiles in simulations and in real games, they may be conflated
     game_data_path: str # where to store data about the game - up to devs to decide how to manage this
+    stream_data: bool = False # append every hand's CollectibleData to game_data_path as it's played (see data_stream.py)
+    seed: Optional[int] = None # root seed of this game - per-hand streams are derived from it so any game can be replayed
+    trusted: bool = Field(default=False, frozen=True) # skip pydantic validation of the per-hand GameState & CollectibleData
+    validate_every: NonNegativeInt = Field(default=0, frozen=True) # when trusted, still fully validate every Nth hand (0 = never)
+    history_depth: NonNegativeInt = Field(default=0, frozen=True) # how many past GameStates players get to look back on (0 = none, see history.py)
+    __hand_index: int = PrivateAttr(default=0)
+    __data_writer: Optional[CollectibleDataWriter] = PrivateAttr(default=None)
+    __game_state: Optional[GameState] = PrivateAttr(default=None)
+    __game_state_version: int = PrivateAttr(default=-1) # deck.version the cached GameState was built at
+    __history: Optional[GameStateHistory] = PrivateAttr(default=None)
+    __compiled_instructions: Optional[Tuple[InstructionSetImplementer, CompiledInstructionSet]] = PrivateAttr(default=None)
 
     @classmethod
     def __one_hot_encode_iterable(cls, iterable: Iterable, exhaustive_list: Iterable):
@@ -101,10 +124,100 @@ class Game(BaseModel, ABC):
             )
         return self
 
+    @model_validator(mode="after")
+    def validate_deck_rng(self):
+        # A deck without its own RNG got shuffled with the module-level random - reshuffle it from the seed like reset() would
+        if self.seed is not None and self.deck.rng is None:
+            self.deck.reset(self.hand_rng(0))
+        return self
+
+    def hand_rng(self, hand_index: int) -> ShuffleRNG:
+        """Independent stream per hand, so a single hand can be replayed without replaying the ones before it"""
+        if self.seed is None:
+            raise ValueError("Game '{}' has no seed to derive hand {}'s RNG from".format(self.name, hand_index))
+        return make_rng(derive_seed(self.seed, hand_index))
+
+    @property
+    def hand_index(self) -> int:
+        return self.__hand_index
+
+    # *** Cloning for search - MCTS/expectimax agents snapshot, play a line out, then restore or fork
+    def snapshot(self) -> GameSnapshot:
+        return GameSnapshot(
+            hand_index=self.__hand_index,
+            deck=self.deck.snapshot(),
+            players=tuple(player._snapshot() for player in self.roster),
+            scoreboard=tuple(self.scoreboard.get(player, 0) for player in self.roster),
+        )
+
+    def restore(self, snapshot: GameSnapshot):
+        """
+        Rewinds (or fast forwards) the game to the snapshot. It needs to come from this game or one of its forks.
+        History is cleared as it no longer leads up to the restored state
+        """
+        if len(snapshot.players) != len(self.roster):
+            raise ValueError("Snapshot has {} players but the game has {}".format(len(snapshot.players), len(self.roster)))
+        self.deck.restore(snapshot.deck)
+        for player, player_snapshot in zip(self.roster, snapshot.players):
+            player._restore(player_snapshot)
+        self.scoreboard = dict(zip(self.roster, snapshot.scoreboard))
+        self.__hand_index = snapshot.hand_index
+        if self.__history is not None:
+            self.__history.clear()
+
+    def fork(self) -> Self:
+        """
+        Independent copy to play ahead with - its own deck piles, hands, scores & deck RNG state, sharing the rules, dealer & behaviors.
+        The fork never writes to game_data_path and starts with an empty history
+        """
+        roster = [player._fork() for player in self.roster]
+        # RNGs are copied rather than shared - reshuffling the fork (ie. reset()) mustn't move the original's stream along
+        deck = self.deck.model_copy(update={"rng": copy.deepcopy(self.deck.rng)})
+        deck.restore(self.deck.snapshot())
+        forked = self.model_copy(update={
+            "deck": deck,
+            "roster": roster,
+            "scoreboard": {forked_player: self.scoreboard.get(player, 0) for player, forked_player in zip(self.roster, roster)},
+            "stream_data": False,
+        })
+        forked.__data_writer = None
+        forked.__history = None
+        forked.__game_state = None
+        forked.__game_state_version = -1
+        return forked
+
+    def reset(self, seed: Optional[int] = None, deck_rng: Optional[ShuffleRNG] = None, game_data_path: Optional[str] = None):
+        """
+        Sets the game up to be played again from the start - empty hands, zero scores & every card back in a reshuffled unused pile.
+        With a seed it's the same as a game freshly built from that seed, as long as its deck was shuffled with hand_rng(0)
+        (ie. rng=make_rng(derive_seed(seed, 0)), or no rng at all - the Game then shuffles it so) - deck_rng overrides that.
+        Nothing gets rebuilt, see pool.py.
+        The finished game's data stream is closed. With stream_data the next game appends to the same game_data_path unless it's
+        given a new one - its records start over at hand index 0, which is what tells the games in one file apart
+        """
+        self.close_data_stream()
+        if game_data_path is not None:
+            self.game_data_path = game_data_path
+        if seed is not None:
+            self.seed = seed
+        self.deck.reset(deck_rng if deck_rng is not None or self.seed is None else self.hand_rng(0))
+        for player in self.roster:
+            player._reset()
+        self.scoreboard = {player: 0 for player in self.roster}
+        self.__hand_index = 0
+        self.__game_state = None
+        self.__game_state_version = -1
+        if self.__history is not None:
+            self.__history.clear()
+
     @abstractmethod
     def calculate_score(self) -> Dict[Player, int]:
         ...
 
+    def is_over(self) -> bool:
+        """Stopping condition of the game - checked by simulators after every hand. Games should override this"""
+        return False
+
     # 2) next round
     #   -> signal dealer to hand
     #   -> deck status update
@@ -124,94 +237,166 @@ class Game(BaseModel, ABC):
             players=self.roster, rules=self.rules, deck=self.deck, hand_index=hand_index
         )
 
-    def take_player_actions(self, instruction_implementer):
-        game_state_post_deal = GameState(
-            player_count=len(self.roster),
-            board=self.deck.board,
-            unused_count=len(self.deck.unused),
-            trash_pile_count=len(self.deck.trash_pile),
-            player_hand_count=sum(self.deck.player_hands.values()),
-            deck_type=self.deck.type,
-            joker_count=self.deck.joker_count
-        )
+    def __validating(self) -> bool:
+        """Whether this hand's per-hand objects go through pydantic validation - always unless the Game is trusted"""
+        if not self.trusted:
+            return True
+        return self.validate_every > 0 and self.__hand_index % self.validate_every == 0
+
+    def game_state(self) -> GameState:
+        """
+        What players see right now - read straight off the deck's running counters, so it's O(1) apart from copying the board when it changed.
+        Rebuilt only when the deck has changed since the last call
+        """
+        if self.__game_state is None or self.__game_state_version != self.deck.version:
+            # Trusted games skip validation - the board is copied so the state doesn't change under players' feet
+            build = GameState if self.__validating() else GameState.model_construct
+            self.__game_state = build(
+                player_count=len(self.roster),
+                board=self.deck.board_snapshot(),
+                unused_count=self.deck.unused_count,
+                trash_pile_count=self.deck.trash_pile_count,
+                player_hand_count=self.deck.player_hand_count,
+                deck_type=self.deck.type,
+                joker_count=self.deck.joker_count
+            )
+            self.__game_state_version = self.deck.version
+        return self.__game_state
+
+    @property
+    def history(self) -> HistoryView:
+        """States players acted on before the current one, oldest first - at most history_depth of them"""
+        if self.__history is None:
+            self.__history = GameStateHistory(depth=self.history_depth)
+        return self.__history.view
+
+    def compiled_instructions(self, instruction_implementer: InstructionSetImplementer) -> CompiledInstructionSet:
+        """rules.instructions bound to the implementer - compiled on first use & whenever a different implementer comes in"""
+        if self.__compiled_instructions is None or self.__compiled_instructions[0] is not instruction_implementer:
+            self.__compiled_instructions = (instruction_implementer, compile_instruction_set(self.rules.instructions, instruction_implementer))
+        return self.__compiled_instructions[1]
+
+    def take_player_actions_steps(self, instruction_implementer: InstructionSetImplementer) -> Generator[PolicyRequest, List[Tuple[Instruction, Any]], Dict[str, Dict]]:
+        """
+        take_player_actions as a generator - yields a PolicyRequest per player and expects that player's actions sent back.
+        Whoever drives it decides how actions get computed, ie. batched across many games (see inference.py)
+        """
+        # Each player sees the deck as the players before them left it
+        history = self.history
+        compiled = self.compiled_instructions(instruction_implementer)
         player_actions_map = dict()
         for player in self.roster:
-            player_actions = player.take_action(
-                current_game_state=game_state_post_deal,
-                historical_states=[],
+            game_state = self.game_state()
+            player_actions = yield PolicyRequest(
+                player=player,
+                current_game_state=game_state,
+                historical_states=history,
                 cheating_states=[], #TODO: create option for cheating here
-                instruction_implementer=instruction_implementer
             )
             # Actually apply those actions accordingly to players and dealers
-            for (instruction, aux_input) in player_actions:
-                if hasattr(instruction_implementer, "{}".format(instruction.operation)) and callable(getattr(instruction_implementer, "{}".format(instruction.operation))):
-                    method = getattr(instruction_implementer, "{}".format(instruction.operation))
-
-                    method(player=player, dealer=self.dealer, deck=self.deck, aux=aux_input) # TODO: hopefully this works...
+            opcodes = self.dealer.handle_player_actions(player=player, instructions=player_actions, instruction_set=compiled, deck=self.deck, rules=self.rules)
+            self.__history.push(game_state)
 
             # Make sure it's recorded appropriately
             player_actions_map[player.name] = Game.__one_hot_encode_iterable(
-                iterable = player_actions,
-                exhaustive_list=self.rules.instructions.instructions
+                iterable = [compiled.operations[opcode] for opcode in opcodes],
+                exhaustive_list=compiled.operations
             )
         return player_actions_map
 
+    @classmethod
+    def __run_steps(cls, steps: Generator, instruction_implementer: InstructionSetImplementer):
+        """Drives a *_steps generator by asking each player's own behavior for its actions, one player at a time"""
+        try:
+            request = next(steps)
+            while True:
+                request = steps.send(request.player.take_action(
+                    current_game_state=request.current_game_state,
+                    historical_states=request.historical_states,
+                    cheating_states=request.cheating_states,
+                    instruction_implementer=instruction_implementer
+                ))
+        except StopIteration as stop:
+            return stop.value
+
+    def take_player_actions(self, instruction_implementer):
+        return Game.__run_steps(self.take_player_actions_steps(instruction_implementer), instruction_implementer)
+
     def record_data(self, player_actions_map) -> CollectibleData:
         # Collect and return data
         # data at hand 0
         scoreboard = dict()
         for player, score in self.scoreboard.items():
             scoreboard[player.name] = score
-        cards = self.deck.cards
+        encoding = self.deck.encoding
 
-        return CollectibleData(
+        # Piles are copied either way - records must not change as the game goes on
+        build = CollectibleData if self.__validating() else CollectibleData.model_construct
+        return build(
             player_actions=player_actions_map,
             scores=scoreboard,
-            player_state=self.deck.player_hands,
-            unused_state=Game.__one_hot_encode_iterable(iterable=self.deck.unused, exhaustive_list=cards),
-            board_state=self.deck.board,
-            trash_pile_state=Game.__one_hot_encode_iterable(iterable=self.deck.trash_pile, exhaustive_list=cards)
+            player_state=dict(self.deck.player_hands),
+            unused_state=encoding.one_hot(self.deck.unused_unordered()),
+            board_state=dict(self.deck.board),
+            trash_pile_state=encoding.one_hot(self.deck.trash_pile)
         )
 
+    def __stream(self, data: CollectibleData) -> CollectibleData:
+        if self.stream_data:
+            if self.__data_writer is None:
+                self.__data_writer = CollectibleDataWriter(
+                    path=self.game_data_path,
+                    metadata=StreamMetadata(
+                        deck_type=self.deck.type,
+                        joker_count=self.deck.joker_count,
+                        player_names=tuple(player.name for player in self.roster),
+                        operations=tuple(sorted(instruction.operation for instruction in self.rules.instructions.instructions)),
+                    )
+                )
+            self.__data_writer.write(hand_index=self.__hand_index, data=data)
+        return data
+
+    def close_data_stream(self):
+        """Flushes whatever's buffered to game_data_path - call it once the game is done"""
+        if self.__data_writer is not None:
+            self.__data_writer.close()
+            self.__data_writer = None
+
     # to be called by simulators
-    def start_game(self, instruction_implementer: InstructionSetImplementer) -> CollectibleData:  # return data to be stored for analyzing results later
+    def start_game_steps(self, instruction_implementer: InstructionSetImplementer) -> Generator[PolicyRequest, List[Tuple[Instruction, Any]], CollectibleData]:
+        """start_game where players' actions are sent in by whoever steps it - see take_player_actions_steps"""
         # Assign Game / Auth Dealer for the game
         if self.dealer.game_assigned is False:
             self.__toggle_game_assignment()
 
         # Send rules, deck to dealer & Deal first hand (_deal shoul do the status update for the deck)
-        self.deck, player_states_0 = self.deal(hand_index=0)
+        self.__hand_index = 0
+        self.deal(hand_index=0)
 
         # Let players take action -
-        player_actions_map = self.take_player_actions(instruction_implementer)
+        player_actions_map = yield from self.take_player_actions_steps(instruction_implementer)
 
         # Calcualte Score
         self.scoreboard = self.calculate_score()
 
         # Collect and return data
-        return self.record_data(player_actions_map)
-
+        return self.__stream(self.record_data(player_actions_map))
 
-    def next_hand(self):  #
+    def next_hand_steps(self, instruction_implementer: InstructionSetImplementer) -> Generator[PolicyRequest, List[Tuple[Instruction, Any]], CollectibleData]:
+        """next_hand where players' actions are sent in by whoever steps it - see take_player_actions_steps"""
         # Assign Game / Auth Dealer for the game
         if self.dealer.game_assigned is False:
             self.__toggle_game_assignment()
 
-        #TODO???
-        # # Trigger player action
-        # for player in self.roster:
-        #     action_instructions = player.take_action
-        # for player in self.roster:  # whatever is list equivalent version of it
-        #     action_instructions = player.take_action(
-        #         current_game_state={}, historical_states={}, cheat_codes=None
-        #     )  # TODO: THINK ABOUT OPTIMAL IGNESTION PATH
-        #     self.dealer._handle_player_actions(
-        #         player=player,
-        #         actions=action_instructions,
-        #         deck=self.deck,
-        #         rules=self.rules,
-        #     )
-
-        # Dealer handles those
-        # record data and then return
-        return
+        # Deal hand i, let players take action, then score & record just like the first hand
+        self.__hand_index += 1
+        self.deal(hand_index=self.__hand_index)
+        player_actions_map = yield from self.take_player_actions_steps(instruction_implementer)
+        self.scoreboard = self.calculate_score()
+        return self.__stream(self.record_data(player_actions_map))
+
+    def start_game(self, instruction_implementer: InstructionSetImplementer) -> CollectibleData:  # return data to be stored for analyzing results later
+        return Game.__run_steps(self.start_game_steps(instruction_implementer), instruction_implementer)
+
+    def next_hand(self, instruction_implementer: InstructionSetImplementer) -> CollectibleData:
+        return Game.__run_steps(self.next_hand_steps(instruction_implementer), instruction_implementer)
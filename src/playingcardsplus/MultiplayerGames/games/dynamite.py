@@ -5,17 +5,19 @@ Once you accumulate all 4 cards you throw away those 4 and then give one of your
 """
 
 from playingcardsplus.MultiplayerGames.instructions import Instruction, InstructionSet, InstructionSetImplementer
-from playingcardsplus.MultiplayerGames.player import Player
-from playingcardsplus.MultiplayerGames.dealer import Dealer
-from playingcardsplus.MultiplayerGames.deck import Distributee, MultiPlayerDeck
+from playingcardsplus.MultiplayerGames.player import Player, PlayerBehavior
+from playingcardsplus.MultiplayerGames.dealer import Dealer, DealerBehavior
+from playingcardsplus.MultiplayerGames.deck import Distributee, MultiPlayerDeck, DeckBackend
 from playingcardsplus.MultiplayerGames.rules import Rules
 from playingcardsplus.MultiplayerGames.game import Game
 from playingcardsplus.MultiplayerGames.data import CollectibleData
 
 from playingcardsplus.dealer import CardDistributionMethod
-from playingcardsplus.card import Card, JokerCard
+from playingcardsplus.card import Card, JokerCard, Rank, Suit
+from playingcardsplus.rng import make_rng, derive_seed
 
 
+from collections import defaultdict
 from typing_extensions import Deque, Dict, OrderedDict
 
 
@@ -116,6 +118,10 @@ __DynamiteRules = Rules(
 
 )
 
+# Public names for the rules & operations above - for building Dynamite games outside this module (ie. simulators, sweeps)
+DYNAMITE_RULES = __DynamiteRules
+DYNAMITE_OPERATIONS = __DynamitePlayerOperations
+
 
 
 
@@ -126,5 +132,49 @@ class Dynamite(Game):
         # Honestly, I think this is jsut number of cards left per player because that's what the yget rated by here.
         res = dict()
         for player in self.roster:
-            res[player] = sum(player.hand.values())
+            res[player] = player.hand.size
         return res
+
+    def is_over(self) -> bool:
+        # Someone got rid of all of their cards or there's nothing left to draw
+        return self.deck.unused_count == 0 or any(player.hand.size == 0 for player in self.roster)
+
+
+# *** Ready-made rules-based games - for simulators, sweeps, benchmarks & tests. Module level so process pools can pickle them
+def dynamite_policy(arg):
+    """Eliminate any rank held 4 times, otherwise draw while there's enough left for everyone"""
+    game_state, hand, historical_states, cheating_states = arg
+    for rank in Rank:
+        if hand.holds_all_of(rank):
+            return [(Instruction(operation="eliminate"), [Card(rank=rank.value, suit=suit.value) for suit in Suit])]
+    if game_state.unused_count >= game_state.player_count:
+        return [(Instruction(operation="draw"), None)]
+    return []
+
+
+def make_dynamite_game(seed: int, player_count: int = 3, rules: Rules = DYNAMITE_RULES, lazy_shuffle: bool = False, backend: DeckBackend = DeckBackend.PILES, **game_kwargs) -> Dynamite:
+    """Every player follows dynamite_policy & the deck is shuffled with the game's hand_rng(0), so Game.reset(seed) reproduces it"""
+    roster = [
+        Player(name="player_{}".format(i), initial_hand=defaultdict(int), initial_score=0, behvior=PlayerBehavior(name="rules", soul={"model": dynamite_policy}))
+        for i in range(player_count)
+    ]
+    return Dynamite(
+        name="Dynamite",
+        dealer=Dealer(name="Ordinary Dealer", initial_behavior=DealerBehavior(name="Normal Fair", fair=True)),
+        deck=MultiPlayerDeck(name="French_Multi_Player_Deck_NoJoker", joker_count=0, lazy_shuffle=lazy_shuffle, backend=backend, rng=make_rng(derive_seed(seed, 0))),
+        roster=roster,
+        rules=rules,
+        scoreboard={player: 0 for player in roster},
+        game_data_path="",
+        seed=seed,
+        **game_kwargs,
+    )
+
+
+def make_dynamite_game_for_rules(rules: Rules, player_count: int, seed: int) -> Dynamite:
+    """Rule sweeps - see sweep.RulesGameFactory"""
+    return make_dynamite_game(seed, player_count=player_count, rules=rules)
+
+
+def make_dynamite_instruction_set() -> DynamiteInstructionSet:
+    return DynamiteInstructionSet(DYNAMITE_OPERATIONS)
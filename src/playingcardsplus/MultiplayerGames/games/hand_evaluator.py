@@ -0,0 +1,189 @@
+"""
+Lookup table poker hand evaluator for 5, 6 & 7 card hands (Cactus Kev style) - same scores as poker_hands.evaluate_best
+
+Two tables do all the work
+-> flush: best flush/straight flush out of one suit's 13 bit rank mask, for every mask (8192 entries)
+-> rank products: every rank gets a prime (2 -> 2, 3 -> 3, ... ace -> 41) so the product of a hand's rank primes identifies
+   its ranks regardless of order. Every possible 5, 6 & 7 rank multiset is scored once without flushes and kept sorted by product
+   - a hand is a binary search (np.searchsorted for batches, a dict for single hands)
+A hand of 7 is a flush check plus one of those lookups.
+
+Building the tables takes about a second, so they're saved to an .npz in the cache directory (PLAYINGCARDSPLUS_CACHE_DIR,
+~/.cache/playingcardsplus by default) and loaded from there afterwards. If the directory can't be written the tables just stay in memory
+
+Requires NumPy - install the `numpy` extra
+"""
+
+from playingcardsplus.MultiplayerGames.games.poker_hands import (
+    HandCategory, RANK_COUNT, SUIT_COUNT, pack_score, _rank_mask_tables,
+)
+from playingcardsplus.card import Card, JokerCard, Rank
+from playingcardsplus.deck import DeckType
+from playingcardsplus.encoding import get_card_encoding
+
+import os
+import contextlib
+import tempfile
+from functools import lru_cache
+from itertools import combinations_with_replacement
+from pathlib import Path
+import numpy as np
+from typing_extensions import NamedTuple, Iterable, Dict, Optional, Sequence
+
+
+TABLE_VERSION = 1 # bump whenever the score layout changes so stale caches get rebuilt
+RANK_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+if not len(RANK_PRIMES) == len(Rank) == RANK_COUNT:
+    raise RuntimeError("Every rank needs its own prime - got {} primes for {} ranks".format(len(RANK_PRIMES), len(Rank)))
+HAND_SIZES = (5, 6, 7)
+
+
+class HandTables(NamedTuple):
+    flush: np.ndarray # (8192,) best flush score for a one-suit rank mask, 0 under 5 cards
+    rank_keys: np.ndarray # sorted products of rank primes
+    rank_scores: np.ndarray # score of rank_keys[i] when there's no flush
+
+
+def __multiset_score(rank_counts: Sequence[int], highest_bit, straight_table, top_five) -> int:
+    """Best hand out of the ranks ignoring flushes - rank_counts[r] is how many cards of rank r there are"""
+    mask = sum(1 << rank for rank, count in enumerate(rank_counts) if count)
+    # Ranks ordered by count then rank - ordered[0] is the quads/trips/highest pair, etc.
+    ordered = sorted((rank for rank in range(RANK_COUNT) if rank_counts[rank]), key=lambda rank: (rank_counts[rank], rank), reverse=True)
+    counts = [rank_counts[rank] for rank in ordered] + [0]
+
+    def best_without(*ranks) -> int:
+        return int(highest_bit[mask & ~sum(1 << rank for rank in ranks)])
+
+    if counts[0] == 4:
+        return pack_score(HandCategory.FOUR_OF_A_KIND, [ordered[0], best_without(ordered[0])])
+    if counts[0] == 3 and counts[1] >= 2:
+        return pack_score(HandCategory.FULL_HOUSE, ordered[:2])
+    if straight_table[mask] >= 0:
+        return pack_score(HandCategory.STRAIGHT, [int(straight_table[mask])])
+    if counts[0] == 3:
+        return pack_score(HandCategory.THREE_OF_A_KIND, ordered[:3])
+    if counts[0] == 2 and counts[1] == 2:
+        return pack_score(HandCategory.TWO_PAIR, ordered[:2] + [best_without(*ordered[:2])])
+    if counts[0] == 2:
+        return pack_score(HandCategory.PAIR, ordered[:4])
+    return int(top_five[mask])
+
+
+def build_tables() -> HandTables:
+    highest_bit, straight_table, top_five = _rank_mask_tables()
+
+    flush = np.zeros(1 << RANK_COUNT, dtype=np.int64)
+    for mask in range(1 << RANK_COUNT):
+        if bin(mask).count("1") >= 5:
+            straight_high = int(straight_table[mask])
+            flush[mask] = pack_score(HandCategory.STRAIGHT_FLUSH, [straight_high]) if straight_high >= 0 \
+                else (HandCategory.FLUSH << 20) | int(top_five[mask])
+
+    keys, scores = [], []
+    for size in HAND_SIZES:
+        # Products of different numbers of primes never collide, so every size shares one table
+        for ranks in combinations_with_replacement(range(RANK_COUNT), size):
+            rank_counts = [0] * RANK_COUNT
+            for rank in ranks:
+                rank_counts[rank] += 1
+            if max(rank_counts) > SUIT_COUNT:
+                continue
+            product = 1
+            for rank in ranks:
+                product *= RANK_PRIMES[rank]
+            keys.append(product)
+            scores.append(__multiset_score(rank_counts, highest_bit, straight_table, top_five))
+
+    order = np.argsort(keys)
+    return HandTables(flush=flush, rank_keys=np.asarray(keys, dtype=np.int64)[order], rank_scores=np.asarray(scores, dtype=np.int64)[order])
+
+
+def default_cache_dir() -> Path:
+    return Path(os.environ.get("PLAYINGCARDSPLUS_CACHE_DIR") or Path.home() / ".cache" / "playingcardsplus")
+
+
+def load_tables(cache_dir: Optional[Path] = None) -> HandTables:
+    """Tables from the cache directory, building & saving them first if they aren't there yet"""
+    path = Path(cache_dir or default_cache_dir()) / "hand_tables_v{}.npz".format(TABLE_VERSION)
+    try:
+        with np.load(path) as saved:
+            return HandTables(*(saved[field] for field in HandTables._fields))
+    except (OSError, KeyError, ValueError):
+        pass
+
+    tables = build_tables()
+    temp_path = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file & rename so concurrent processes never read a half written cache
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".npz", delete=False) as temp:
+            temp_path = temp.name
+            np.savez(temp, **tables._asdict())
+        os.replace(temp_path, path)
+        temp_path = None
+    except OSError:
+        pass
+    finally:
+        if temp_path is not None: # never made it into place
+            with contextlib.suppress(OSError):
+                os.unlink(temp_path)
+    return tables
+
+
+@lru_cache(maxsize=None)
+def _shared_tables() -> HandTables:
+    return load_tables()
+
+
+class HandEvaluator:
+    """
+    Scores 5 ~ 7 card hands of card IDs (see playingcardsplus.encoding) - a higher score is a better hand, see poker_hands for the layout.
+    All evaluators share one set of tables per process unless you hand one in
+    """
+
+    def __init__(self, tables: Optional[HandTables] = None):
+        self.__tables = tables or _shared_tables()
+        self.__rank_scores: Dict[int, int] = dict(zip(self.__tables.rank_keys.tolist(), self.__tables.rank_scores.tolist()))
+        self.__flush = self.__tables.flush.tolist()
+        self.__primes = np.asarray(RANK_PRIMES, dtype=np.int64)
+        self.__encoding = get_card_encoding(DeckType.FRENCH, 0)
+
+    @property
+    def tables(self) -> HandTables:
+        return self.__tables
+
+    def evaluate(self, card_ids: Iterable[int]) -> int:
+        product = 1
+        suit_masks = [0] * SUIT_COUNT
+        for card_id in card_ids:
+            rank, suit = divmod(card_id, SUIT_COUNT)
+            product *= RANK_PRIMES[rank]
+            suit_masks[suit] |= 1 << rank
+        # Flush table is 0 for suits with under 5 cards. With 7 cards a flush can come with quads or a full house, hence max
+        flush = self.__flush
+        return max(self.__rank_scores[product], flush[suit_masks[0]], flush[suit_masks[1]], flush[suit_masks[2]], flush[suit_masks[3]])
+
+    def evaluate_cards(self, cards: Iterable[Card | JokerCard]) -> int:
+        return self.evaluate(self.__encoding.encode(cards))
+
+    def evaluate_batch(self, card_ids: np.ndarray) -> np.ndarray:
+        """Scores for a (hands, cards) array of card IDs, 5 ~ 7 cards per hand"""
+        card_ids = np.asarray(card_ids, dtype=np.int64)
+        ranks, suits = np.divmod(card_ids, SUIT_COUNT)
+        rows = np.arange(card_ids.shape[0])
+
+        products = self.__primes[ranks].prod(axis=1)
+        scores = self.__tables.rank_scores[np.searchsorted(self.__tables.rank_keys, products)]
+
+        # Cards of one suit have distinct ranks, so summing their bits ORs them. At most one suit can hold 5+ of 7 cards
+        in_suit = suits[:, :, None] == np.arange(SUIT_COUNT)
+        suit_masks = (in_suit * np.left_shift(1, ranks)[:, :, None]).sum(axis=1)
+        flush_suit = in_suit.sum(axis=1).argmax(axis=1)
+        flush_scores = self.__tables.flush[suit_masks[rows, flush_suit]]
+        return np.maximum(scores, flush_scores)
+
+
+@lru_cache(maxsize=None)
+def shared_evaluator() -> HandEvaluator:
+    """One evaluator per process on the shared tables - building one costs a few milliseconds"""
+    return HandEvaluator()
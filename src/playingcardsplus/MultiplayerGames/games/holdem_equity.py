@@ -0,0 +1,212 @@
+"""
+Monte Carlo hand equity for Texas Hold'em - how often each player wins or splits the pot given what's known
+
+Known hole cards & a partial board are fixed, everything else (the rest of the board & any unknown hole cards) is dealt from what's
+left of the deck many times over. Samples are drawn & scored a batch at a time with NumPy (see hand_evaluator.py).
+
+-> win: share of samples the player won outright
+-> tie: share of samples the player split the pot
+-> equity: average share of the pot, ie. win + tie / (players splitting)
+
+Sampling stops at max_samples, or earlier once every player's equity is known to within target_ci at the given confidence.
+When there are no more possible deals than that (ie. on the turn or river), every deal is tried once instead and the result is exact.
+Batch i is always dealt from derive_seed(seed, i), so a fixed number of samples gives the same result with or without a process pool
+
+Requires NumPy - install the `numpy` extra
+"""
+
+from playingcardsplus.MultiplayerGames.enumeration import enumerate_deals, deal_count
+from playingcardsplus.MultiplayerGames.games.hand_evaluator import shared_evaluator
+from playingcardsplus.MultiplayerGames.games.texas_holdem import HOLE_CARD_COUNT, BOARD_CARD_COUNT, DECK_SIZE
+from playingcardsplus.card import Card
+from playingcardsplus.custom_error import DuplicateCardError, UnrecognizedCardError
+from playingcardsplus.deck import DeckType
+from playingcardsplus.encoding import get_card_encoding
+from playingcardsplus.rng import derive_seed
+
+import math
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from typing_extensions import NamedTuple, Tuple, List, Sequence, Optional
+
+
+class EquityResult(NamedTuple):
+    win: Tuple[float, ...] # one per player, in the order the hole cards were given
+    tie: Tuple[float, ...]
+    equity: Tuple[float, ...]
+    samples: int # deals looked at - every possible deal when exact
+    ci_half_width: float # widest confidence interval half width across players' equity, 0 when exact
+    exact: bool = False
+
+
+class _BatchTotals(NamedTuple):
+    wins: np.ndarray # (players,)
+    ties: np.ndarray
+    equity: np.ndarray # sum of pot shares
+    equity_squared: np.ndarray # sum of squared pot shares, for the confidence interval
+
+
+def __card_ids(cards: Sequence[Card], what: str) -> List[int]:
+    card_to_id = get_card_encoding(DeckType.FRENCH, 0).card_to_id
+    try:
+        return [card_to_id[card] for card in cards]
+    except KeyError as error:
+        raise UnrecognizedCardError("{} isn't a card of a {} card French deck ({})".format(error.args[0], DECK_SIZE, what))
+
+
+def _score_deals(hole_ids: np.ndarray, board_ids: np.ndarray, drawn: np.ndarray, weights: Optional[np.ndarray] = None) -> _BatchTotals:
+    """
+    hole_ids is (players, 2) with -1 for unknown cards. Each row of `drawn` fills the unknown hole cards, then the rest of the board
+    """
+    deal_count = drawn.shape[0]
+    unknown_holes = hole_ids < 0
+    hole_gaps = int(unknown_holes.sum())
+    holes = np.broadcast_to(hole_ids, (deal_count,) + hole_ids.shape).copy()
+    holes[:, unknown_holes] = drawn[:, :hole_gaps]
+    board = np.concatenate([np.broadcast_to(board_ids, (deal_count, len(board_ids))), drawn[:, hole_gaps:]], axis=1)
+
+    evaluator = shared_evaluator()
+    scores = np.empty((deal_count, hole_ids.shape[0]), dtype=np.int64)
+    for player in range(hole_ids.shape[0]):
+        scores[:, player] = evaluator.evaluate_batch(np.concatenate([holes[:, player], board], axis=1))
+
+    best = scores == scores.max(axis=1, keepdims=True)
+    splitting = best.sum(axis=1, keepdims=True)
+    share = best / splitting
+    weights = np.ones((deal_count, 1)) if weights is None else weights[:, None]
+    return _BatchTotals(
+        wins=((best & (splitting == 1)) * weights).sum(axis=0),
+        ties=((best & (splitting > 1)) * weights).sum(axis=0),
+        equity=(share * weights).sum(axis=0),
+        equity_squared=(share * share * weights).sum(axis=0),
+    )
+
+
+def _equity_batch(hole_ids: np.ndarray, board_ids: np.ndarray, undealt: np.ndarray, sample_count: int, seed: int) -> _BatchTotals:
+    """Deals every unknown card of `sample_count` samples at once"""
+    needed = int((hole_ids < 0).sum()) + BOARD_CARD_COUNT - len(board_ids)
+    if needed == 0: # nothing left to deal - every sample is the same deal, so score it once
+        return _score_deals(hole_ids, board_ids, np.empty((1, 0), dtype=undealt.dtype), weights=np.array([float(sample_count)]))
+    # Partial Fisher-Yates per sample - only the first `needed` cards get picked, they fill the gaps holes first then the board
+    rng = np.random.default_rng(seed)
+    drawn = np.broadcast_to(undealt, (sample_count, len(undealt))).copy()
+    rows = np.arange(sample_count)
+    for position in range(needed):
+        picked = rng.integers(position, len(undealt), size=sample_count)
+        drawn[rows, position], drawn[rows, picked] = drawn[rows, picked], drawn[rows, position]
+    return _score_deals(hole_ids, board_ids, drawn[:, :needed])
+
+
+def __exact_equity(hole_ids: np.ndarray, board_ids: np.ndarray, undealt: np.ndarray, slot_sizes: List[int], fixed_groups) -> EquityResult:
+    totals = _BatchTotals(*(np.zeros(hole_ids.shape[0]) for _ in _BatchTotals._fields))
+    for chunk in enumerate_deals(undealt.tolist(), slot_sizes, fixed_groups=fixed_groups):
+        totals = _BatchTotals(*(total + part for total, part in zip(totals, _score_deals(hole_ids, board_ids, chunk.deals, chunk.weights))))
+    deals = deal_count(len(undealt), slot_sizes)
+    return EquityResult(
+        win=tuple(float(value) for value in totals.wins / deals),
+        tie=tuple(float(value) for value in totals.ties / deals),
+        equity=tuple(float(value) for value in totals.equity / deals),
+        samples=deals,
+        ci_half_width=0.0,
+        exact=True,
+    )
+
+
+def holdem_equity(
+    hole_cards: Sequence[Optional[Sequence[Card]]],
+    board: Sequence[Card] = (),
+    dead: Sequence[Card] = (),
+    max_samples: int = 100_000,
+    batch_size: int = 10_000,
+    target_ci: Optional[float] = None,
+    confidence: float = 0.95,
+    seed: int = 0,
+    worker_count: int = 0,
+    exact: Optional[bool] = None,
+) -> EquityResult:
+    """
+    hole_cards has one entry per player - 2 cards, or None for a player whose cards aren't known.
+    `dead` cards are out of play (folded, burnt, seen) and never get dealt.
+    With target_ci, stops as soon as every player's equity is within ±target_ci. worker_count > 0 deals batches on that many processes.
+    exact=True walks through every possible deal instead (see enumeration.py) & exact=False always samples. By default it's exact
+    whenever there are no more possible deals than max_samples
+    """
+    if len(hole_cards) < 2:
+        raise ValueError("Equity needs at least 2 players but got {}".format(len(hole_cards)))
+    if len(board) > BOARD_CARD_COUNT:
+        raise ValueError("A board has at most {} cards but got {}".format(BOARD_CARD_COUNT, len(board)))
+    if max_samples < 1 or batch_size < 1:
+        raise ValueError("max_samples & batch_size should be at least 1")
+
+    hole_ids = np.full((len(hole_cards), HOLE_CARD_COUNT), -1, dtype=np.int64)
+    for player, cards in enumerate(hole_cards):
+        if cards is not None:
+            if len(cards) != HOLE_CARD_COUNT:
+                raise ValueError("Player {} should have {} hole cards but got {}".format(player, HOLE_CARD_COUNT, len(cards)))
+            hole_ids[player] = __card_ids(cards, "hole cards")
+    board_ids = np.asarray(__card_ids(board, "board"), dtype=np.int64)
+    dead_ids = __card_ids(dead, "dead cards")
+    known = [card_id for card_id in hole_ids.ravel().tolist() if card_id >= 0] + board_ids.tolist() + dead_ids
+    if len(set(known)) != len(known):
+        raise DuplicateCardError("Same card is in more than one of the hole cards, board & dead cards")
+    undealt = np.setdiff1d(np.arange(DECK_SIZE), known)
+    if int((hole_ids < 0).sum()) + BOARD_CARD_COUNT - len(board_ids) > len(undealt):
+        raise ValueError("Not enough cards left in the deck to deal the hand")
+
+    slot_sizes = [HOLE_CARD_COUNT] * sum(cards is None for cards in hole_cards) + [BOARD_CARD_COUNT - len(board_ids)]
+    if exact or (exact is None and deal_count(len(undealt), slot_sizes) <= max_samples):
+        return __exact_equity(hole_ids, board_ids, undealt, slot_sizes, [hole for hole in hole_ids.tolist() if hole[0] >= 0] + [board_ids.tolist(), dead_ids])
+
+    z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+    player_count = len(hole_cards)
+    totals = _BatchTotals(*(np.zeros(player_count) for _ in _BatchTotals._fields))
+    samples, batch_index = 0, 0
+    half_width = math.inf
+
+    def sizes(count: int) -> List[int]:
+        # Sizes of the next `count` batches - stops short at max_samples
+        result, remaining = [], max_samples - samples
+        for _ in range(count):
+            if remaining <= 0:
+                break
+            result.append(min(batch_size, remaining))
+            remaining -= result[-1]
+        return result
+
+    def add(sample_count: int, batch: _BatchTotals):
+        nonlocal totals, samples, half_width
+        totals = _BatchTotals(*(total + part for total, part in zip(totals, batch)))
+        samples += sample_count
+        mean = totals.equity / samples
+        variance = np.maximum(totals.equity_squared / samples - mean * mean, 0.0)
+        half_width = float(z * np.sqrt(variance / samples).max()) if samples > 1 else math.inf
+
+    def done() -> bool:
+        return samples >= max_samples or (target_ci is not None and half_width <= target_ci)
+
+    if worker_count > 0:
+        with ProcessPoolExecutor(max_workers=worker_count) as pool:
+            while not done():
+                # One wave of batches at a time so early stopping still gets checked
+                wave = sizes(worker_count)
+                futures = [
+                    pool.submit(_equity_batch, hole_ids, board_ids, undealt, size, derive_seed(seed, batch_index + offset))
+                    for offset, size in enumerate(wave)
+                ]
+                for size, future in zip(wave, futures):
+                    add(size, future.result())
+                batch_index += len(wave)
+    else:
+        while not done():
+            size = sizes(1)[0]
+            add(size, _equity_batch(hole_ids, board_ids, undealt, size, derive_seed(seed, batch_index)))
+            batch_index += 1
+
+    return EquityResult(
+        win=tuple(float(value) for value in totals.wins / samples),
+        tie=tuple(float(value) for value in totals.ties / samples),
+        equity=tuple(float(value) for value in totals.equity / samples),
+        samples=samples,
+        ci_half_width=half_width,
+    )
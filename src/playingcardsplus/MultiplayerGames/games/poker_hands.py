@@ -0,0 +1,174 @@
+"""
+Poker hand evaluation over card IDs (see playingcardsplus.encoding) - rank index is card_id // 4, suit index is card_id % 4
+
+Every hand gets a score where a higher score is a better hand and equal scores split the pot:
+-> bits 20~23: HandCategory
+-> bits 0~19: up to 5 rank indices (0 = two ... 12 = ace), 4 bits each, most significant first - the ranks that break ties within the category
+
+evaluate_five/evaluate_best are the plain reference implementation. evaluate_seven_batch scores a whole (samples, 7) array of
+card IDs in one go with NumPy and gives the same scores
+"""
+
+from enum import IntEnum
+from functools import lru_cache
+from itertools import combinations
+from collections import Counter
+from typing_extensions import Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError: # numpy is an optional extra - only evaluate_seven_batch needs it
+    np = None
+
+
+class HandCategory(IntEnum):
+    HIGH_CARD = 0
+    PAIR = 1
+    TWO_PAIR = 2
+    THREE_OF_A_KIND = 3
+    STRAIGHT = 4
+    FLUSH = 5
+    FULL_HOUSE = 6
+    FOUR_OF_A_KIND = 7
+    STRAIGHT_FLUSH = 8
+
+
+RANK_COUNT = 13
+SUIT_COUNT = 4
+ACE = RANK_COUNT - 1
+
+
+def pack_score(category: HandCategory, ranks: Sequence[int]) -> int:
+    score = int(category)
+    for index in range(5):
+        score = (score << 4) | (ranks[index] if index < len(ranks) else 0)
+    return score
+
+
+def score_category(score: int) -> HandCategory:
+    return HandCategory(score >> 20)
+
+
+def __straight_high(rank_set) -> int:
+    """Highest rank of a straight made from the ranks, -1 if there isn't one. Ace plays low in the wheel (A-2-3-4-5)"""
+    for high in range(ACE, 3, -1):
+        if all(rank in rank_set for rank in range(high - 4, high + 1)):
+            return high
+    if all(rank in rank_set for rank in (ACE, 0, 1, 2, 3)):
+        return 3
+    return -1
+
+
+def evaluate_five(card_ids: Sequence[int]) -> int:
+    ranks = [card_id // SUIT_COUNT for card_id in card_ids]
+    flush = len({card_id % SUIT_COUNT for card_id in card_ids}) == 1
+    straight_high = __straight_high(set(ranks)) if len(set(ranks)) == 5 else -1
+    # ranks ordered by how many of them there are, then by rank - ie. [pair, kicker, kicker, kicker]
+    groups = sorted(Counter(ranks).items(), key=lambda group: (group[1], group[0]), reverse=True)
+    ordered = [rank for rank, _ in groups]
+    counts = [count for _, count in groups]
+
+    if flush and straight_high >= 0:
+        return pack_score(HandCategory.STRAIGHT_FLUSH, [straight_high])
+    if counts[0] == 4:
+        return pack_score(HandCategory.FOUR_OF_A_KIND, ordered)
+    if counts[0] == 3 and counts[1] == 2:
+        return pack_score(HandCategory.FULL_HOUSE, ordered)
+    if flush:
+        return pack_score(HandCategory.FLUSH, sorted(ranks, reverse=True))
+    if straight_high >= 0:
+        return pack_score(HandCategory.STRAIGHT, [straight_high])
+    if counts[0] == 3:
+        return pack_score(HandCategory.THREE_OF_A_KIND, ordered)
+    if counts[0] == 2 and counts[1] == 2:
+        return pack_score(HandCategory.TWO_PAIR, ordered)
+    if counts[0] == 2:
+        return pack_score(HandCategory.PAIR, ordered)
+    return pack_score(HandCategory.HIGH_CARD, ordered)
+
+
+def evaluate_best(card_ids: Sequence[int]) -> int:
+    """Best 5 card hand out of 5~7 cards - tries every combination"""
+    return max(evaluate_five(hand) for hand in combinations(card_ids, 5))
+
+
+# *** Vectorized evaluation - every rank set is a 13 bit mask, so straights & top-5 kickers are table lookups
+@lru_cache(maxsize=None)
+def _rank_mask_tables() -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """(highest bit, straight high card or -1, top 5 ranks packed into 20 bits) for every 13 bit rank mask"""
+    size = 1 << RANK_COUNT
+    highest_bit = np.full(size, -1, dtype=np.int64)
+    straight_high = np.full(size, -1, dtype=np.int64)
+    top_five = np.zeros(size, dtype=np.int64)
+    for mask in range(1, size):
+        ranks = [rank for rank in range(ACE, -1, -1) if mask >> rank & 1]
+        highest_bit[mask] = ranks[0]
+        straight_high[mask] = __straight_high(set(ranks))
+        top_five[mask] = pack_score(HandCategory.HIGH_CARD, ranks[:5])
+    return highest_bit, straight_high, top_five
+
+
+def evaluate_seven_batch(card_ids: "np.ndarray") -> "np.ndarray":
+    """
+    Scores for a (samples, 7) array of distinct card IDs - same scores as evaluate_best, one per row
+    """
+    if np is None:
+        raise ImportError("evaluate_seven_batch() requires numpy - install the `numpy` extra")
+    highest_bit, straight_table, top_five = _rank_mask_tables()
+    card_ids = np.asarray(card_ids, dtype=np.int64)
+    ranks, suits = card_ids // SUIT_COUNT, card_ids % SUIT_COUNT
+    rows = np.arange(card_ids.shape[0])
+
+    rank_counts = (ranks[:, :, None] == np.arange(RANK_COUNT)).sum(axis=1)
+    rank_mask = ((rank_counts > 0) * np.left_shift(1, np.arange(RANK_COUNT))).sum(axis=1)
+
+    # Flush - with 7 cards at most one suit can have 5+. Cards of a suit have distinct ranks so summing their bits ORs them
+    in_suit = suits[:, :, None] == np.arange(SUIT_COUNT)
+    suit_sizes = in_suit.sum(axis=1)
+    suit_masks = (in_suit * np.left_shift(1, ranks)[:, :, None]).sum(axis=1)
+    flush_suit = suit_sizes.argmax(axis=1)
+    has_flush = suit_sizes[rows, flush_suit] >= 5
+    flush_mask = np.where(has_flush, suit_masks[rows, flush_suit], 0)
+    straight_flush_high = np.where(has_flush, straight_table[flush_mask], -1)
+    straight_high = straight_table[rank_mask]
+
+    # Ranks ordered by count then rank - r[0] is the quads/trips/highest pair, etc.
+    keys = np.where(rank_counts > 0, rank_counts*16 + np.arange(RANK_COUNT), -1)
+    keys = -np.sort(-keys, axis=1)[:, :4]
+    r, c = keys % 16, keys // 16
+
+    def shifted(*nibbles):
+        score = np.zeros(card_ids.shape[0], dtype=np.int64)
+        for index in range(5):
+            score = (score << 4) | (nibbles[index] if index < len(nibbles) else 0)
+        return score
+
+    def without(mask, *ranks_to_clear):
+        for rank in ranks_to_clear:
+            mask = mask & ~np.left_shift(1, rank)
+        return mask
+
+    quads_kicker = highest_bit[without(rank_mask, r[:, 0])]
+    two_pair_kicker = highest_bit[without(rank_mask, r[:, 0], r[:, 1])]
+
+    conditions = [
+        straight_flush_high >= 0,
+        c[:, 0] == 4,
+        (c[:, 0] == 3) & (c[:, 1] >= 2),
+        has_flush,
+        straight_high >= 0,
+        c[:, 0] == 3,
+        (c[:, 0] == 2) & (c[:, 1] == 2),
+        c[:, 0] == 2,
+    ]
+    choices = [
+        (HandCategory.STRAIGHT_FLUSH << 20) | shifted(straight_flush_high),
+        (HandCategory.FOUR_OF_A_KIND << 20) | shifted(r[:, 0], quads_kicker),
+        (HandCategory.FULL_HOUSE << 20) | shifted(r[:, 0], r[:, 1]),
+        (HandCategory.FLUSH << 20) | top_five[flush_mask],
+        (HandCategory.STRAIGHT << 20) | shifted(straight_high),
+        (HandCategory.THREE_OF_A_KIND << 20) | shifted(r[:, 0], r[:, 1], r[:, 2]),
+        (HandCategory.TWO_PAIR << 20) | shifted(r[:, 0], r[:, 1], two_pair_kicker),
+        (HandCategory.PAIR << 20) | shifted(r[:, 0], r[:, 1], r[:, 2], r[:, 3]),
+    ]
+    return np.select(conditions, choices, default=(HandCategory.HIGH_CARD << 20) | top_five[rank_mask])
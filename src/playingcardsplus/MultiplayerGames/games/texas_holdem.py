@@ -5,8 +5,14 @@ from playingcardsplus.MultiplayerGames.deck import Distributee, MultiPlayerDeck
 from playingcardsplus.MultiplayerGames.rules import Rules
 from playingcardsplus.MultiplayerGames.game import Game
 from playingcardsplus.dealer import CardDistributionMethod
+from playingcardsplus.custom_error import RuleViolationError
 
-# from typing_extensions import Dict, Iterable, Optional, Tuple
+from typing_extensions import Dict, Iterable
+
+try:
+    from playingcardsplus.MultiplayerGames.games.hand_evaluator import shared_evaluator
+except ImportError: # numpy is an optional extra - only scoring hands from the flop on needs it
+    shared_evaluator = None
 
 __HoldemPlayerOperations = InstructionSet(
     instructions={
@@ -17,6 +23,35 @@ __HoldemPlayerOperations = InstructionSet(
 )
 
 class HoldemInstructionSet(InstructionSetImplementer):
+    """
+    Betting doesn't move any cards so none of these touch the deck. What each player has put in the pot & whether they've folded
+    is kept on the Player (Player.stake & Player.folded), so Game.reset, snapshot/restore & fork carry it like the hands
+    1) bet: aux is the amount, raises included - adds it to what the player has in the pot
+    2) fold: the player sits out every bet & check after it, and scores nothing
+    3) check: nothing changes, only a player still in the hand can do it
+    """
+
+    @staticmethod
+    def pot(players: Iterable[Player]) -> int:
+        """Chips the given players (ie. a game's roster) have put in"""
+        return sum(player.stake for player in players)
+
+    def __check_in_hand(self, player: Player, operation: str):
+        if player.folded:
+            raise RuleViolationError("{} has folded and can't {}".format(player.name, operation))
+
+    def bet(self, player: Player, dealer: Dealer, deck: MultiPlayerDeck, aux) -> int:
+        self.__check_in_hand(player, "bet")
+        if not isinstance(aux, int) or isinstance(aux, bool) or aux <= 0:
+            raise RuleViolationError("A bet has to be a positive number of chips but got {!r}".format(aux))
+        return player._add_stake(aux)
+
+    def fold(self, player: Player, dealer: Dealer, deck: MultiPlayerDeck, aux) -> None:
+        self.__check_in_hand(player, "fold")
+        player._fold()
+
+    def check(self, player: Player, dealer: Dealer, deck: MultiPlayerDeck, aux) -> None:
+        self.__check_in_hand(player, "check")
 
 __HoldemRules = Rules(
     deck_size=52,
@@ -41,6 +76,29 @@ __HoldemRules = Rules(
 )
 
 
+# Public names for the rules & operations above - for building Hold'em games outside this module
+HOLDEM_RULES = __HoldemRules
+HOLDEM_OPERATIONS = __HoldemPlayerOperations
+
+# Shape of a hand of Hold'em from the rules - the turn & river are the 2 hands dealt after the flop with rules.*_hand_i
+__StreetsAfterFlop = 2
+HOLE_CARD_COUNT = __HoldemRules.cards_per_player_early_hands[0]
+BOARD_CARD_COUNT = sum(__HoldemRules.board_distribution_early_hands) + __HoldemRules.board_distribution_hand_i*__StreetsAfterFlop
+DECK_SIZE = __HoldemRules.deck_size
+
 
 class TexasHoldem(Game):
-    pass
+    """One hand of Hold'em from the deal to the river"""
+
+    def calculate_score(self) -> Dict[Player, int]:
+        # Strength of each player's best 5 out of their hole cards & the board (see games/hand_evaluator.py) - 0 before the flop & once folded
+        if self.deck.board_count + HOLE_CARD_COUNT < 5:
+            return {player: 0 for player in self.roster}
+        if shared_evaluator is None:
+            raise ImportError("Scoring Texas Hold'em hands requires numpy - install the `numpy` extra")
+        evaluator = shared_evaluator()
+        board_ids = self.deck.encoding.encode(card for card, present in self.deck.board.items() if present)
+        return {player: 0 if player.folded else evaluator.evaluate(player.hand.card_ids() + board_ids) for player in self.roster}
+
+    def is_over(self) -> bool:
+        return self.deck.board_count >= BOARD_CARD_COUNT
@@ -0,0 +1,185 @@
+"""
+Player hand stored as a count per card ID (see playingcardsplus.encoding) instead of a DefaultDict[Card, int]
+
+The hand keeps running totals as cards come and go, so
+-> size (how many cards are held) is O(1)
+-> rank_counts[rank index] (how many of a rank's cards are held) is O(1) - ie. "do I hold all four 7s"
+-> mask is the held card IDs as a bitmask, ready for encoding.from_mask or a BitsetDeck comparison
+
+It is still a MutableMapping[Card, int] so `hand[card]`, `hand[card] = False`, `hand.items()`, etc. keep working.
+Unlike a defaultdict, reading a card never adds it, and only cards actually held show up when iterating
+"""
+
+from playingcardsplus.card import Card, JokerCard, Rank, Suit
+from playingcardsplus.deck import DeckType
+from playingcardsplus.encoding import get_card_encoding
+from playingcardsplus.custom_error import DeckInlclusionError, UnrecognizedCardError
+
+import sys
+from array import array
+from collections.abc import MutableMapping
+from typing_extensions import Iterator, Mapping, List, Optional, Tuple
+
+
+class CardCountHand(MutableMapping):
+    """
+    Fixed-size count array indexed by card ID. The array grows to fit jokers as they show up,
+    so the same hand works no matter how many jokers the deck was made with
+    """
+
+    __slots__ = ("__encoding", "__counts", "__size", "__rank_counts", "__mask")
+    __RANK_INDEX = {rank.value: index for index, rank in enumerate(Rank)}
+
+    def __init__(self, cards: Optional[Mapping[Card | JokerCard, int]] = None, deck_type: DeckType = DeckType.FRENCH):
+        self.__encoding = get_card_encoding(deck_type, 0)
+        self.__counts = [0] * self.__encoding.size
+        self.__size = 0
+        self.__rank_counts = [0] * len(Rank)
+        self.__mask = 0
+        if cards:
+            for card, count in cards.items():
+                self[card] = count
+
+    @property
+    def deck_type(self) -> DeckType:
+        return self.__encoding.deck_type
+
+    @property
+    def size(self) -> int:
+        """Number of cards held, counting duplicates"""
+        return self.__size
+
+    @property
+    def rank_counts(self) -> Tuple[int, ...]:
+        """How many different cards of each rank are held, indexed by Rank order (jokers aren't counted)"""
+        return tuple(self.__rank_counts)
+
+    @property
+    def mask(self) -> int:
+        """Bit i is set when card ID i is held"""
+        return self.__mask
+
+    @property
+    def counts(self) -> Tuple[int, ...]:
+        """Count per card ID"""
+        return tuple(self.__counts)
+
+    def rank_count(self, rank: Rank | str) -> int:
+        return self.__rank_counts[CardCountHand.__RANK_INDEX[rank]]
+
+    def holds_all_of(self, rank: Rank | str) -> bool:
+        """Whether every suit of the rank is in the hand"""
+        return self.__rank_counts[CardCountHand.__RANK_INDEX[rank]] == len(Suit)
+
+    def card_ids(self) -> List[int]:
+        """Held card IDs in ID order"""
+        return [card_id for card_id, count in enumerate(self.__counts) if count]
+
+    def card_id(self, card: Card | JokerCard) -> int:
+        card_id = self.__encoding.card_to_id.get(card)
+        if card_id is None:
+            card_id = self.__joker_id(card)
+        return card_id
+
+    def __joker_id(self, card: Card | JokerCard) -> int:
+        # Jokers are appended after the regular cards, so we look them up in a table that's just big enough for this one
+        if not isinstance(card, JokerCard) or not isinstance(card.number, int) or card.number < 1:
+            raise UnrecognizedCardError("'{}' is not a card of a {} deck".format(card, self.deck_type.value))
+        card_id = get_card_encoding(self.deck_type, card.number).card_to_id.get(card)
+        if card_id is None:
+            raise UnrecognizedCardError("'{}' is not a card of a {} deck".format(card, self.deck_type.value))
+        if card_id >= len(self.__counts):
+            self.__counts.extend([0] * (card_id + 1 - len(self.__counts)))
+        return card_id
+
+    def __card_for(self, card_id: int) -> Card | JokerCard:
+        if card_id < self.__encoding.size:
+            return self.__encoding.id_to_card[card_id]
+        return get_card_encoding(self.deck_type, card_id + 1 - self.__encoding.size).id_to_card[card_id]
+
+    def __set_count(self, card_id: int, count: int):
+        previous = self.__counts[card_id]
+        if previous == count:
+            return
+        self.__counts[card_id] = count
+        self.__size += count - previous
+        if bool(previous) != bool(count):
+            self.__mask ^= 1 << card_id
+            if card_id < self.__encoding.size:
+                self.__rank_counts[self.__encoding.rank_index[card_id]] += 1 if count else -1
+
+    def add(self, card: Card | JokerCard, count: int = 1):
+        card_id = self.card_id(card)
+        self.__set_count(card_id, self.__counts[card_id] + count)
+
+    def remove(self, card: Card | JokerCard, count: int = 1):
+        card_id = self.card_id(card)
+        if self.__counts[card_id] < count:
+            raise DeckInlclusionError("Cannot remove {} of '{}' from a hand holding {}".format(count, card, self.__counts[card_id]))
+        self.__set_count(card_id, self.__counts[card_id] - count)
+
+    def to_bytes(self) -> bytes:
+        """Count per card ID as 16 bit little endian integers (one byte would cap counts at 255) - restore() takes it back"""
+        counts = array("H", self.__counts)
+        if sys.byteorder == "big":
+            counts.byteswap()
+        return counts.tobytes()
+
+    def restore(self, packed: bytes):
+        counts = array("H")
+        counts.frombytes(packed)
+        if sys.byteorder == "big":
+            counts.byteswap()
+        self.__counts = counts.tolist()
+        self.__size = sum(self.__counts)
+        self.__rank_counts = [0] * len(Rank)
+        self.__mask = 0
+        rank_index, regular_count = self.__encoding.rank_index, self.__encoding.size
+        for card_id, count in enumerate(self.__counts):
+            if count:
+                self.__mask |= 1 << card_id
+                if card_id < regular_count:
+                    self.__rank_counts[rank_index[card_id]] += 1
+
+    def clear(self):
+        self.__counts = [0] * len(self.__counts)
+        self.__size = 0
+        self.__rank_counts = [0] * len(self.__rank_counts)
+        self.__mask = 0
+
+    # MutableMapping API
+    def __getitem__(self, card: Card | JokerCard) -> int:
+        try:
+            return self.__counts[self.card_id(card)]
+        except UnrecognizedCardError:
+            raise KeyError(card)
+
+    def __setitem__(self, card: Card | JokerCard, count: int | bool):
+        # Games write False/True into hands to take away/give cards
+        count = int(count)
+        if count < 0:
+            raise ValueError("A hand cannot hold {} of '{}'".format(count, card))
+        self.__set_count(self.card_id(card), count)
+
+    def __delitem__(self, card: Card | JokerCard):
+        card_id = self.card_id(card)
+        if not self.__counts[card_id]: # same as the dict it replaces - can't delete what isn't held
+            raise KeyError(card)
+        self.__set_count(card_id, 0)
+
+    def __contains__(self, card: object) -> bool:
+        try:
+            return self.__counts[self.card_id(card)] > 0
+        except (UnrecognizedCardError, TypeError, AttributeError):
+            return False
+
+    def __iter__(self) -> Iterator[Card | JokerCard]:
+        for card_id in self.card_ids():
+            yield self.__card_for(card_id)
+
+    def __len__(self) -> int:
+        """Number of different cards held"""
+        return self.__mask.bit_count()
+
+    def __repr__(self) -> str:
+        return "CardCountHand({})".format(dict(self.items()))
@@ -0,0 +1,77 @@
+"""
+Bounded history of the GameStates players acted on - what Player.take_action gets as historical_states
+
+Only the last `depth` states are kept (oldest are evicted first), and the states themselves are structurally shared:
+Game.game_state() reuses the same GameState while the deck hasn't moved and the deck reuses the same board snapshot
+while the board hasn't changed, so an entry costs a few counters plus a reference rather than a copy of the deck.
+Memory per game is O(depth x board size) no matter how many hands are played
+"""
+
+from playingcardsplus.MultiplayerGames.data import GameState
+
+from collections import deque
+from collections.abc import Sequence
+from typing_extensions import Deque, Iterator, List
+
+
+class HistoryView(Sequence):
+    """
+    Read-only, zero-copy window onto a GameStateHistory - index 0 is the oldest state kept, -1 the latest.
+    It's live, so hang on to a view and it'll follow the history as it grows. Copy it with list(view) to freeze it
+    """
+
+    __slots__ = ("__states",)
+
+    def __init__(self, states: Deque[GameState]):
+        self.__states = states
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self.__states)[index]
+        return self.__states[index]
+
+    def __len__(self) -> int:
+        return len(self.__states)
+
+    def __iter__(self) -> Iterator[GameState]:
+        return iter(self.__states)
+
+    def __reversed__(self) -> Iterator[GameState]:
+        return reversed(self.__states)
+
+    def __repr__(self) -> str:
+        return "HistoryView({})".format(list(self.__states))
+
+
+class GameStateHistory:
+    """Ring buffer of the last `depth` GameStates. depth=0 keeps nothing"""
+
+    def __init__(self, depth: int):
+        if depth < 0:
+            raise ValueError("History depth can't be negative but got {}".format(depth))
+        self.__states = deque(maxlen=depth)
+        self.__view = HistoryView(self.__states)
+
+    @property
+    def depth(self) -> int:
+        return self.__states.maxlen
+
+    @property
+    def view(self) -> HistoryView:
+        return self.__view
+
+    def push(self, state: GameState) -> bool:
+        """Appends the state unless it's the one already on top - returns whether it was added"""
+        if self.__states.maxlen == 0 or (self.__states and self.__states[-1] is state):
+            return False
+        self.__states.append(state)
+        return True
+
+    def clear(self):
+        self.__states.clear()
+
+    def __len__(self) -> int:
+        return len(self.__states)
+
+    def to_list(self) -> List[GameState]:
+        return list(self.__states)
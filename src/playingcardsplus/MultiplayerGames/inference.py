@@ -0,0 +1,134 @@
+"""
+Batched policy inference across many games at once
+
+Games are stepped cooperatively: each in-flight game runs until one of its players needs to decide (Game.take_player_actions_steps
+yields a PolicyRequest), then waits. The broker collects pending requests from every waiting game and calls the policy once per
+batch of up to `max_batch_size`, then sends each game its player's actions and lets it run to its next decision.
+A batch goes out as soon as it's full or every in-flight game is waiting on it - stepping is single threaded,
+so there's nothing else to wait for and no timeout needed. Results don't depend on the batch size.
+
+The policy sees a whole batch - ie. encode it with an ObservationEncoder, run the network once, decode each row.
+"""
+
+from playingcardsplus.MultiplayerGames.game import Game
+from playingcardsplus.MultiplayerGames.instructions import Instruction, InstructionSetImplementer
+from playingcardsplus.MultiplayerGames.player import PolicyRequest
+from playingcardsplus.MultiplayerGames.simulator import GameResult, play_game_steps
+
+import time
+from collections import deque
+from typing_extensions import Callable, NamedTuple, List, Tuple, Any, Sequence, Iterable, Iterator, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from playingcardsplus.MultiplayerGames.observation import ObservationEncoder, Observation
+
+
+Actions = List[Tuple[Instruction, Any]]
+BatchPolicy = Callable[[Sequence[PolicyRequest]], Sequence[Actions]] # one list of actions per request, in the same order
+
+
+class InferenceReport(NamedTuple):
+    game_count: int
+    request_count: int
+    batch_count: int
+    elapsed_seconds: float
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.request_count / self.batch_count if self.batch_count else 0.0
+
+
+class ObservationPolicy:
+    """
+    BatchPolicy for NumPy models - encodes the batch into one observation buffer, calls `model` once with it
+    and turns each row of the model's output back into actions with `decode(row, request)`
+    """
+
+    def __init__(self, encoder: "ObservationEncoder", model: Callable[["Observation"], Any], decode: Callable[[Any, PolicyRequest], Actions]):
+        self.__encoder = encoder
+        self.__model = model
+        self.__decode = decode
+
+    def __call__(self, requests: Sequence[PolicyRequest]) -> List[Actions]:
+        from playingcardsplus.MultiplayerGames.observation import ObservationInput
+
+        observation = self.__encoder.encode_batch([
+            ObservationInput(
+                game_state=request.current_game_state,
+                hand=request.player.hand,
+                cheating_state=request.cheating_states[-1] if request.cheating_states else None,
+                player_name=request.player.name,
+            )
+            for request in requests
+        ])
+        outputs = self.__model(observation)
+        return [self.__decode(outputs[index], request) for index, request in enumerate(requests)]
+
+
+class InferenceBroker:
+    """
+    Plays games with one policy call per batch of decisions instead of one per player.
+    At most `max_in_flight` games are open at once - new ones are pulled from the iterable as others finish
+    """
+
+    def __init__(self, policy: BatchPolicy, max_batch_size: int = 256, max_in_flight: Optional[int] = None):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size should be at least 1 but got {}".format(max_batch_size))
+        self.__policy = policy
+        self.__max_batch_size = max_batch_size
+        self.__max_in_flight = max_in_flight or max_batch_size
+        self.__report: Optional[InferenceReport] = None
+
+    @property
+    def report(self) -> Optional[InferenceReport]:
+        """Available once run() has been exhausted"""
+        return self.__report
+
+    def run(self, games: Iterable[Game], instruction_implementer: InstructionSetImplementer, max_hands: int = 1000) -> Iterator[GameResult]:
+        """Yields each game's result as it finishes - game_index is the game's position in `games`"""
+        started = time.perf_counter()
+        game_count, request_count, batch_count = 0, 0, 0
+        games = iter(enumerate(games))
+        pending = deque() # (game_index, game, steps, request) - at most one per game since a game waits on its request
+        finished: List[GameResult] = []
+
+        def advance(game_index: int, game: Game, steps, actions: Optional[Actions]):
+            try:
+                request = next(steps) if actions is None else steps.send(actions)
+                pending.append((game_index, game, steps, request))
+            except StopIteration as stop:
+                finished.append(GameResult(game_index=game_index, seed=game.seed, records=stop.value))
+
+        in_flight, exhausted = 0, False
+        while True:
+            # Top up with new games - they run until their first decision
+            while not exhausted and in_flight < self.__max_in_flight:
+                game_index, game = next(games, (None, None))
+                if game is None:
+                    exhausted = True
+                    break
+                in_flight += 1
+                advance(game_index, game, play_game_steps(game, instruction_implementer, max_hands), None)
+
+            for result in finished:
+                in_flight -= 1
+                game_count += 1
+                yield result
+            finished.clear()
+            if not pending:
+                if exhausted and in_flight == 0:
+                    break
+                continue
+
+            batch = [pending.popleft() for _ in range(min(self.__max_batch_size, len(pending)))]
+            decisions = self.__policy([request for (_, _, _, request) in batch])
+            if len(decisions) != len(batch):
+                raise ValueError("Policy returned {} decisions for {} requests".format(len(decisions), len(batch)))
+            request_count += len(batch)
+            batch_count += 1
+            for (game_index, game, steps, _), actions in zip(batch, decisions):
+                advance(game_index, game, steps, list(actions))
+
+        self.__report = InferenceReport(
+            game_count=game_count, request_count=request_count, batch_count=batch_count, elapsed_seconds=time.perf_counter() - started
+        )
@@ -1,5 +1,8 @@
+from playingcardsplus.custom_error import UnknownInstructionError
+
 from abc import ABC
-from typing_extensions import NamedTuple, Set
+from types import MappingProxyType
+from typing_extensions import NamedTuple, Set, Tuple, Mapping, Callable, Any, Optional
 
 
 class Instruction(NamedTuple):
@@ -13,6 +16,66 @@ class InstructionSetImplementer(ABC):
     def __init__(self, instruction_set:InstructionSet):
         self.__instruction_set = instruction_set
 
+    def compile(self, instruction_set: Optional[InstructionSet] = None) -> "CompiledInstructionSet":
+        """
+        Dispatch table for the instruction set (its own by default). Hold on to it rather than calling this per action -
+        it isn't cached here so implementers stay picklable for process pools
+        """
+        return compile_instruction_set(self.__instruction_set if instruction_set is None else instruction_set, self)
+
+
+class CompiledInstructionSet(NamedTuple):
+    """
+    InstructionSet bound to an InstructionSetImplementer - opcode i is operations[i] and runs handlers[i].
+    Opcodes follow the sorted operation names, so they're stable across processes and match data_stream's ordering
+    """
+    operations: Tuple[str, ...]
+    opcodes: Mapping[str, int] # read-only
+    handlers: Tuple[Callable[..., Any], ...] # called as handler(player, dealer, deck, aux)
+
+    def opcode(self, instruction: "Instruction | str | int") -> int:
+        """Players may hand in an Instruction, its operation name or the opcode itself"""
+        if isinstance(instruction, bool): # an int to isinstance, but never meant as an opcode
+            raise UnknownInstructionError("{} is not an opcode".format(instruction))
+        if isinstance(instruction, int):
+            if not 0 <= instruction < len(self.handlers):
+                raise UnknownInstructionError("Opcode {} is out of range - there are {} instructions".format(instruction, len(self.handlers)))
+            return instruction
+        operation = instruction.operation if isinstance(instruction, Instruction) else instruction
+        try:
+            return self.opcodes[operation]
+        except KeyError:
+            raise UnknownInstructionError("'{}' is not part of the instruction set {}".format(operation, list(self.operations)))
+
+    # mappingproxy can't be copied or pickled - rebuild opcodes from the operations instead. Handlers are bound methods,
+    # so pickling sends the implementer along, and a deep copy shares it like a game's other rule objects
+    def __reduce__(self):
+        return (_compiled_instruction_set, (self.operations, self.handlers))
+
+    def __deepcopy__(self, memo) -> "CompiledInstructionSet":
+        return self # immutable all the way down
+
+
+def _compiled_instruction_set(operations: Tuple[str, ...], handlers: Tuple[Callable[..., Any], ...]) -> CompiledInstructionSet:
+    return CompiledInstructionSet(
+        operations=operations,
+        opcodes=MappingProxyType({operation: opcode for opcode, operation in enumerate(operations)}),
+        handlers=handlers,
+    )
+
+
+def compile_instruction_set(instruction_set: InstructionSet, instruction_implementer: InstructionSetImplementer) -> CompiledInstructionSet:
+    """Looks every operation up on the implementer once - fails here rather than skipping actions mid game"""
+    operations = tuple(sorted(instruction.operation for instruction in instruction_set.instructions))
+    handlers = []
+    for operation in operations:
+        handler = getattr(instruction_implementer, operation, None)
+        if not callable(handler):
+            raise UnknownInstructionError("{} doesn't implement '{}'".format(type(instruction_implementer).__name__, operation))
+        handlers.append(handler)
+    return _compiled_instruction_set(operations, tuple(handlers))
+
+
 def validate_instruction_set(values: set) -> InstructionSet:
     if not isinstance(values, set):
         raise TypeError("Not a Set!")
@@ -0,0 +1,161 @@
+"""
+Turns what a player sees into fixed-shape NumPy arrays a policy network can take - one observation per (game, player)
+
+An observation is
+-> planes (plane_count, card_count): one row per pile, one column per card ID (see playingcardsplus.encoding)
+    hand: how many of each card the player holds
+    board: cards on the board
+    and with include_cheating, what a CheatingState leaks
+    unused: cards left in unused, weighted by how close they are to the top (1 = top of the pile)
+    trash_pile: cards in the trash pile
+    opponents: cards held by any other player
+-> scalars (scalar_count,): pile counts & player count divided by the deck size, so they sit in 0 ~ 1
+
+Encoding a batch writes every (game, player) into one preallocated (batch, ...) buffer so the model gets called once per batch.
+Buffers are reused across calls - copy whatever you need to keep before encoding the next batch.
+
+Requires NumPy - install the `numpy` extra
+"""
+
+from playingcardsplus.MultiplayerGames.data import GameState, CheatingState
+from playingcardsplus.MultiplayerGames.hand import CardCountHand
+from playingcardsplus.card import Card, JokerCard
+from playingcardsplus.deck import DeckType
+from playingcardsplus.encoding import CardEncoding, get_card_encoding
+
+import numpy as np
+from typing_extensions import NamedTuple, Tuple, Mapping, Optional, Sequence
+
+
+class ObservationSpec(NamedTuple):
+    plane_names: Tuple[str, ...]
+    scalar_names: Tuple[str, ...]
+    card_count: int
+
+    @property
+    def plane_shape(self) -> Tuple[int, int]:
+        return len(self.plane_names), self.card_count
+
+    @property
+    def flat_size(self) -> int:
+        return len(self.plane_names)*self.card_count + len(self.scalar_names)
+
+
+class Observation(NamedTuple):
+    planes: np.ndarray # (batch, plane_count, card_count), or (plane_count, card_count) for a single observation
+    scalars: np.ndarray # (batch, scalar_count), or (scalar_count,)
+
+
+class ObservationInput(NamedTuple):
+    """Everything one player sees at one decision point"""
+    game_state: GameState
+    hand: Mapping[Card | JokerCard, int]
+    cheating_state: Optional[CheatingState] = None
+    player_name: Optional[str] = None # leaves the player's own hand out of the opponents plane
+
+
+class ObservationEncoder:
+    """
+    Encoder for one (DeckType, joker_count). Keeps its own (batch, ...) buffers and grows them when a bigger batch comes in
+    """
+
+    def __init__(self, deck_type: DeckType = DeckType.FRENCH, joker_count: int = 0, include_cheating: bool = False, dtype=np.float32):
+        self.__encoding = get_card_encoding(deck_type, joker_count)
+        self.__include_cheating = include_cheating
+        self.__dtype = np.dtype(dtype)
+        plane_names = ("hand", "board") + (("unused", "trash_pile", "opponents") if include_cheating else ())
+        self.__spec = ObservationSpec(
+            plane_names=plane_names,
+            scalar_names=("unused_count", "board_count", "trash_pile_count", "player_hand_count", "player_count"),
+            card_count=self.__encoding.size,
+        )
+        self.__planes = np.zeros((0,) + self.__spec.plane_shape, dtype=self.__dtype)
+        self.__scalars = np.zeros((0, len(self.__spec.scalar_names)), dtype=self.__dtype)
+
+    @property
+    def spec(self) -> ObservationSpec:
+        return self.__spec
+
+    @property
+    def encoding(self) -> CardEncoding:
+        return self.__encoding
+
+    def allocate(self, batch_size: int) -> Observation:
+        """Fresh zeroed buffers of the right shape - pass them as `out` to keep observations around"""
+        return Observation(
+            planes=np.zeros((batch_size,) + self.__spec.plane_shape, dtype=self.__dtype),
+            scalars=np.zeros((batch_size, len(self.__spec.scalar_names)), dtype=self.__dtype),
+        )
+
+    def __buffers(self, batch_size: int) -> Observation:
+        if self.__planes.shape[0] < batch_size:
+            self.__planes, self.__scalars = self.allocate(batch_size)
+        return Observation(planes=self.__planes[:batch_size], scalars=self.__scalars[:batch_size])
+
+    def __ids(self, cards) -> np.ndarray:
+        card_to_id = self.__encoding.card_to_id
+        return np.fromiter((card_to_id[card] for card in cards), dtype=np.intp)
+
+    def __encode_hand(self, row: np.ndarray, hand: Mapping[Card | JokerCard, int]):
+        if isinstance(hand, CardCountHand):
+            counts = hand.counts
+            if len(counts) > row.shape[0]:
+                raise ValueError("Hand has room for {} cards but the encoder only knows {} - build it with the deck's joker_count".format(len(counts), row.shape[0]))
+            row[:len(counts)] = counts
+        else:
+            card_to_id = self.__encoding.card_to_id
+            for card, count in hand.items():
+                if count:
+                    card_id = card_to_id.get(card)
+                    if card_id is None:
+                        raise ValueError("{} isn't part of the encoder's deck - build it with the deck's joker_count".format(card))
+                    row[card_id] = count
+
+    def __encode_one(self, planes: np.ndarray, scalars: np.ndarray, item: ObservationInput):
+        game_state = item.game_state
+        planes[:] = 0
+        self.__encode_hand(planes[0], item.hand)
+        planes[1, self.__ids(card for card, present in game_state.board.items() if present)] = 1
+
+        if self.__include_cheating and item.cheating_state is not None:
+            cheating_state = item.cheating_state
+            unused = self.__ids(cheating_state.unused)
+            if len(unused):
+                planes[2, unused] = np.arange(1, len(unused) + 1, dtype=self.__dtype) / len(unused)
+            planes[3, self.__ids(cheating_state.trash_pile)] = 1
+            for player_name, cards in cheating_state.player_hands.items():
+                if player_name != item.player_name:
+                    planes[4, self.__ids(cards)] = 1
+
+        deck_size = self.__encoding.size
+        scalars[:] = (
+            game_state.unused_count / deck_size,
+            sum(game_state.board.values()) / deck_size,
+            game_state.trash_pile_count / deck_size,
+            game_state.player_hand_count / deck_size,
+            game_state.player_count / deck_size,
+        )
+
+    def encode(self, game_state: GameState, hand: Mapping[Card | JokerCard, int], cheating_state: Optional[CheatingState] = None,
+               player_name: Optional[str] = None, out: Optional[Observation] = None) -> Observation:
+        """Single observation - a view into the encoder's buffer (or `out`) without the batch dimension"""
+        batch = self.encode_batch([ObservationInput(game_state, hand, cheating_state, player_name)], out=out)
+        return Observation(planes=batch.planes[0], scalars=batch.scalars[0])
+
+    def encode_batch(self, items: Sequence[ObservationInput], out: Optional[Observation] = None) -> Observation:
+        """
+        Row i of the result is items[i]. Without `out`, the result is a view into the encoder's own buffers
+        and gets overwritten by the next call
+        """
+        buffers = self.__buffers(len(items)) if out is None else out
+        if buffers.planes.shape[0] < len(items):
+            raise ValueError("Output buffers hold {} observations but {} were given".format(buffers.planes.shape[0], len(items)))
+        for index, item in enumerate(items):
+            self.__encode_one(buffers.planes[index], buffers.scalars[index], item)
+        return Observation(planes=buffers.planes[:len(items)], scalars=buffers.scalars[:len(items)])
+
+    def flatten(self, observation: Observation) -> np.ndarray:
+        """(batch, flat_size) - planes followed by scalars, for models that take a single vector"""
+        planes = observation.planes.reshape(observation.planes.shape[0], -1) if observation.planes.ndim == 3 else observation.planes.reshape(1, -1)
+        scalars = observation.scalars if observation.scalars.ndim == 2 else observation.scalars.reshape(1, -1)
+        return np.concatenate([planes, scalars], axis=1)
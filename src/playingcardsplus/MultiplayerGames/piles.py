@@ -0,0 +1,12 @@
+"""
+Names of a MultiPlayerDeck's piles - its own module so both deck backends (deck.py & bitset_deck.py) can share it
+"""
+
+from enum import Enum
+
+
+class Distributee(str, Enum):
+    PLAYER="player"
+    BOARD="board"
+    TRASH_PILE="trash_pile"
+    UNUSED="unused"
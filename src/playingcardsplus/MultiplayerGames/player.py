@@ -1,8 +1,9 @@
 from playingcardsplus.MultiplayerGames.instructions import Instruction, InstructionSetImplementer
 from playingcardsplus.MultiplayerGames.data import GameState, CheatingState
+from playingcardsplus.MultiplayerGames.hand import CardCountHand
 from playingcardsplus.card import Card, JokerCard
 
-from typing_extensions import Optional, DefaultDict, Dict, NamedTuple, List, Any, Tuple
+from typing_extensions import Optional, Mapping, Dict, NamedTuple, List, Any, Tuple, Sequence
 from pydantic import BaseModel, Field
 
 
@@ -42,17 +43,36 @@ class PlayerBehavior(NamedTuple):
         return self.soul["model"](arg)
 
 
+class PlayerSnapshot(NamedTuple):
+    hand: bytes # 16 bit count per card ID - see CardCountHand.to_bytes
+    score: int
+    stake: int = 0
+    folded: bool = False
+
+
+class PolicyRequest(NamedTuple):
+    """Everything a player's decision is made from - Game yields one of these per player when stepped (see Game.take_player_actions_steps)"""
+    player: "Player"
+    current_game_state: GameState
+    historical_states: Sequence[GameState]
+    cheating_states: Optional[List[CheatingState]]
+
+
 #TODO: it remaisn a choice whether to input a soul of a player of specific game or simply to input soul and separate types of players per game as a difff object...
 class Player:
     """
     Player object where name is immutable. Behavior - defined by AI can be modified each hand
     """
 
-    def __init__(self, name: str, initial_hand: DefaultDict[Card | JokerCard, int], initial_score: int, behvior: PlayerBehavior):
+    def __init__(self, name: str, initial_hand: Mapping[Card | JokerCard, int], initial_score: int, behvior: PlayerBehavior):
         self.__name = name
-        self.__hand = initial_hand
+        # Any mapping of card -> count (ie. a defaultdict(int)) is copied into a count array - see hand.py
+        self.__hand = initial_hand if isinstance(initial_hand, CardCountHand) else CardCountHand(cards=initial_hand)
         self.__score = initial_score #TODO: score needs to be received from the Game - which may require some validation given it'll need ot xfer
         self.__behavior = behvior
+        # Betting games (ie. Texas Hold'em) - chips put in this game & whether they've folded. Reset, snapshot & fork carry them with the hand
+        self.__stake = 0
+        self.__folded = False
 
     # Player behavior can be parametrized by location of the model, specific rules-based criteria per game, etc...
 
@@ -63,27 +83,66 @@ class Player:
 
 
     @property
-    def hand(self) -> DefaultDict[Card | JokerCard, int]:
+    def hand(self) -> CardCountHand:
         return self.__hand
 
     @property
     def score(self) -> int:
         return self.__score
 
+    @property
+    def stake(self) -> int:
+        return self.__stake
+
+    @property
+    def folded(self) -> bool:
+        return self.__folded
+
     @property  # TODO: further access control? - only game devs and simulation runners need control
     def behavior(self) -> PlayerBehavior:
         return self.__behavior
 
     def _accept_card(self, card: Card | JokerCard):
         """list of cards come ordered in a way it should be accepting them"""
-        self.__hand[card] += 1
+        self.__hand.add(card)
 
     def _remove_card(self, card: Card | JokerCard):
-        self.__hand[card] -= 1
+        self.__hand.remove(card)
 
     def _update_score(self, new_points: int):
         self.__score += new_points
 
+    def _add_stake(self, chips: int) -> int:
+        self.__stake += chips
+        return self.__stake
+
+    def _fold(self):
+        self.__folded = True
+
+    def _snapshot(self) -> PlayerSnapshot:
+        return PlayerSnapshot(hand=self.__hand.to_bytes(), score=self.__score, stake=self.__stake, folded=self.__folded)
+
+    def _restore(self, snapshot: PlayerSnapshot):
+        self.__hand.restore(snapshot.hand)
+        self.__score = snapshot.score
+        self.__stake = snapshot.stake
+        self.__folded = snapshot.folded
+
+    def _reset(self, score: int = 0):
+        """Empty hand, a fresh score & nothing staked for the next game - the hand keeps its count array"""
+        self.__hand.clear()
+        self.__score = score
+        self.__stake = 0
+        self.__folded = False
+
+    def _fork(self) -> "Player":
+        """Same name & behavior with its own copy of the hand, score & stake"""
+        forked = Player(name=self.__name, initial_hand=CardCountHand(deck_type=self.__hand.deck_type), initial_score=self.__score, behvior=self.__behavior)
+        forked.__hand.restore(self.__hand.to_bytes())
+        forked.__stake = self.__stake
+        forked.__folded = self.__folded
+        return forked
+
     @behavior.setter
     def _update_behavior(self, new_behavior: Dict[str, str | int | float]):
         # exact logic for triggering this should be controlled by game devs
@@ -92,20 +151,21 @@ class Player:
     def take_action(
         self,
         current_game_state: GameState, # need to look at - board, their own hand, card counts, etc..
-        historical_states: List[GameState],
+        historical_states: Sequence[GameState], # read-only view of past states, oldest first - see history.py
         cheating_states: Optional[List[CheatingState]], # If allowed to cheat then it can look at
         instruction_implementer: InstructionSetImplementer #TODO: rather a wrapper function that uses it
-    ) -> List[Tuple[Instruction, Any]]:
+    ) -> List[Tuple[Instruction | int, Any]]:
         """
         Takes in crucial information about the game itself to make a judgment & past information to make msot judgments.
         It can take in information that woould be normally considered cheating if it knew (cheat_code) - ie. knowing placement of specific cards
 
         Returns a list of tuples that is (instruction, auxiliary parameters to be inputted to function of each  )
+        The instruction can also be its opcode - see Game.compiled_instructions
         """
 
         # this will involve some sort of a model making a decision and that decision space will be the space of instruction set
-        # 1) TODO: need a function to convert data into a model runnable format - whatever it might look like...
+        # 1) Convert data into a model runnable format - observation.ObservationEncoder does this for NumPy based models
         # 2) Run model
-        return self.__behavior.soul.run_model(current_game_state, self.__hand, historical_states, cheating_states)
+        return self.__behavior.run_model(current_game_state, self.__hand, historical_states, cheating_states)
         # TODO: the model should return which action to take and certai nvalue attached to it
         #   -> could be magnitude, which player, which means theere will be 2 variables that are
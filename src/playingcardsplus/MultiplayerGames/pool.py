@@ -0,0 +1,57 @@
+"""
+Pool of finished games to play again rather than build from scratch
+
+Building a Game runs pydantic validation of the game & its deck, builds the roster & dealer and shuffles a new deck.
+A finished game released to the pool keeps all of that - acquiring it again is a Game.reset(seed): piles & hands are cleared in place
+and the deck is reshuffled. Games are kept apart by a configuration key (ie. the factory, or the Rules they're played under),
+so a game only ever comes back out for the same kind of game it was built as
+"""
+
+from playingcardsplus.MultiplayerGames.game import Game
+
+from collections import defaultdict
+from typing_extensions import Callable, Dict, Hashable, List, Optional
+
+
+class GamePool:
+    """
+    Idle games per configuration key. acquire() hands out a reset idle game, or builds one when there's none, release() gives it back.
+    Games are reset with Game.reset(seed) - see it for when that matches a freshly built game
+    """
+
+    def __init__(self, max_idle: int = 64):
+        self.__max_idle = max_idle # per key - releases beyond it are dropped
+        self.__idle: Dict[Hashable, List[Game]] = defaultdict(list)
+        self.__built_count = 0
+        self.__reused_count = 0
+
+    @property
+    def built_count(self) -> int:
+        return self.__built_count
+
+    @property
+    def reused_count(self) -> int:
+        return self.__reused_count
+
+    def idle_count(self, key: Optional[Hashable] = None) -> int:
+        if key is None:
+            return sum(len(games) for games in self.__idle.values())
+        return len(self.__idle.get(key, ()))
+
+    def acquire(self, key: Hashable, seed: int, build: Callable[[int], Game]) -> Game:
+        idle = self.__idle.get(key)
+        if idle:
+            game = idle.pop()
+            game.reset(seed)
+            self.__reused_count += 1
+            return game
+        self.__built_count += 1
+        return build(seed)
+
+    def release(self, key: Hashable, game: Game):
+        idle = self.__idle[key]
+        if len(idle) < self.__max_idle:
+            idle.append(game)
+
+    def clear(self):
+        self.__idle.clear()
@@ -17,14 +17,150 @@ to have for any Game.
 
 from playingcardsplus.MultiplayerGames.instructions import InstructionSet
 from playingcardsplus.MultiplayerGames.deck import Distributee
+from playingcardsplus.MultiplayerGames.deal_plan import DealPlan, compile_deal_plan, steady_state_hand_index
 from playingcardsplus.dealer import CardDistributionMethod
 from playingcardsplus.custom_error import RuleIllFormedError, PlayerRangeError, CardDistributionError
 
 # from playingcardsplus.custom_error import TestError
 
 from collections import defaultdict
-from typing_extensions import Dict, Tuple, List, DefaultDict
-from pydantic import BaseModel, PositiveInt, NonNegativeInt, ConfigDict, Field, field_validator, model_validator, computed_field, ValidationError
+from enum import Enum
+from typing_extensions import Dict, Tuple, List, DefaultDict, NamedTuple, Optional, Mapping, Iterable, Any
+from pydantic import BaseModel, PositiveInt, NonNegativeInt, ConfigDict, Field, PrivateAttr, field_validator, model_validator, computed_field, ValidationError
+
+
+class RuleViolationKind(str, Enum):
+    MISSING_FIELD = "missing_field"
+    PLAYER_RANGE = "player_range" # min players > max players
+    EARLY_HANDS_LENGTH = "early_hands_length" # early hand lists don't line up
+    DISTRIBUTEE = "distributee" # something that isn't a Distributee in distribution_methods/distribution_ordering
+    DISTRIBUTION_METHOD = "distribution_method"
+    EARLY_HAND_CARDS = "early_hand_cards" # an early hand deals more cards than the deck has
+    HAND_I_CARDS = "hand_i_cards" # hand i deals more cards than what's left after the early hands
+    HAND_I_TRASH_PILE = "hand_i_trash_pile" # trash pile goes last in hand i but there's nothing left for it
+    MALFORMED = "malformed" # cards per player that's neither an int nor a dict - the rest of pydantic's type checks are left to Rules(**params)
+
+
+class RuleViolation(NamedTuple):
+    """One reason a set of Rules parameters wouldn't make a valid Rules - plain data, no message gets built"""
+    kind: RuleViolationKind
+    hand: Optional[int] = None # early hand index, None for hand i or when it's not about a hand
+    player_count: Optional[int] = None
+    shortfall: int = 0 # how many cards the deck is short
+    field: Optional[str] = None
+
+
+# *** Card counting shared by the Rules validators & Rules.validate_many - plain values in, so no Rules needs to exist
+def _early_hand_totals(cards_per_player_early_hands, board_early_hands, trash_pile_early_hands, max_players: int) -> List[int | Dict[int, int]]:
+    """Cards dealt in each early hand - an int when cards per player is an int (at max players), a dict per player count otherwise"""
+    res = []
+    for hand_index, cards_per_player in enumerate(cards_per_player_early_hands):
+        others = board_early_hands[hand_index] + trash_pile_early_hands[hand_index]
+        if isinstance(cards_per_player, int):
+            res.append(cards_per_player*max_players + others)
+        elif isinstance(cards_per_player, dict):
+            res.append({player_count: card_count*player_count + others for player_count, card_count in cards_per_player.items()})
+        else:
+            raise RuleIllFormedError("cards_per_player_early_hands[{}] has to be an int or a dict of player count to cards, not {!r}".format(hand_index, cards_per_player))
+    return res
+
+
+def _previously_used(early_hand_totals: List[int | Dict[int, int]], player_range) -> DefaultDict[int, int]:
+    """Cards used up by every early hand together, per player count"""
+    used_previously = defaultdict(int)
+    #let's jsut aggreggate everythign as a dict...
+    for used in early_hand_totals:
+        if isinstance(used, int):
+            for player_count in range(player_range[0], player_range[1] + 1):
+                used_previously[player_count] += used
+        elif isinstance(used, dict):
+            for player_count, used_card_count in used.items():
+                used_previously[player_count] += used_card_count
+    return used_previously
+
+
+def _hand_i_totals(
+    deck_size: int, cards_per_player_hand_i, board_hand_i: int, trash_pile_hand_i: int, trash_pile_last: bool, used_previously: DefaultDict[int, int]
+) -> Tuple[Dict[int, int], Optional[Tuple[int, int]]]:
+    """
+    (cards dealt in hand i per player count, (player count, cards left) of the first count where the trash pile goes last
+    and the deck is already overdrawn - None if there isn't one)
+    """
+    if isinstance(cards_per_player_hand_i, int):
+        per_player = {player_count: cards_per_player_hand_i for player_count in used_previously}
+    else:
+        per_player = cards_per_player_hand_i
+
+    res = dict()
+    for player_count, card_count in per_player.items():
+        used_at_early_hands = used_previously[player_count]
+        used_at_hand_i = card_count*player_count + board_hand_i
+        trash_pile_distribution = trash_pile_hand_i if not trash_pile_last else deck_size - used_at_early_hands - used_at_hand_i
+        if trash_pile_distribution < 0:
+            return res, (player_count, trash_pile_distribution)
+        res[player_count] = used_at_hand_i + min(trash_pile_distribution, trash_pile_hand_i)
+    return res, None
+
+
+__DISTRIBUTEES = frozenset(Distributee) | frozenset(distributee.value for distributee in Distributee)
+__DISTRIBUTION_METHODS = frozenset(CardDistributionMethod) | frozenset(method.value for method in CardDistributionMethod)
+__REQUIRED_FIELDS = (
+    "deck_size", "player_range", "cards_per_player_early_hands", "cards_per_player_hand_i", "board_distribution_early_hands",
+    "board_distribution_hand_i", "trash_pile_distribution_early_hands", "distribution_methods", "distribution_ordering",
+)
+
+
+def _check_rules(params: Mapping[str, Any]) -> Tuple[RuleViolation, ...]:
+    """Everything Rules(**params) checks past pydantic's type checks, as RuleViolations instead of exceptions"""
+    missing = [RuleViolation(RuleViolationKind.MISSING_FIELD, field=field) for field in __REQUIRED_FIELDS if field not in params]
+    if missing:
+        return tuple(missing)
+    violations = []
+    deck_size, player_range = params["deck_size"], params["player_range"]
+    if player_range[0] > player_range[1]:
+        violations.append(RuleViolation(RuleViolationKind.PLAYER_RANGE, field="player_range"))
+    methods = params["distribution_methods"]
+    if any(distributee not in __DISTRIBUTEES for distributee in methods) or any(distributee not in __DISTRIBUTEES for distributee in params["distribution_ordering"]):
+        violations.append(RuleViolation(RuleViolationKind.DISTRIBUTEE))
+    if any(method not in __DISTRIBUTION_METHODS for method in methods.values()):
+        violations.append(RuleViolation(RuleViolationKind.DISTRIBUTION_METHOD, field="distribution_methods"))
+
+    cards_per_player_early_hands = params["cards_per_player_early_hands"]
+    board_early_hands, trash_pile_early_hands = params["board_distribution_early_hands"], params["trash_pile_distribution_early_hands"]
+    if not len(cards_per_player_early_hands) == len(board_early_hands) == len(trash_pile_early_hands):
+        violations.append(RuleViolation(RuleViolationKind.EARLY_HANDS_LENGTH))
+        return tuple(violations) # nothing lines up to count cards with
+    malformed = [
+        RuleViolation(RuleViolationKind.MALFORMED, hand=hand_index, field="cards_per_player_early_hands")
+        for hand_index, cards_per_player in enumerate(cards_per_player_early_hands) if not isinstance(cards_per_player, (int, dict))
+    ]
+    if not isinstance(params["cards_per_player_hand_i"], (int, dict)):
+        malformed.append(RuleViolation(RuleViolationKind.MALFORMED, field="cards_per_player_hand_i"))
+    if malformed:
+        return tuple(violations + malformed) # no card counts to work out
+
+    # Early hands - each one against the full deck
+    early_hand_totals = _early_hand_totals(cards_per_player_early_hands, board_early_hands, trash_pile_early_hands, player_range[1])
+    for hand_index, total in enumerate(early_hand_totals):
+        for player_count, cards in (total.items() if isinstance(total, dict) else ((player_range[1], total),)):
+            if cards > deck_size:
+                violations.append(RuleViolation(RuleViolationKind.EARLY_HAND_CARDS, hand=hand_index, player_count=player_count, shortfall=cards - deck_size))
+
+    # Hand i - against what the early hands left. Like validate_hand_i, every count's deal has to fit after the most used up count
+    used_previously = _previously_used(early_hand_totals, player_range)
+    distribution_ordering = params["distribution_ordering"]
+    hand_i_totals, overdrawn = _hand_i_totals(
+        deck_size, params["cards_per_player_hand_i"], params["board_distribution_hand_i"], params.get("trash_pile_distribution_hand_i", 0),
+        bool(distribution_ordering) and distribution_ordering[-1] == Distributee.TRASH_PILE, used_previously,
+    )
+    if overdrawn is not None:
+        violations.append(RuleViolation(RuleViolationKind.HAND_I_TRASH_PILE, player_count=overdrawn[0], shortfall=-overdrawn[1]))
+    elif used_previously:
+        left = deck_size - max(used_previously.values())
+        for player_count, cards in hand_i_totals.items():
+            if cards > left:
+                violations.append(RuleViolation(RuleViolationKind.HAND_I_CARDS, player_count=player_count, shortfall=cards - left))
+    return tuple(violations)
 
 
 # TODO prob the most important thing to add is make sure the instruction set covers soem condition on how many cards to be distributed frokm non-unused as this is entirely game dependent
@@ -70,39 +206,44 @@ class Rules(BaseModel): # Requires a pretty sphisticated validation
     instructions: InstructionSet
     instruction_constraints: Dict | None #TODO: not exactly sure what this'd look like yet TBH
 
+    __deal_plans: Dict[Tuple[int, int], DealPlan] = PrivateAttr(default_factory=dict)
+
+    def deal_plan(self, player_count: PositiveInt, hand_index: NonNegativeInt) -> DealPlan:
+        """Compiled once per (player_count, hand) & reused - every hand past the early hands shares the same plan"""
+        key = (player_count, steady_state_hand_index(self, hand_index))
+        plan = self.__deal_plans.get(key)
+        if plan is None:
+            plan = self.__deal_plans[key] = compile_deal_plan(self, player_count, hand_index)
+        return plan
+
+    # Frozen, so these never change once validated - computed on first use (the validators) & handed back from then on.
+    # The public properties hand out copies so nobody can edit the cache, the validators read it directly
+    __early_hand_totals: Optional[List[int | Dict[int, int]]] = PrivateAttr(default=None)
+    __hand_i_totals: Optional[Dict[int, int]] = PrivateAttr(default=None)
+
+    def __cached_early_hand_totals(self) -> List[int | Dict[int, int]]:
+        if self.__early_hand_totals is None:
+            self.__early_hand_totals = _early_hand_totals(
+                self.cards_per_player_early_hands, self.board_distribution_early_hands, self.trash_pile_distribution_early_hands, self.player_range[1]
+            )
+        return self.__early_hand_totals
+
+    def __cached_hand_i_totals(self) -> Dict[int, int]:
+        if self.__hand_i_totals is None:
+            used_previously = _previously_used(self.__cached_early_hand_totals(), self.player_range)
+            res, overdrawn = _hand_i_totals(
+                self.deck_size, self.cards_per_player_hand_i, self.board_distribution_hand_i, self.trash_pile_distribution_hand_i,
+                self.distribution_ordering[-1] == Distributee.TRASH_PILE, used_previously,
+            )
+            if overdrawn is not None:
+                raise ValueError("Calculating deck_size - used_at_early_hands - used_at_hand_i_without_trash_pile {}".format(overdrawn[1]))
+            self.__hand_i_totals = res
+        return self.__hand_i_totals
+
     @computed_field
     @property
     def total_cards_distributed_early_hands(self) -> List[Dict[PositiveInt, NonNegativeInt]]:
-        res = []
-        for hand_index, cards_per_player in enumerate(self.cards_per_player_early_hands):
-
-            if isinstance(cards_per_player, int):
-                res.append(
-                    cards_per_player*self.player_range[1] + self.board_distribution_early_hands[hand_index] + self.trash_pile_distribution_early_hands[hand_index]
-                )
-
-            elif isinstance(cards_per_player, dict):
-                counter = dict()
-                for player_count, card_count in cards_per_player.items():
-                    counter[player_count] = card_count*player_count + self.board_distribution_early_hands[hand_index] + self.trash_pile_distribution_early_hands[hand_index]
-                res.append(counter)
-            else:
-                raise ValidationError #TODO this is just for my IDE to not think there's sth wrong. let's see if this cuases UX issue...
-        return res
-
-
-    @classmethod
-    def __calculate_previously_used_card_count(cls, stump: List[Dict[PositiveInt, NonNegativeInt]], player_range) ->  DefaultDict[PositiveInt, NonNegativeInt]:
-        used_previously = defaultdict(int)
-        #let's jsut aggreggate everythign as a dict...
-        for hand_index, used in enumerate(stump):
-            if isinstance(used, int):
-                for player_count in range(player_range[0], player_range[1] + 1):
-                    used_previously[player_count] += used
-            elif isinstance(used, dict):
-                for player_count, used_card_count in used.items():
-                    used_previously[player_count] += used_card_count
-        return used_previously
+        return [dict(total) if isinstance(total, dict) else total for total in self.__cached_early_hand_totals()]
 
     @computed_field
     @property
@@ -111,37 +252,25 @@ class Rules(BaseModel): # Requires a pretty sphisticated validation
         """
         Calculate total cards being handed out by . For trash_pile usage
         """
-        res = DefaultDict[PositiveInt, NonNegativeInt]()
-
-        used_previously_stump = self.total_cards_distributed_early_hands
-        used_previously = Rules.__calculate_previously_used_card_count(stump=used_previously_stump, player_range=self.player_range)
-
-        if isinstance(self.cards_per_player_hand_i, int):
-            for player_count, used_at_early_hands in used_previously.items():
-                used_at_hand_i = self.cards_per_player_hand_i*player_count + self.board_distribution_hand_i
-                trash_pile_distribution = self.trash_pile_distribution_hand_i if self.distribution_ordering[-1] != Distributee.TRASH_PILE \
-                    else self.deck_size - used_at_early_hands - used_at_hand_i
-                if trash_pile_distribution < 0:
-                    raise ValueError("Calculating deck_size - used_at_early_hands - used_at_hand_i_without_trash_pile {}".format(self.deck_size - used_at_early_hands - used_at_hand_i))
-
-                trash_pile_distribution = min(trash_pile_distribution, self.trash_pile_distribution_hand_i)
-                res[player_count] = used_at_hand_i + trash_pile_distribution
-
-        elif isinstance(self.cards_per_player_hand_i, dict):
-            for player_count, card_count in self.cards_per_player_hand_i.items():
-                used_at_early_hands = used_previously[player_count]
-                used_at_hand_i = card_count*player_count + self.board_distribution_hand_i
-                trash_pile_distribution = self.trash_pile_distribution_hand_i if self.distribution_ordering[-1] != Distributee.TRASH_PILE \
-                    else self.deck_size - used_at_early_hands - used_at_hand_i
-                if trash_pile_distribution < 0:
-                    raise ValueError("Calculating deck_size - used_at_early_hands - used_at_hand_i_without_trash_pile {}".format(self.deck_size - used_at_early_hands - used_at_hand_i))
-
-                trash_pile_distribution = min(trash_pile_distribution, self.trash_pile_distribution_hand_i)
-                res[player_count] = used_at_hand_i + trash_pile_distribution
-        else:
-            raise ValidationError #TODO this is just for my IDE to not think there's sth wrong. let's see if this cuases UX issue...
+        return dict(self.__cached_hand_i_totals())
 
-        return res
+    def model_copy(self, *, update: Optional[Mapping[str, Any]] = None, deep: bool = False):
+        copied = super().model_copy(update=update, deep=deep)
+        if update:
+            # Card counts & deal plans were worked out from the old values
+            copied.__early_hand_totals = None
+            copied.__hand_i_totals = None
+            copied.__deal_plans = dict()
+        return copied
+
+    @classmethod
+    def validate_many(cls, variants: Iterable[Mapping[str, Any]]) -> List[Tuple[RuleViolation, ...]]:
+        """
+        Checks lots of Rules(**params) candidates without building any of them - one tuple of RuleViolations per variant, empty when
+        it'd make valid Rules. Nothing gets raised & no error messages get formatted. Values are taken as they are, so pydantic's type
+        checks (ie. a deck_size of "hello") aren't part of it - build the survivors with Rules(**params) as usual
+        """
+        return [_check_rules(params) for params in variants]
 
     # This'd be super annoying for devs...
     # @model_validator(mode="after")
@@ -226,7 +355,7 @@ class Rules(BaseModel): # Requires a pretty sphisticated validation
     def validate_early_hands(self): #TODO: This does not consider whether it receives from trash_pile or not
         """Simply compare whether the number of cards used in hand 0 is below the deck size so we may play
         """
-        cards_to_distribute_per_hand = self.total_cards_distributed_early_hands
+        cards_to_distribute_per_hand = self.__cached_early_hand_totals()
 
         for hand_index, cards_to_distribute in enumerate(cards_to_distribute_per_hand):
             # Then run validations - per hand
@@ -249,10 +378,9 @@ class Rules(BaseModel): # Requires a pretty sphisticated validation
     @model_validator(mode="after")
     def validate_hand_i(self):
 
-        cards_to_distribute = self.total_cards_distributed_hand_i # This should contain how
+        cards_to_distribute = self.__cached_hand_i_totals() # This should contain how
         # Calculate cards that shouldn't be used first
-        used_previously_per_early_hand = self.total_cards_distributed_early_hands
-        used_previously = Rules.__calculate_previously_used_card_count(stump=used_previously_per_early_hand, player_range=self.player_range)
+        used_previously = _previously_used(self.__cached_early_hand_totals(), self.player_range)
 
         error_msg_header = "Hand i rule violations as follows: \n"
         rule_violations = DefaultDict[PositiveInt, str]()
@@ -0,0 +1,257 @@
+"""
+Shared-memory arena of game states - workers write their games' final card-ID state straight into rows the parent reads, nothing gets pickled
+
+The arena is one multiprocessing.shared_memory block viewed as a NumPy structured array, one fixed-layout row per game:
+-> status, hand_index, hand_count: how far the game got (see ArenaStatus)
+-> unused / board / trash_pile / player_hands: each pile's card IDs in pile order (unused bottom first), with the pile's length
+-> board_mask / player_hands_mask: the same two piles as packed bitmasks (bit i = card ID i) for quick membership checks
+-> hands (player_count, card_count): how many of each card every player holds, roster order
+-> scores (player_count,): scoreboard in roster order
+-> player_scores (player_count,): each Player's own score, which games keep apart from the scoreboard
+-> player_stakes / player_folded (player_count,): chips each Player has put in & whether they've folded - betting games only
+
+A row holds exactly what Game.snapshot() holds, so any row can be turned back into a live Game with read_snapshot() & Game.restore().
+run_into_arena() plays game i into row i across a process pool - the only things workers get sent are the factory, the implementer
+and the arena's name, and the only thing sent back is how many hands they played. Workers still play ordinary Games,
+a row is written once when its game stops rather than being played on in place. The parent reads results as array columns
+straight off the shared memory inside `with arena.view() as rows:`, ie. rows["scores"], or keeps them with arena.copy_rows()
+
+Requires NumPy - install the `numpy` extra
+"""
+
+from playingcardsplus.MultiplayerGames.deck import DeckSnapshot
+from playingcardsplus.MultiplayerGames.game import Game, GameSnapshot
+from playingcardsplus.MultiplayerGames.instructions import InstructionSetImplementer
+from playingcardsplus.MultiplayerGames.player import PlayerSnapshot
+from playingcardsplus.MultiplayerGames.simulator import GameFactory, SimulationReport, play_game
+from playingcardsplus.encoding import CardEncoding
+from playingcardsplus.rng import derive_seed
+
+import os
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from typing_extensions import NamedTuple, List, Optional, Sequence, Self, Iterator
+
+
+class ArenaStatus(IntEnum):
+    EMPTY = 0
+    RUNNING = 1
+    FINISHED = 2 # game.is_over()
+    HAND_LIMIT = 3 # stopped at max_hands
+
+
+PILES = ("unused", "board", "trash_pile", "player_hands")
+
+
+class ArenaLayout(NamedTuple):
+    card_count: int # deck encoding size, jokers included
+    player_count: int
+
+    @classmethod
+    def for_game(cls, game: Game) -> Self:
+        return cls(card_count=game.deck.encoding.size, player_count=len(game.roster))
+
+    @property
+    def dtype(self) -> np.dtype:
+        card_id = np.uint8 if self.card_count <= 256 else np.uint16 # same width as CardEncoding.pack
+        mask_bytes = (self.card_count + 7) // 8
+        fields = [("status", np.uint8), ("hand_index", np.int32), ("hand_count", np.int32)]
+        for pile in PILES:
+            fields += [(pile + "_length", np.uint16), (pile, card_id, (self.card_count,))]
+        fields += [
+            ("board_mask", np.uint8, (mask_bytes,)),
+            ("player_hands_mask", np.uint8, (mask_bytes,)),
+            ("hands", "<u2", (self.player_count, self.card_count)), # same as CardCountHand.to_bytes
+            ("scores", np.int64, (self.player_count,)),
+            ("player_scores", np.int64, (self.player_count,)),
+            ("player_stakes", np.int64, (self.player_count,)),
+            ("player_folded", np.bool_, (self.player_count,)),
+        ]
+        return np.dtype(fields, align=True)
+
+
+class SharedGameArena:
+    """
+    `row_count` rows of `layout` in one shared memory block. create() it in the parent, attach() to it by name in workers.
+    Rows are only handed out inside `with arena.view() as rows:` - arrays from it must not be used after the with block, as NumPy
+    doesn't stop the memory being unmapped under them. Whoever created it unlinks it on close()
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory, layout: ArenaLayout, row_count: int, owner: bool):
+        self.__memory = memory
+        self.__layout = layout
+        self.__row_count = row_count
+        self.__owner = owner
+        self.__closed = False
+        self.__unlinked = False
+        self.__open_views = 0
+
+    @classmethod
+    def create(cls, layout: ArenaLayout, row_count: int) -> Self:
+        memory = shared_memory.SharedMemory(create=True, size=max(1, layout.dtype.itemsize * row_count))
+        arena = cls(memory, layout, row_count, owner=True)
+        with arena.view() as rows:
+            rows[:] = np.zeros((), dtype=layout.dtype)
+        return arena
+
+    @classmethod
+    def attach(cls, name: str, layout: ArenaLayout, row_count: int) -> Self:
+        return cls(shared_memory.SharedMemory(name=name), layout, row_count, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.__memory.name
+
+    @property
+    def layout(self) -> ArenaLayout:
+        return self.__layout
+
+    @property
+    def row_count(self) -> int:
+        return self.__row_count
+
+    @contextmanager
+    def view(self) -> Iterator[np.ndarray]:
+        """(row_count,) structured array straight on the shared memory - ie. rows["scores"] is a (row_count, player_count) view"""
+        if self.__closed:
+            raise ValueError("SharedGameArena is closed")
+        self.__open_views += 1
+        try:
+            yield np.ndarray((self.__row_count,), dtype=self.__layout.dtype, buffer=self.__memory.buf)
+        finally:
+            self.__open_views -= 1
+
+    def copy_rows(self) -> np.ndarray:
+        """Every row copied out of the shared memory - keeps after the arena is closed"""
+        with self.view() as rows:
+            return rows.copy()
+
+    def close(self):
+        """
+        Unmaps the block - raises BufferError, leaving it mapped, while a view() is open since unmapping under it crashes the interpreter.
+        The owner unlinks the block's name either way, so it's freed once the last mapping goes
+        """
+        try:
+            if not self.__closed:
+                if self.__open_views:
+                    raise BufferError("SharedGameArena has {} view() still open - leave them before closing the arena".format(self.__open_views))
+                self.__closed = True
+                self.__memory.close()
+        finally:
+            if self.__owner and not self.__unlinked:
+                self.__unlinked = True
+                self.__memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        try:
+            self.close()
+        except BufferError:
+            if exc_type is None: # don't hide whatever the with block raised
+                raise
+
+    def __reduce__(self):
+        raise TypeError("SharedGameArena can't be pickled - send its name, layout & row_count and attach() on the other side")
+
+
+def __pile_ids(encoding: CardEncoding, packed: bytes) -> np.ndarray:
+    return np.frombuffer(packed, dtype=np.uint8 if encoding.size <= 256 else np.uint16)
+
+
+def write_row(row: np.ndarray, game: Game, status: ArenaStatus = ArenaStatus.RUNNING, hand_count: int = 0):
+    """Copies the game's current state into one row of an arena (a 0-d view, ie. rows[i] of arena.view())"""
+    snapshot = game.snapshot()
+    encoding = game.deck.encoding
+    for pile, packed in zip(PILES, snapshot.deck):
+        card_ids = __pile_ids(encoding, packed)
+        row[pile + "_length"] = len(card_ids)
+        row[pile][:len(card_ids)] = card_ids
+        row[pile][len(card_ids):] = 0
+        if pile in ("board", "player_hands"):
+            bits = np.zeros(encoding.size, dtype=np.uint8)
+            bits[card_ids] = 1
+            row[pile + "_mask"] = np.packbits(bits, bitorder="little")
+    for player_index, player in enumerate(snapshot.players):
+        counts = np.frombuffer(player.hand, dtype="<u2")
+        row["hands"][player_index, :len(counts)] = counts
+        row["hands"][player_index, len(counts):] = 0
+        row["player_scores"][player_index] = player.score
+        row["player_stakes"][player_index] = player.stake
+        row["player_folded"][player_index] = player.folded
+    row["scores"] = snapshot.scoreboard
+    row["hand_index"] = snapshot.hand_index
+    row["hand_count"] = hand_count
+    row["status"] = status
+
+
+def read_snapshot(row: np.ndarray, encoding: CardEncoding) -> GameSnapshot:
+    """GameSnapshot of a row (a view or a copy) - Game.restore() it into a game of the same deck type & roster size"""
+    card_id = np.uint8 if encoding.size <= 256 else np.uint16
+    deck = DeckSnapshot(*(row[pile][:int(row[pile + "_length"])].astype(card_id).tobytes() for pile in PILES))
+    players = tuple(
+        PlayerSnapshot(
+            hand=row["hands"][player_index].tobytes(),
+            score=int(row["player_scores"][player_index]),
+            stake=int(row["player_stakes"][player_index]),
+            folded=bool(row["player_folded"][player_index]),
+        )
+        for player_index in range(row["hands"].shape[0])
+    )
+    return GameSnapshot(hand_index=int(row["hand_index"]), deck=deck, players=players, scoreboard=tuple(int(score) for score in row["scores"]))
+
+
+def _play_into_arena(
+    arena_name: str,
+    layout: ArenaLayout,
+    row_count: int,
+    game_factory: GameFactory,
+    instruction_implementer: InstructionSetImplementer,
+    max_hands: int,
+    root_seed: int,
+    row_indices: Sequence[int],
+) -> int:
+    """Worker side - plays game i into row i & returns how many hands it played"""
+    hand_count = 0
+    with SharedGameArena.attach(arena_name, layout, row_count) as arena:
+        for row_index in row_indices:
+            game = game_factory(derive_seed(root_seed, row_index))
+            records = play_game(game, instruction_implementer, max_hands)
+            status = ArenaStatus.FINISHED if game.is_over() else ArenaStatus.HAND_LIMIT
+            with arena.view() as rows:
+                write_row(rows[row_index], game, status=status, hand_count=len(records))
+            hand_count += len(records)
+    return hand_count
+
+
+def run_into_arena(
+    arena: SharedGameArena,
+    game_factory: GameFactory,
+    instruction_implementer: InstructionSetImplementer,
+    worker_count: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    root_seed: int = 0,
+    max_hands: int = 1000,
+) -> SimulationReport:
+    """
+    Plays one game per arena row - game i is built from derive_seed(root_seed, i) like Simulator, so results line up with it.
+    worker_count=0 plays everything in this process
+    """
+    started = time.perf_counter()
+    worker_count = (os.cpu_count() or 1) if worker_count is None else worker_count
+    chunk_size = chunk_size or max(1, arena.row_count // (max(worker_count, 1) * 4))
+    chunks: List[range] = [range(start, min(start + chunk_size, arena.row_count)) for start in range(0, arena.row_count, chunk_size)]
+    args = (arena.name, arena.layout, arena.row_count, game_factory, instruction_implementer, max_hands, root_seed)
+
+    if worker_count == 0:
+        hand_count = sum(_play_into_arena(*args, chunk) for chunk in chunks)
+    else:
+        with ProcessPoolExecutor(max_workers=worker_count) as executor:
+            futures = [executor.submit(_play_into_arena, *args, chunk) for chunk in chunks]
+            hand_count = sum(future.result() for future in as_completed(futures))
+    return SimulationReport(game_count=arena.row_count, hand_count=hand_count, elapsed_seconds=time.perf_counter() - started)
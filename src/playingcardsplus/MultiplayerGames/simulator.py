@@ -0,0 +1,161 @@
+"""
+Runs many Games over a process pool
+
+Only the game factory, the instruction set implementer and integer seeds are sent to workers - never a whole pydantic Game.
+Each worker builds its games locally from `game_factory(seed)`, plays them with start_game()/next_hand() until game.is_over()
+or `max_hands`, and streams back every game's CollectibleData as soon as its chunk finishes.
+With reuse_games, a worker builds one game per chunk and resets it for every game after that (see pool.py).
+
+The factory & implementer need to be picklable - ie. module-level functions/classes or functools.partial of them
+"""
+
+from playingcardsplus.MultiplayerGames.game import Game
+from playingcardsplus.MultiplayerGames.instructions import Instruction, InstructionSetImplementer
+from playingcardsplus.MultiplayerGames.player import PolicyRequest
+from playingcardsplus.MultiplayerGames.data import CollectibleData
+from playingcardsplus.MultiplayerGames.pool import GamePool
+from playingcardsplus.rng import derive_seed
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing_extensions import Callable, NamedTuple, List, Iterator, Optional, Sequence, Generator, Tuple, Any
+
+
+GameFactory = Callable[[int], Game] # seed -> a fresh Game
+
+
+class GameResult(NamedTuple):
+    game_index: int
+    seed: int
+    records: List[CollectibleData] # one per hand, starting at hand 0
+
+
+class SimulationReport(NamedTuple):
+    game_count: int
+    hand_count: int
+    elapsed_seconds: float
+
+    @property
+    def games_per_second(self) -> float:
+        return self.game_count / self.elapsed_seconds if self.elapsed_seconds > 0 else float("inf")
+
+    @property
+    def hands_per_second(self) -> float:
+        return self.hand_count / self.elapsed_seconds if self.elapsed_seconds > 0 else float("inf")
+
+
+def play_game(game: Game, instruction_implementer: InstructionSetImplementer, max_hands: int) -> List[CollectibleData]:
+    """Plays one game to the end - or until max_hands hands have been played"""
+    records = [game.start_game(instruction_implementer)]
+    while len(records) < max_hands and not game.is_over():
+        records.append(game.next_hand(instruction_implementer))
+    return records
+
+
+def play_game_steps(game: Game, instruction_implementer: InstructionSetImplementer, max_hands: int) -> Generator[PolicyRequest, List[Tuple[Instruction, Any]], List[CollectibleData]]:
+    """play_game where players' actions are sent in by whoever steps it - see Game.take_player_actions_steps"""
+    records = [(yield from game.start_game_steps(instruction_implementer))]
+    while len(records) < max_hands and not game.is_over():
+        records.append((yield from game.next_hand_steps(instruction_implementer)))
+    return records
+
+
+def __build_reusable(game_factory: GameFactory, seed: int) -> Game:
+    """game_factory(seed), checked to come out the same after a Game.reset(seed) - otherwise reusing it would play different games"""
+    game = game_factory(seed)
+    built = game.snapshot()
+    game.reset(seed)
+    if game.snapshot() != built:
+        raise ValueError(
+            "reuse_games needs a factory whose decks are shuffled with the game's hand_rng(0) (ie. rng=make_rng(derive_seed(seed, 0))) - "
+            "a reset game doesn't match game_factory({})".format(seed)
+        )
+    return game
+
+
+def _run_chunk(
+    game_factory: GameFactory,
+    instruction_implementer: InstructionSetImplementer,
+    max_hands: int,
+    root_seed: int,
+    game_indices: Sequence[int],
+    reuse_games: bool = False,
+) -> List[GameResult]:
+    results = []
+    pool = GamePool(max_idle=1) if reuse_games else None
+    for game_index in game_indices:
+        seed = derive_seed(root_seed, game_index)
+        game = game_factory(seed) if pool is None else pool.acquire(game_factory, seed, lambda seed: __build_reusable(game_factory, seed))
+        results.append(GameResult(game_index=game_index, seed=seed, records=play_game(game, instruction_implementer, max_hands)))
+        if pool is not None:
+            pool.release(game_factory, game)
+    return results
+
+
+class Simulator:
+    """
+    Entry point for running `game_count` games across `worker_count` processes.
+
+    Game i is always built from derive_seed(root_seed, i), so results don't depend on the worker count or chunking
+    and any single game can be replayed with `game_factory(result.seed)`.
+    worker_count=0 runs everything in this process, which is handy for debugging.
+    reuse_games builds one game per chunk and Game.reset()s it for every game after that - the factory's decks need to be shuffled
+    with the game's hand_rng(0) for that to play the same games (see Game.reset). The first game of every chunk is checked against
+    a reset of itself & a ValueError is raised when they don't match
+    """
+
+    def __init__(
+        self,
+        game_factory: GameFactory,
+        instruction_implementer: InstructionSetImplementer,
+        game_count: int,
+        worker_count: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        root_seed: int = 0,
+        max_hands: int = 1000,
+        reuse_games: bool = False,
+    ):
+        self.__game_factory = game_factory
+        self.__instruction_implementer = instruction_implementer
+        self.__game_count = game_count
+        self.__worker_count = (os.cpu_count() or 1) if worker_count is None else worker_count
+        # A few chunks per worker keeps them all busy without paying IPC per game
+        self.__chunk_size = chunk_size or max(1, game_count // (max(self.__worker_count, 1) * 4))
+        self.__root_seed = root_seed
+        self.__max_hands = max_hands
+        self.__reuse_games = reuse_games
+        self.__report: Optional[SimulationReport] = None
+
+    @property
+    def report(self) -> Optional[SimulationReport]:
+        """Available once run() has been exhausted"""
+        return self.__report
+
+    def __chunks(self) -> List[range]:
+        return [range(start, min(start + self.__chunk_size, self.__game_count)) for start in range(0, self.__game_count, self.__chunk_size)]
+
+    def run(self) -> Iterator[GameResult]:
+        """Yields each game's result as its chunk completes - ordering across chunks is not guaranteed"""
+        started = time.perf_counter()
+        game_count, hand_count = 0, 0
+
+        if self.__worker_count == 0:
+            for chunk in self.__chunks():
+                for result in _run_chunk(self.__game_factory, self.__instruction_implementer, self.__max_hands, self.__root_seed, chunk, self.__reuse_games):
+                    game_count += 1
+                    hand_count += len(result.records)
+                    yield result
+        else:
+            with ProcessPoolExecutor(max_workers=self.__worker_count) as executor:
+                futures = [
+                    executor.submit(_run_chunk, self.__game_factory, self.__instruction_implementer, self.__max_hands, self.__root_seed, chunk, self.__reuse_games)
+                    for chunk in self.__chunks()
+                ]
+                for future in as_completed(futures):
+                    for result in future.result():
+                        game_count += 1
+                        hand_count += len(result.records)
+                        yield result
+
+        self.__report = SimulationReport(game_count=game_count, hand_count=hand_count, elapsed_seconds=time.perf_counter() - started)
@@ -0,0 +1,283 @@
+"""
+Rule-space sweeps for game design - try every combination of a few Rules parameters & see how the game plays under each
+
+A sweep takes a base set of Rules parameters and `axes` - a list of values for each parameter to vary. Every combination is a variant.
+-> Variants that can't make valid Rules are pruned up front with Rules.validate_many (same card counting as Rules' own validators)
+   and never get played. Their violations are kept in SweepResult.pruned
+-> Each valid variant is played at every player count its player_range allows (or the ones in `player_counts` that it allows),
+   one table row per (variant, player count). A variant none of `player_counts` fits is pruned
+-> Each row plays `games_per_variant` games over a process pool. Game i of every row uses derive_seed(root_seed, i),
+   so variants are compared on the same random deals
+-> Per game, workers only send back a small summary (hands played, score spread, whether unused ran out) rather than every hand's records
+-> Summaries are rolled up per row into one columnar table - one column per swept parameter & per statistic
+
+With a cache_path, every finished row's statistics are appended to that file (JSON lines) keyed by rules_key() - a hash of the Rules,
+the player count & the sweep settings. Rerunning a sweep, or a bigger sweep that overlaps it, only plays the variants that aren't in the cache yet.
+The key doesn't cover the game factory or the players' behavior, so use a different cache file when those change
+"""
+
+from playingcardsplus.MultiplayerGames.game import Game
+from playingcardsplus.MultiplayerGames.instructions import InstructionSetImplementer
+from playingcardsplus.MultiplayerGames.rules import Rules, RuleViolation, RuleViolationKind
+from playingcardsplus.MultiplayerGames.simulator import play_game
+from playingcardsplus.custom_error import CardDistributionError, PlayerRangeError, RuleIllFormedError
+from playingcardsplus.rng import derive_seed
+
+import hashlib
+import itertools
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pydantic import ValidationError
+from typing_extensions import Callable, NamedTuple, Dict, List, Tuple, Any, Mapping, Sequence, Optional, Iterator
+
+
+RulesGameFactory = Callable[[Rules, int, int], Game] # (rules, player count, seed) -> a fresh Game played under those rules
+
+# Rolled up per variant, in table column order
+STATISTICS = (
+    "game_count", "mean_hands", "std_hands", "min_hands", "max_hands",
+    "mean_score_spread", "std_score_spread", "exhaustion_rate", "hand_limit_rate",
+)
+
+
+class GameSummary(NamedTuple):
+    hand_count: int
+    score_spread: int # best minus worst final score
+    exhausted: bool # unused pile ran out
+    hit_hand_limit: bool # stopped by max_hands rather than the game ending
+
+
+class SweepReport(NamedTuple):
+    variant_count: int
+    pruned_count: int
+    cached_count: int # rows whose statistics came from the cache
+    simulated_game_count: int
+    elapsed_seconds: float
+
+
+class SweepResult(NamedTuple):
+    columns: Dict[str, List[Any]] # "rules_key", "player_count", each swept parameter, then STATISTICS - all the same length
+    pruned: List[Tuple[Dict[str, Any], Tuple[RuleViolation, ...]]] # (swept parameter values, why it isn't valid)
+    report: SweepReport
+
+    def __len__(self) -> int:
+        return len(self.columns["rules_key"])
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        names = list(self.columns)
+        for values in zip(*self.columns.values()):
+            yield dict(zip(names, values))
+
+
+def rules_params(rules: Rules) -> Dict[str, Any]:
+    """Rules(**rules_params(rules)) rebuilds the same Rules - handy as a sweep's base"""
+    return {field: getattr(rules, field) for field in Rules.model_fields}
+
+
+def rule_variants(base: Mapping[str, Any], axes: Mapping[str, Sequence[Any]]) -> Iterator[Dict[str, Any]]:
+    """Every combination of the axes' values on top of base, last axis changing fastest"""
+    names = list(axes)
+    for values in itertools.product(*(axes[name] for name in names)):
+        yield {**base, **dict(zip(names, values))}
+
+
+def rules_key(rules: Rules, *settings: Any) -> str:
+    """Stable hash of the Rules (and anything else that changes results) - the same in every process & across runs"""
+    dumped = rules.model_dump(mode="json", exclude={"instructions", "total_cards_distributed_early_hands", "total_cards_distributed_hand_i"})
+    dumped["instructions"] = sorted(instruction.operation for instruction in rules.instructions.instructions) # sets have no stable order
+    digest = hashlib.blake2b(json.dumps([dumped, list(settings)], sort_keys=True, default=str).encode(), digest_size=16)
+    return digest.hexdigest()
+
+
+def summarize_game(game: Game, hand_count: int, max_hands: int) -> GameSummary:
+    scores = list(game.scoreboard.values())
+    return GameSummary(
+        hand_count=hand_count,
+        score_spread=max(scores) - min(scores) if scores else 0,
+        exhausted=game.deck.unused_count == 0,
+        hit_hand_limit=hand_count >= max_hands and not game.is_over(),
+    )
+
+
+def summarize_variant(summaries: Sequence[GameSummary]) -> Dict[str, float]:
+    def mean_std(values: List[float]) -> Tuple[float, float]:
+        mean = sum(values) / len(values)
+        return mean, math.sqrt(sum((value - mean) ** 2 for value in values) / len(values))
+
+    hands = [summary.hand_count for summary in summaries]
+    spreads = [summary.score_spread for summary in summaries]
+    mean_hands, std_hands = mean_std(hands)
+    mean_spread, std_spread = mean_std(spreads)
+    return dict(
+        game_count=len(summaries),
+        mean_hands=mean_hands,
+        std_hands=std_hands,
+        min_hands=min(hands),
+        max_hands=max(hands),
+        mean_score_spread=mean_spread,
+        std_score_spread=std_spread,
+        exhaustion_rate=sum(summary.exhausted for summary in summaries) / len(summaries),
+        hand_limit_rate=sum(summary.hit_hand_limit for summary in summaries) / len(summaries),
+    )
+
+
+def _sweep_chunk(
+    game_factory: RulesGameFactory,
+    rules: Rules,
+    player_count: int,
+    instruction_implementer: InstructionSetImplementer,
+    max_hands: int,
+    root_seed: int,
+    game_indices: Sequence[int],
+) -> List[GameSummary]:
+    summaries = []
+    for game_index in game_indices:
+        game = game_factory(rules, player_count, derive_seed(root_seed, game_index))
+        records = play_game(game, instruction_implementer, max_hands)
+        summaries.append(summarize_game(game, len(records), max_hands))
+    return summaries
+
+
+class Sweep:
+    """
+    Sweeps `axes` over `base` Rules parameters - see the module docstring.
+    game_factory & instruction_implementer need to be picklable unless worker_count=0, which plays everything in this process
+    """
+
+    def __init__(
+        self,
+        game_factory: RulesGameFactory,
+        instruction_implementer: InstructionSetImplementer,
+        base: Mapping[str, Any],
+        axes: Mapping[str, Sequence[Any]],
+        games_per_variant: int = 100,
+        worker_count: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        root_seed: int = 0,
+        max_hands: int = 1000,
+        cache_path: Optional[str] = None,
+        player_counts: Optional[Sequence[int]] = None,
+    ):
+        if games_per_variant < 1:
+            raise ValueError("games_per_variant should be at least 1 but got {}".format(games_per_variant))
+        self.__game_factory = game_factory
+        self.__instruction_implementer = instruction_implementer
+        self.__base = dict(base)
+        self.__axes = {name: list(values) for name, values in axes.items()}
+        self.__games_per_variant = games_per_variant
+        self.__worker_count = (os.cpu_count() or 1) if worker_count is None else worker_count
+        self.__chunk_size = chunk_size or max(1, games_per_variant // max(self.__worker_count, 1))
+        self.__root_seed = root_seed
+        self.__max_hands = max_hands
+        self.__cache_path = cache_path
+        self.__player_counts = None if player_counts is None else sorted(set(player_counts))
+
+    def variants(self) -> Iterator[Dict[str, Any]]:
+        return rule_variants(self.__base, self.__axes)
+
+    def __load_cache(self) -> Dict[str, Dict[str, float]]:
+        cache = dict()
+        if self.__cache_path is None or not os.path.exists(self.__cache_path):
+            return cache
+        with open(self.__cache_path) as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError: # a run that got killed mid write
+                    continue
+                cache[entry["key"]] = entry["statistics"]
+        return cache
+
+    def __store(self, key: str, statistics: Dict[str, float]):
+        if self.__cache_path is not None:
+            with open(self.__cache_path, "a") as file:
+                file.write(json.dumps({"key": key, "statistics": statistics}) + "\n")
+
+    def __build(self, params: Dict[str, Any]) -> Tuple[Optional[Rules], Tuple[RuleViolation, ...]]:
+        violations = Rules.validate_many([params])[0]
+        if violations:
+            return None, violations
+        try:
+            return Rules(**params), ()
+        except (ValidationError, RuleIllFormedError, PlayerRangeError, CardDistributionError) as error:
+            # Only pydantic's type checks get here - validate_many covers the rest
+            return None, (RuleViolation(RuleViolationKind.MALFORMED, field=type(error).__name__),)
+
+    def __player_counts_for(self, rules: Rules) -> List[int]:
+        low, high = rules.player_range
+        if self.__player_counts is None:
+            return list(range(low, high + 1))
+        return [player_count for player_count in self.__player_counts if low <= player_count <= high]
+
+    def __chunks(self) -> List[range]:
+        size, count = self.__chunk_size, self.__games_per_variant
+        return [range(start, min(start + size, count)) for start in range(0, count, size)]
+
+    def run(self) -> SweepResult:
+        started = time.perf_counter()
+        names = list(self.__axes)
+        settings = (self.__games_per_variant, self.__max_hands, self.__root_seed)
+        cache = self.__load_cache()
+
+        valid: List[Tuple[Dict[str, Any], Rules, int, str]] = [] # (swept values, rules, player count, key) - one per table row
+        pruned = []
+        variant_count = 0
+        for params in self.variants():
+            variant_count += 1
+            swept = {name: params[name] for name in names}
+            rules, violations = self.__build(params)
+            player_counts = [] if rules is None else self.__player_counts_for(rules)
+            if rules is not None and not player_counts:
+                violations = (RuleViolation(RuleViolationKind.PLAYER_RANGE, field="player_counts"),)
+            if not player_counts:
+                pruned.append((swept, violations))
+                continue
+            for player_count in player_counts:
+                valid.append((swept, rules, player_count, rules_key(rules, player_count, *settings)))
+
+        statistics: Dict[str, Dict[str, float]] = {key: cache[key] for (_, _, _, key) in valid if key in cache}
+        cached_count = len(statistics)
+        pending = {key: (rules, player_count) for (_, rules, player_count, key) in valid if key not in statistics}
+        summaries: Dict[str, List[GameSummary]] = {key: [] for key in pending}
+        simulated = 0
+
+        def collect(key: str, chunk: List[GameSummary]):
+            nonlocal simulated
+            simulated += len(chunk)
+            summaries[key].extend(chunk)
+            if len(summaries[key]) == self.__games_per_variant:
+                statistics[key] = summarize_variant(summaries.pop(key))
+                self.__store(key, statistics[key])
+
+        tasks = [(key, rules, player_count, chunk) for key, (rules, player_count) in pending.items() for chunk in self.__chunks()]
+        args = (self.__instruction_implementer, self.__max_hands, self.__root_seed)
+        if self.__worker_count == 0:
+            for key, rules, player_count, chunk in tasks:
+                collect(key, _sweep_chunk(self.__game_factory, rules, player_count, *args, chunk))
+        elif tasks:
+            with ProcessPoolExecutor(max_workers=self.__worker_count) as executor:
+                futures = {
+                    executor.submit(_sweep_chunk, self.__game_factory, rules, player_count, *args, chunk): key
+                    for key, rules, player_count, chunk in tasks
+                }
+                for future in as_completed(futures):
+                    collect(futures[future], future.result())
+
+        columns: Dict[str, List[Any]] = {"rules_key": [key for (_, _, _, key) in valid]}
+        columns["player_count"] = [player_count for (_, _, player_count, _) in valid]
+        for name in names:
+            columns[name] = [swept[name] for (swept, _, _, _) in valid]
+        for statistic in STATISTICS:
+            columns[statistic] = [statistics[key][statistic] for (_, _, _, key) in valid]
+
+        report = SweepReport(
+            variant_count=variant_count,
+            pruned_count=len(pruned),
+            cached_count=cached_count,
+            simulated_game_count=simulated,
+            elapsed_seconds=time.perf_counter() - started,
+        )
+        return SweepResult(columns=columns, pruned=pruned, report=report)
@@ -0,0 +1,297 @@
+"""
+Gym-style vectorized environment over N Games - reset() / step(actions) for training loops
+
+Every env is always paused on one player's decision (see Game.take_player_actions_steps). step() takes one list of
+(Instruction, aux) per env, applies it through the InstructionSetImplementer and runs each game to its next decision. It returns
+-> observation: the next deciding player of every env, batched by an ObservationEncoder
+-> rewards (N, player_count): change in every player's score since the previous step - scores move when a hand is scored
+-> dones (N,): whether the env's game finished on this step. Finished envs reset themselves with a fresh game straight away,
+   so the observation is already the new game's first decision. The finished game's records & seed are in infos[i]
+
+Per-env bookkeeping (current player, hand, episode, scores) is kept as arrays next to the games. The games themselves are still
+whole Game objects, one per env, since the rules & dealer only run on a Game - it's the bookkeeping that's struct-of-arrays.
+Env i's k-th game is built from game_factory(derive_seed(root_seed, i, k)) - ShardedVectorEnv gives the same games as VectorEnv.
+reset() moves every env on to its next game rather than starting its episodes over, so it never replays a game - reset(seed) starts
+over from a new root seed
+
+Requires NumPy - install the `numpy` extra
+"""
+
+from playingcardsplus.MultiplayerGames.game import Game
+from playingcardsplus.MultiplayerGames.instructions import Instruction, InstructionSetImplementer
+from playingcardsplus.MultiplayerGames.observation import ObservationEncoder, Observation, ObservationInput
+from playingcardsplus.MultiplayerGames.simulator import GameFactory, play_game_steps
+from playingcardsplus.rng import derive_seed
+
+import os
+import multiprocessing
+import numpy as np
+from typing_extensions import NamedTuple, List, Tuple, Any, Dict, Sequence, Optional
+
+
+Actions = List[Tuple[Instruction, Any]]
+
+
+class VectorEnvState(NamedTuple):
+    current_player: np.ndarray # (N,) roster index of the player to act
+    hand_index: np.ndarray # (N,)
+    episode: np.ndarray # (N,) k of the env's current game - games it finished or reset() cut short before this one
+    scores: np.ndarray # (N, player_count) scoreboard in roster order
+
+
+class StepResult(NamedTuple):
+    observation: Observation
+    rewards: np.ndarray # (N, player_count)
+    dones: np.ndarray # (N,) bool
+    infos: List[Dict[str, Any]]
+
+
+class VectorEnv:
+    """
+    N games stepped in lock step in this process. Every game needs the same number of players.
+    `env_offset` shifts env indices for seeding - ShardedVectorEnv uses it so shards don't replay each other's games
+    """
+
+    def __init__(
+        self,
+        game_factory: GameFactory,
+        instruction_implementer: InstructionSetImplementer,
+        num_envs: int,
+        encoder: Optional[ObservationEncoder] = None,
+        root_seed: int = 0,
+        max_hands: int = 1000,
+        env_offset: int = 0,
+    ):
+        self.__game_factory = game_factory
+        self.__instruction_implementer = instruction_implementer
+        self.__num_envs = num_envs
+        self.__encoder = encoder
+        self.__root_seed = root_seed
+        self.__max_hands = max_hands
+        self.__env_offset = env_offset
+
+        self.__games: List[Optional[Game]] = [None] * num_envs
+        self.__steps: List[Any] = [None] * num_envs
+        self.__requests: List[Any] = [None] * num_envs
+        self.__roster_index: List[Dict[str, int]] = [{} for _ in range(num_envs)]
+        self.__state: Optional[VectorEnvState] = None
+
+    @property
+    def num_envs(self) -> int:
+        return self.__num_envs
+
+    @property
+    def games(self) -> List[Game]:
+        return list(self.__games)
+
+    @property
+    def state(self) -> VectorEnvState:
+        """Live arrays - they change on every step"""
+        if self.__state is None:
+            raise RuntimeError("Call reset() before stepping the environment")
+        return self.__state
+
+    @property
+    def encoder(self) -> Optional[ObservationEncoder]:
+        return self.__encoder
+
+    def __scores(self, env_index: int) -> List[int]:
+        game = self.__games[env_index]
+        return [game.scoreboard.get(player, 0) for player in game.roster]
+
+    def __start(self, env_index: int, game: Optional[Game] = None):
+        if game is None:
+            game = self.__game_factory(derive_seed(self.__root_seed, self.__env_offset + env_index, int(self.__state.episode[env_index])))
+        if len(game.roster) != self.__state.scores.shape[1]:
+            raise ValueError("Every game of a VectorEnv needs {} players but got {}".format(self.__state.scores.shape[1], len(game.roster)))
+        self.__games[env_index] = game
+        self.__roster_index[env_index] = {player.name: index for index, player in enumerate(game.roster)}
+        self.__steps[env_index] = play_game_steps(game, self.__instruction_implementer, self.__max_hands)
+        self.__requests[env_index] = next(self.__steps[env_index])
+        self.__state.scores[env_index] = self.__scores(env_index)
+        self.__track(env_index)
+
+    def __track(self, env_index: int):
+        self.__state.current_player[env_index] = self.__roster_index[env_index][self.__requests[env_index].player.name]
+        self.__state.hand_index[env_index] = self.__games[env_index].hand_index
+
+    def __observe(self) -> Observation:
+        return self.__encoder.encode_batch([
+            ObservationInput(
+                game_state=request.current_game_state,
+                hand=request.player.hand,
+                cheating_state=request.cheating_states[-1] if request.cheating_states else None,
+                player_name=request.player.name,
+            )
+            for request in self.__requests
+        ])
+
+    def reset(self, seed: Optional[int] = None) -> Observation:
+        """
+        Starts a fresh game in every env. Episodes carry on from where they were, so games cut short count as played & never come back.
+        A seed becomes the new root seed & episodes start over from 0
+        """
+        if seed is not None:
+            self.__root_seed = seed
+            episode = np.zeros(self.__num_envs, dtype=np.int64)
+        elif self.__state is None:
+            episode = np.zeros(self.__num_envs, dtype=np.int64)
+        else:
+            episode = self.__state.episode + 1
+        first = self.__game_factory(derive_seed(self.__root_seed, self.__env_offset, int(episode[0])))
+        player_count = len(first.roster)
+        if self.__encoder is None:
+            self.__encoder = ObservationEncoder(deck_type=first.deck.type, joker_count=first.deck.joker_count)
+        self.__state = VectorEnvState(
+            current_player=np.zeros(self.__num_envs, dtype=np.int64),
+            hand_index=np.zeros(self.__num_envs, dtype=np.int64),
+            episode=episode,
+            scores=np.zeros((self.__num_envs, player_count), dtype=np.int64),
+        )
+        for env_index in range(self.__num_envs):
+            self.__start(env_index, game=first if env_index == 0 else None)
+        return self.__observe()
+
+    def step(self, actions: Sequence[Actions]) -> StepResult:
+        if len(actions) != self.__num_envs:
+            raise ValueError("Expected actions for {} envs but got {}".format(self.__num_envs, len(actions)))
+        state = self.state
+        rewards = np.zeros_like(state.scores)
+        dones = np.zeros(self.__num_envs, dtype=bool)
+        infos: List[Dict[str, Any]] = [{} for _ in range(self.__num_envs)]
+
+        for env_index, env_actions in enumerate(actions):
+            try:
+                self.__requests[env_index] = self.__steps[env_index].send(list(env_actions))
+            except StopIteration as stop:
+                dones[env_index] = True
+                infos[env_index] = {"seed": self.__games[env_index].seed, "records": stop.value}
+
+            scores = self.__scores(env_index)
+            rewards[env_index] = np.asarray(scores) - state.scores[env_index]
+            state.scores[env_index] = scores
+            if dones[env_index]:
+                state.episode[env_index] += 1
+                self.__start(env_index)
+            else:
+                self.__track(env_index)
+
+        return StepResult(observation=self.__observe(), rewards=rewards, dones=dones, infos=infos)
+
+    def close(self):
+        self.__games = [None] * self.__num_envs
+        self.__steps = [None] * self.__num_envs
+        self.__requests = [None] * self.__num_envs
+
+
+def _shard_worker(connection, env_kwargs: Dict[str, Any]):
+    env = VectorEnv(**env_kwargs)
+    try:
+        while True:
+            command, payload = connection.recv()
+            if command == "reset":
+                observation = env.reset(payload)
+                connection.send((Observation(observation.planes.copy(), observation.scalars.copy()), env.state))
+            elif command == "step":
+                result = env.step(payload)
+                observation = Observation(result.observation.planes.copy(), result.observation.scalars.copy())
+                connection.send((result._replace(observation=observation), env.state))
+            elif command == "close":
+                break
+    finally:
+        env.close()
+        connection.close()
+
+
+class ShardedVectorEnv:
+    """
+    Same interface & same games as VectorEnv, split across `shard_count` subprocesses - each one steps its own contiguous slice of envs.
+    The factory, implementer & actions need to be picklable. Use it as a context manager or call close()
+    """
+
+    def __init__(
+        self,
+        game_factory: GameFactory,
+        instruction_implementer: InstructionSetImplementer,
+        num_envs: int,
+        shard_count: Optional[int] = None,
+        encoder: Optional[ObservationEncoder] = None,
+        root_seed: int = 0,
+        max_hands: int = 1000,
+    ):
+        shard_count = min(num_envs, shard_count or os.cpu_count() or 1)
+        bounds = [num_envs*shard // shard_count for shard in range(shard_count + 1)]
+        self.__num_envs = num_envs
+        self.__slices = [slice(bounds[shard], bounds[shard + 1]) for shard in range(shard_count)]
+        self.__connections = []
+        self.__processes = []
+        for env_slice in self.__slices:
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_shard_worker,
+                args=(child, dict(
+                    game_factory=game_factory,
+                    instruction_implementer=instruction_implementer,
+                    num_envs=env_slice.stop - env_slice.start,
+                    encoder=encoder,
+                    root_seed=root_seed,
+                    max_hands=max_hands,
+                    env_offset=env_slice.start,
+                )),
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self.__connections.append(parent)
+            self.__processes.append(process)
+        self.__state: Optional[VectorEnvState] = None
+
+    @property
+    def num_envs(self) -> int:
+        return self.__num_envs
+
+    @property
+    def state(self) -> VectorEnvState:
+        if self.__state is None:
+            raise RuntimeError("Call reset() before stepping the environment")
+        return self.__state
+
+    def __gather(self, replies) -> List[Any]:
+        self.__state = VectorEnvState(*(np.concatenate(arrays) for arrays in zip(*(state for (_, state) in replies))))
+        return [reply for (reply, _) in replies]
+
+    def reset(self, seed: Optional[int] = None) -> Observation:
+        for connection in self.__connections:
+            connection.send(("reset", seed))
+        observations = self.__gather([connection.recv() for connection in self.__connections])
+        return Observation(*(np.concatenate(arrays) for arrays in zip(*observations)))
+
+    def step(self, actions: Sequence[Actions]) -> StepResult:
+        if len(actions) != self.__num_envs:
+            raise ValueError("Expected actions for {} envs but got {}".format(self.__num_envs, len(actions)))
+        for connection, env_slice in zip(self.__connections, self.__slices):
+            connection.send(("step", [list(env_actions) for env_actions in actions[env_slice]]))
+        results = self.__gather([connection.recv() for connection in self.__connections])
+        return StepResult(
+            observation=Observation(*(np.concatenate(arrays) for arrays in zip(*(result.observation for result in results)))),
+            rewards=np.concatenate([result.rewards for result in results]),
+            dones=np.concatenate([result.dones for result in results]),
+            infos=[info for result in results for info in result.infos],
+        )
+
+    def close(self):
+        for connection in self.__connections:
+            try:
+                connection.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+        for process in self.__processes:
+            process.join()
+        self.__connections, self.__processes = [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -68,6 +68,13 @@ class RuleIllFormedError(Exception):
         self.message = message
         super().__init__(self.message)
 
+class UnknownInstructionError(Exception):
+    """Operation isn't part of the InstructionSet or the InstructionSetImplementer has no method for it"""
+
+    def __init__(self, message: str = "Unknown Instruction!"):
+        self.message = message
+        super().__init__(self.message)
+
 class DealerError(Exception):
     def __init__(self, message: str = "Ooops! Something werid happened while dealing"):
         self.message = message
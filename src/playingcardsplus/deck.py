@@ -6,11 +6,14 @@ from playingcardsplus.utils import create_french_cards
 from playingcardsplus.card import Card, JokerCard
 
 
-import random  # Should be replaced for thread-safety and/or cryptogrraphic security of the random seed
+from playingcardsplus.rng import ShuffleRNG
+
+import random  # Only used when no RNG is given to the deck - module-level state is shared by everyone in the process
 from abc import ABC
-from typing_extensions import List
+from functools import lru_cache
+from typing_extensions import List, Tuple, Optional
 from enum import Enum
-from pydantic import BaseModel, computed_field, NonNegativeInt, ConfigDict
+from pydantic import BaseModel, computed_field, NonNegativeInt, ConfigDict, Field
 
 
 class DeckType(str, Enum):
@@ -22,6 +25,17 @@ CardCountMap = {
 }
 
 
+@lru_cache(maxsize=None)
+def get_card_table(deck_type: DeckType, joker_count: int) -> Tuple[Card | JokerCard, ...]:
+    """
+    Canonical ordering of every card in a deck of the given type.
+    Built once per (DeckType, joker_count) per process and shared by every deck - it's a tuple so nobody can mutate it
+    """
+    if deck_type == DeckType.FRENCH:
+        return tuple(create_french_cards(joker_count=joker_count))
+    raise ValueError("Unknown deck type '{}'".format(deck_type))
+
+
 class AbstractDeck(BaseModel, ABC):
     """
     An immutable Pydantic model for a deck of cards.
@@ -30,10 +44,11 @@ class AbstractDeck(BaseModel, ABC):
     Methods that modify the deck return a new `Deck` instance.
     """
 
-    model_config = ConfigDict(frozen=True)
+    model_config = ConfigDict(frozen=True, arbitrary_types_allowed=True)
     name: str
     type: DeckType = DeckType.FRENCH
     joker_count: NonNegativeInt # In multi-host/decentralized env, this needs to be sent from the Game
+    rng: Optional[ShuffleRNG] = Field(default=None, exclude=True, repr=False) # ie. random.Random, numpy.random.Generator - see playingcardsplus.rng
 
     # Don't Actually need to store anythign because the actual interfaces used by Game Devs and Simulators shoulds use
     # -> specific implentations that use the below functions and stores them appropriately
@@ -41,24 +56,22 @@ class AbstractDeck(BaseModel, ABC):
     #
     @computed_field
     @property
-    def cards(self) -> List[Card | JokerCard]:
-        return create_french_cards(joker_count=self.joker_count)
+    def cards(self) -> Tuple[Card | JokerCard, ...]:
+        """Shared card table for this deck's (type, joker_count) - do not copy it unless you need to mutate it"""
+        return get_card_table(self.type, self.joker_count)
 
-    @computed_field
     @property
     def shuffled_cards(self) -> List[Card | JokerCard]:
-        """Returns a new Deck instance with the cards in a random order."""
-        cards = self.cards
-        random.shuffle(cards)
+        """
+        Returns a new list of the cards in a random order.
+        Not a computed field - it draws from the deck's RNG, so dumping or printing the deck must never call it
+        """
+        cards = list(self.cards)
+        (random if self.rng is None else self.rng).shuffle(cards)
         return cards
 
     def __len__(self) -> int:
-        count = 52
-        if self.type==DeckType.FRENCH:
-            count = 52
-        return count + self.joker_count
-
-        #TODO or dimply just
+        return len(get_card_table(self.type, self.joker_count))
 
 
 # class SinglePlayerDeck(AbstractDeck):
@@ -0,0 +1,118 @@
+"""
+Compact integer encoding of cards - each Card/JokerCard of a deck type maps to a small int in 0..N-1
+
+Card IDs follow the canonical card table ordering (see deck.get_card_table), which means
+-> regular French cards are rank_index*4 + suit_index
+-> jokers come after, so JokerCard number n has ID 52 + n - 1
+Adding jokers only appends to the table, so an ID means the same card regardless of joker_count
+"""
+
+from playingcardsplus.card import Rank, Suit, Color, Card, JokerCard
+from playingcardsplus.deck import DeckType, get_card_table
+
+from array import array
+from functools import lru_cache
+from types import MappingProxyType
+from typing_extensions import NamedTuple, Tuple, Mapping, Iterable, List, Dict
+
+
+__RED_SUITS = {Suit.DIAMONDS.value, Suit.HEARTS.value}
+__RANK_INDEX = {rank.value: index for index, rank in enumerate(Rank)}
+__SUIT_INDEX = {suit.value: index for index, suit in enumerate(Suit)}
+__COLOR_INDEX = {color.value: index for index, color in enumerate(Color)}
+
+
+class CardEncoding(NamedTuple):
+    """
+    Bidirectional lookup tables between cards and their IDs for one (DeckType, joker_count)
+    rank_index & suit_index are -1 for jokers. color_index is the Color a card is printed in
+    """
+    deck_type: DeckType
+    joker_count: int
+    id_to_card: Tuple[Card | JokerCard, ...]
+    card_to_id: Mapping[Card | JokerCard, int]
+    rank_index: Tuple[int, ...]
+    suit_index: Tuple[int, ...]
+    color_index: Tuple[int, ...]
+
+    @property
+    def size(self) -> int:
+        return len(self.id_to_card)
+
+    def __reduce__(self):
+        # Pickling/deep copying hands back the shared tables of the receiving process - mapping proxies can't be pickled anyway
+        return get_card_encoding, (self.deck_type, self.joker_count)
+
+    def encode(self, cards: Iterable[Card | JokerCard]) -> List[int]:
+        card_to_id = self.card_to_id
+        return [card_to_id[card] for card in cards]
+
+    def decode(self, card_ids: Iterable[int]) -> List[Card | JokerCard]:
+        id_to_card = self.id_to_card
+        return [id_to_card[card_id] for card_id in card_ids]
+
+    def pack(self, cards: Iterable[Card | JokerCard]) -> bytes:
+        """Card IDs as bytes, in the given order - one byte per card, or two (native byte order) for decks over 256 cards"""
+        card_ids = self.encode(cards)
+        return bytes(card_ids) if len(self.id_to_card) <= 256 else array("H", card_ids).tobytes()
+
+    def unpack(self, packed: bytes) -> List[Card | JokerCard]:
+        if len(self.id_to_card) > 256:
+            packed = array("H", packed)
+        id_to_card = self.id_to_card
+        return [id_to_card[card_id] for card_id in packed]
+
+    def to_mask(self, cards: Iterable[Card | JokerCard]) -> int:
+        """Bitmask of the given cards where bit i is set when card ID i is present"""
+        card_to_id = self.card_to_id
+        mask = 0
+        for card in cards:
+            mask |= 1 << card_to_id[card]
+        return mask
+
+    def from_mask(self, mask: int) -> List[Card | JokerCard]:
+        """Cards present in the mask, in card ID order"""
+        id_to_card = self.id_to_card
+        cards = []
+        while mask:
+            low_bit = mask & -mask
+            cards.append(id_to_card[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return cards
+
+    def one_hot(self, cards: Iterable[Card | JokerCard]) -> Dict[Card | JokerCard, bool]:
+        """Every card of the deck mapped to whether it's in the given cards - ordered by card ID"""
+        card_to_id = self.card_to_id
+        flags = [False] * len(self.id_to_card)
+        for card in cards:
+            flags[card_to_id[card]] = True
+        return dict(zip(self.id_to_card, flags))
+
+
+@lru_cache(maxsize=None)
+def get_card_encoding(deck_type: DeckType, joker_count: int) -> CardEncoding:
+    """Built once per (DeckType, joker_count) per process and shared"""
+    id_to_card = get_card_table(deck_type, joker_count)
+
+    rank_index, suit_index, color_index = [], [], []
+    for card in id_to_card:
+        if isinstance(card, JokerCard):
+            rank_index.append(-1)
+            suit_index.append(-1)
+            color_index.append(__COLOR_INDEX[card.color])
+        else:
+            rank_index.append(__RANK_INDEX[card.rank])
+            suit_index.append(__SUIT_INDEX[card.suit])
+            color_index.append(
+                __COLOR_INDEX[Color.RED.value] if card.suit in __RED_SUITS else __COLOR_INDEX[Color.BLACK.value]
+            )
+
+    return CardEncoding(
+        deck_type=deck_type,
+        joker_count=joker_count,
+        id_to_card=id_to_card,
+        card_to_id=MappingProxyType({card: card_id for card_id, card in enumerate(id_to_card)}),
+        rank_index=tuple(rank_index),
+        suit_index=tuple(suit_index),
+        color_index=tuple(color_index),
+    )
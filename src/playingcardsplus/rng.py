@@ -0,0 +1,35 @@
+"""
+Seedable random number generators for shuffling
+
+Anything with a `shuffle(mutable_sequence)` method works as an RNG - random.Random, numpy.random.Generator (including counter-based
+bit generators like Philox), or your own. Seeds are derived deterministically from a root seed & keys (game index, hand index, ...)
+so N independent streams can be handed to N workers and any single game can be replayed bit-for-bit.
+"""
+
+import hashlib
+import random
+from typing_extensions import Protocol, MutableSequence, Any, List, runtime_checkable
+
+
+@runtime_checkable
+class ShuffleRNG(Protocol):
+    def shuffle(self, x: MutableSequence[Any]) -> None:
+        ...
+
+
+def derive_seed(root_seed: int, *keys: int) -> int:
+    """64-bit seed for the stream identified by keys - ie. derive_seed(root, game_index, hand_index)"""
+    digest = hashlib.blake2b(digest_size=8)
+    for value in (root_seed, *keys):
+        digest.update(int(value).to_bytes(16, "little", signed=True))
+    return int.from_bytes(digest.digest(), "little")
+
+
+def make_rng(seed: int) -> random.Random:
+    """Private RNG - doesn't touch or contend on the module-level random state"""
+    return random.Random(seed)
+
+
+def spawn_seeds(root_seed: int, count: int) -> List[int]:
+    """Independent seeds, ie. one per worker or one per game"""
+    return [derive_seed(root_seed, index) for index in range(count)]
@@ -0,0 +1,10 @@
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def cache_dir(tmp_path_factory):
+    """Anything cached on disk (ie. the hand evaluator's tables) goes to a temp directory rather than the real ~/.cache"""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        path = tmp_path_factory.mktemp("cache")
+        monkeypatch.setenv("PLAYINGCARDSPLUS_CACHE_DIR", str(path))
+        yield path
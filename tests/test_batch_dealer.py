@@ -0,0 +1,115 @@
+from playingcardsplus.MultiplayerGames.rules import Rules
+from playingcardsplus.MultiplayerGames.dealer import Dealer, DealerBehavior
+from playingcardsplus.MultiplayerGames.deck import MultiPlayerDeck, Distributee
+from playingcardsplus.MultiplayerGames.player import Player, PlayerBehavior
+from playingcardsplus.MultiplayerGames.instructions import InstructionSet, Instruction
+from playingcardsplus.dealer import CardDistributionMethod
+from playingcardsplus.custom_error import RuleViolationError
+
+from collections import defaultdict
+import random
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from playingcardsplus.MultiplayerGames.batch_dealer import BatchDealer
+
+
+@pytest.mark.skip("not a test but a helper to write tests")
+def __generate_rules(player_method: CardDistributionMethod, distribution_ordering, cards_per_player_early_hands, board_early_hands, trash_early_hands):
+    return Rules(
+        deck_size=52,
+        player_range=(2, 5),
+        cards_per_player_early_hands=cards_per_player_early_hands,
+        cards_per_player_hand_i=1,
+        board_distribution_early_hands=board_early_hands,
+        board_distribution_hand_i=1,
+        trash_pile_distribution_early_hands=trash_early_hands,
+        trash_pile_distribution_hand_i=1,
+        distribution_methods={
+            Distributee.PLAYER: player_method,
+            Distributee.TRASH_PILE: CardDistributionMethod.LUMP,
+            Distributee.BOARD: CardDistributionMethod.ONE_AT_A_TIME,
+            Distributee.UNUSED: CardDistributionMethod.LUMP,
+        },
+        distribution_ordering=distribution_ordering,
+        instructions=InstructionSet({Instruction(operation="foo")}),
+        instruction_constraints={}
+    )
+
+
+__holdem_ordering = [Distributee.TRASH_PILE, Distributee.PLAYER, Distributee.BOARD, Distributee.UNUSED]
+__dynamite_ordering = [Distributee.PLAYER, Distributee.BOARD, Distributee.TRASH_PILE, Distributee.UNUSED]
+
+params_rules = [
+    (__generate_rules(CardDistributionMethod.LUMP, __holdem_ordering, [2, 0], [0, 3], [0, 1]), 4),
+    (__generate_rules(CardDistributionMethod.ONE_AT_A_TIME, __holdem_ordering, [2, 0], [0, 3], [0, 1]), 3),
+    (__generate_rules(CardDistributionMethod.LUMP, __dynamite_ordering, [7], [0], [0]), 5),
+    (__generate_rules(CardDistributionMethod.ONE_AT_A_TIME, __dynamite_ordering, [{2: 5, 3: 4, 4: 3, 5: 3}], [2], [1]), 2),
+]
+
+
+@pytest.mark.parametrize("rules, player_count", params_rules)
+@pytest.mark.parametrize("seed", [0, 7, 1234])
+def test_batch_dealer_matches_dealer(rules, player_count, seed):
+    """
+    Batch dealing from the same unused pile must hand out exactly what Dealer.deal does
+    1) Build a deck on a fixed seed & feed its unused pile to the BatchDealer
+    2) Deal the first 3 hands with both
+    3) Compare players' hands, board, trash pile and unused pile
+    """
+    # 1) Same deck
+    random.seed(seed)
+    deck = MultiPlayerDeck(name="French_Multi_Player_Deck_NoJoker", joker_count=0)
+    encoding = deck.encoding
+    permutations = np.array([encoding.encode(reversed(deck.unused))], dtype=np.uint8)
+
+    dealer = Dealer(name="Ordinary Dealer", initial_behavior=DealerBehavior(name="Normal Fair", fair=True))
+    dealer._toggle_game_assignment()
+    players = [Player(name=str(i), initial_hand=defaultdict(int), initial_score=0, behvior=PlayerBehavior(name="noop", soul={})) for i in range(player_count)]
+
+    # 2) Deal with both
+    batch_deals = BatchDealer(rules=rules, player_count=player_count).deal_hands(batch_size=1, hand_count=3, permutations=permutations)
+
+    player_cards = [[] for _ in range(player_count)]
+    for hand_index, batch_deal in enumerate(batch_deals):
+        dealer.deal(players=players, rules=rules, deck=deck, hand_index=hand_index)
+
+        # 3) Same cards everywhere
+        for player_index in range(player_count):
+            player_cards[player_index].extend(batch_deal.players[0, player_index].tolist())
+            assert [card for card, count in players[player_index].hand.items() if count] == encoding.decode(sorted(player_cards[player_index]))
+        assert encoding.encode(deck.unused)[::-1] == batch_deal.unused[0].tolist()
+    assert encoding.encode(deck.board) == np.concatenate([batch_deal.board[0] for batch_deal in batch_deals]).tolist()
+    assert encoding.encode(deck.trash_pile) == np.concatenate([batch_deal.trash_pile[0] for batch_deal in batch_deals]).tolist()
+
+
+def test_batch_dealer_batch():
+    """
+    Test for the following
+    1) Shapes come out right & every row is a full deck
+    2) Same seed, same deal
+    3) Outputs are views rather than copies
+    """
+    rules, player_count = params_rules[0]
+    batch_dealer = BatchDealer(rules=rules, player_count=player_count)
+    batch_deal = batch_dealer.deal(batch_size=1000, rng=np.random.default_rng(42))
+
+    # 1) Shapes
+    assert batch_deal.players.shape == (1000, 4, 2)
+    assert batch_deal.board.shape == (1000, 0)
+    assert batch_deal.unused.shape == (1000, 52 - 8)
+    rows = np.concatenate([batch_deal.players.reshape(1000, -1), batch_deal.unused], axis=1)
+    assert (np.sort(rows, axis=1) == np.arange(52)).all()
+
+    # 2) Reproducible
+    assert (batch_dealer.deal(batch_size=1000, rng=np.random.default_rng(42)).players == batch_deal.players).all()
+
+    # 3) Views
+    assert batch_deal.players.base is not None and batch_deal.unused.base is not None
+
+
+def test_batch_dealer_player_count_out_of_range():
+    rules, _ = params_rules[0]
+    with pytest.raises(RuleViolationError):
+        BatchDealer(rules=rules, player_count=9)
@@ -0,0 +1,118 @@
+from playingcardsplus.MultiplayerGames.bitset_deck import BitsetDeck
+from playingcardsplus.MultiplayerGames.deck import MultiPlayerDeck, DeckBackend, Distributee
+from playingcardsplus.custom_error import DuplicateCardError, DeckInlclusionError, UnrecognizedCardError
+from playingcardsplus.rng import make_rng
+
+from collections import Counter
+from pydantic import ValidationError
+import pytest
+
+
+def test_bitset_deck_from_deck():
+    """
+    Test for the following
+    1) Conversion keeps the unused ordering - top of the pile is the end
+    2) Counts add up to the deck
+    """
+    deck = MultiPlayerDeck(name="French_Multi_Player_Deck_Joker", joker_count=2)
+    bitset_deck = BitsetDeck.from_deck(deck)
+
+    # 1) Same ordering
+    assert bitset_deck.cards(Distributee.UNUSED) == list(deck.unused)
+
+    # 2) Things add up!
+    assert bitset_deck.unused_count == len(deck) == 54
+    assert bitset_deck.unused_mask == (1 << 54) - 1
+    assert bitset_deck.board_count == bitset_deck.trash_pile_count == bitset_deck.player_hand_count == 0
+
+
+def test_bitset_deck_manipulation():
+    deck = MultiPlayerDeck(name="French_Multi_Player_Deck_NoJoker", joker_count=0)
+    bitset_deck = BitsetDeck.from_deck(deck)
+    top = deck.encoding.encode(list(deck.unused)[::-1][:5])
+
+    # Draws come off the top
+    taken = bitset_deck.take_from_unused(5)
+    assert list(taken) == top
+    assert not any(bitset_deck.contains(Distributee.UNUSED, card_id) for card_id in taken)
+
+    bitset_deck.give_to_players(taken[:2])
+    bitset_deck.add_to_board(taken[2:4])
+    bitset_deck.add_trash(taken[4:])
+    assert bitset_deck.player_hand_count == 2
+    assert list(bitset_deck.board) == list(taken[2:4])
+    assert bitset_deck.contains(Distributee.TRASH_PILE, taken[4])
+    assert bitset_deck.unused_count + bitset_deck.player_hand_count + bitset_deck.board_count + bitset_deck.trash_pile_count == 52
+
+    # Duplicates & missing cards are caught
+    with pytest.raises(DuplicateCardError):
+        bitset_deck.add_to_board(taken[2:3])
+    with pytest.raises(DeckInlclusionError):
+        bitset_deck.take_from_players(taken[2:3])
+    with pytest.raises(DeckInlclusionError):
+        bitset_deck.burn_trash(2)
+    assert bitset_deck.trash_pile_count == 1
+
+    # Back to the bottom of unused
+    bitset_deck.replenish_unused(bitset_deck.take_from_players(taken[:2]))
+    assert list(bitset_deck.unused[:2]) == list(taken[:2])
+    assert Counter(bitset_deck.cards(Distributee.UNUSED) + bitset_deck.cards(Distributee.BOARD) + bitset_deck.cards(Distributee.TRASH_PILE)) == Counter(deck.cards)
+
+
+def test_bitset_deck_snapshot_restore():
+    deck = MultiPlayerDeck(name="French_Multi_Player_Deck_NoJoker", joker_count=0)
+    bitset_deck = BitsetDeck.from_deck(deck)
+    bitset_deck.add_to_board(bitset_deck.take_from_unused(3))
+
+    snapshot = bitset_deck.snapshot()
+    clone = bitset_deck.copy()
+    assert clone == bitset_deck
+    assert hash(snapshot) == hash(clone.snapshot())
+
+    bitset_deck.add_trash(bitset_deck.take_from_unused(4))
+    assert bitset_deck != clone
+
+    bitset_deck.restore(snapshot)
+    assert bitset_deck == clone
+    assert bitset_deck.trash_pile_mask == 0
+
+
+def test_bitset_backend_deck():
+    """
+    Test for the following
+    1) A bitset backed MultiPlayerDeck shuffles & deals exactly like a piles backed one
+    2) Its pile properties are copies & its errors match the piles backend
+    3) It can't be combined with lazy_shuffle
+    """
+    piles_deck = MultiPlayerDeck(name="French_Multi_Player_Deck_Joker", joker_count=2, rng=make_rng(5))
+    deck = MultiPlayerDeck(name="French_Multi_Player_Deck_Joker", joker_count=2, backend=DeckBackend.BITSET, rng=make_rng(5))
+    piles_deck._toggle_dealer_assignment()
+    deck._toggle_dealer_assignment()
+
+    # 1) Same moves, same piles
+    for moving_deck in (piles_deck, deck):
+        taken = moving_deck._take_from_unused(8)
+        moving_deck._give_to_players(list(taken)[:3])
+        moving_deck._add_to_board(list(taken)[3:6])
+        moving_deck._add_trash(list(taken)[6:])
+        moving_deck._remove_from_board({list(taken)[4]: True})
+        moving_deck._replenish_unused(list(moving_deck._burn_trash(1)))
+    assert list(deck.unused) == list(piles_deck.unused)
+    assert list(deck.board) == list(piles_deck.board)
+    assert list(deck.trash_pile) == list(piles_deck.trash_pile)
+    assert set(deck.player_hands) == set(piles_deck.player_hands)
+    assert (deck.unused_count, deck.board_count, deck.trash_pile_count, deck.player_hand_count) == (47, 2, 1, 3)
+
+    # 2) Copies & errors
+    deck.unused.pop()
+    assert deck.unused_count == 47
+    with pytest.raises(UnrecognizedCardError):
+        deck._remove_from_board({next(iter(deck.player_hands)): True})
+    with pytest.raises(DuplicateCardError):
+        deck._give_to_players([next(iter(deck.player_hands))])
+    with pytest.raises(DeckInlclusionError):
+        deck._burn_trash(2)
+
+    # 3) No lazy shuffling
+    with pytest.raises(ValidationError):
+        MultiPlayerDeck(name="French_Multi_Player_Deck_Joker", joker_count=2, backend=DeckBackend.BITSET, lazy_shuffle=True)
@@ -0,0 +1,71 @@
+from playingcardsplus.MultiplayerGames.data_stream import CollectibleDataReader, CollectibleDataWriter
+
+from playingcardsplus.MultiplayerGames.games.dynamite import make_dynamite_game, make_dynamite_instruction_set
+
+import pytest
+
+
+@pytest.mark.skip("not a test but a helper to run tests")
+def __play_streaming_game(path, seed, max_hands):
+    game = make_dynamite_game(seed=seed)
+    game.game_data_path = str(path)
+    game.stream_data = True
+    instruction_implementer = make_dynamite_instruction_set()
+
+    records = [game.start_game(instruction_implementer)]
+    while len(records) < max_hands and not game.is_over():
+        records.append(game.next_hand(instruction_implementer))
+    game.close_data_stream()
+    return records
+
+
+def test_stream_round_trip(tmp_path):
+    """
+    Test for the following
+    1) One record per hand gets written with matching metadata
+    2) Reading back gives the same CollectibleData (board ordering aside)
+    """
+    path = tmp_path / "dynamite.pcpd"
+    records = __play_streaming_game(path, seed=5, max_hands=12)
+
+    with CollectibleDataReader(str(path)) as reader:
+        # 1) One record per hand
+        assert len(reader) == len(records)
+        assert reader.metadata.player_names == ("player_0", "player_1", "player_2")
+        assert [record.hand_index for record in reader] == list(range(len(records)))
+
+        # 2) Same data
+        for stored, record in zip(reader, records):
+            restored = reader.to_collectible_data(stored)
+            assert restored.scores == record.scores
+            assert restored.player_actions == {name: {operation: float(value) for operation, value in actions.items()} for name, actions in record.player_actions.items()}
+            assert restored.unused_state == record.unused_state
+            assert restored.trash_pile_state == record.trash_pile_state
+            assert set(restored.player_state) == {card for card, present in record.player_state.items() if present}
+
+
+def test_stream_appends_and_rejects_mismatched_metadata(tmp_path):
+    path = tmp_path / "dynamite.pcpd"
+    first = __play_streaming_game(path, seed=1, max_hands=3)
+    second = __play_streaming_game(path, seed=2, max_hands=3)
+
+    with CollectibleDataReader(str(path)) as reader:
+        assert len(reader) == len(first) + len(second)
+        metadata = reader.metadata
+
+    with pytest.raises(ValueError):
+        CollectibleDataWriter(str(path), metadata._replace(player_names=("someone_else",)))
+
+
+def test_stream_as_arrays(tmp_path):
+    np = pytest.importorskip("numpy")
+    path = tmp_path / "dynamite.pcpd"
+    records = __play_streaming_game(path, seed=3, max_hands=6)
+
+    reader = CollectibleDataReader(str(path))
+    arrays = reader.as_arrays()
+    assert arrays.shape == (len(records),)
+    assert arrays["scores"][-1].tolist() == list(records[-1].scores.values())
+    assert arrays["player_actions"].shape == (len(records), 3, 4)
+    del arrays
+    reader.close()
@@ -1,6 +1,7 @@
 from playingcardsplus.MultiplayerGames.deck import MultiPlayerDeck
 from playingcardsplus.custom_error import DealerUnassignedError
 from playingcardsplus.card import Color
+from playingcardsplus.rng import make_rng
 
 from collections import Counter
 from typing_extensions import OrderedDict
@@ -116,3 +117,176 @@ def test_french_multiplayer_dealer_assignment_toggle_fails():
     assert deck.dealer_assigned == False
     deck.__dealer_assigned = True
     assert deck.dealer_assigned == False
+
+
+def test_french_multiplayer_card_table_is_shared():
+    """
+    Card table should be built once per (DeckType, joker_count) and shared by every deck
+    1) Same object across decks and accesses
+    2) Shuffling doesn't touch the shared table
+    """
+    deck_a = MultiPlayerDeck(name="French_Multi_Player_Deck_A", joker_count=0)
+    deck_b = MultiPlayerDeck(name="French_Multi_Player_Deck_B", joker_count=0)
+
+    # 1) Same object
+    assert deck_a.cards is deck_b.cards
+    assert deck_a.cards is deck_a.cards
+    assert MultiPlayerDeck(name="French_Multi_Player_Deck_Joker", joker_count=2).cards is not deck_a.cards
+
+    # 2) Shared table untouched by shuffles
+    before = tuple(deck_a.cards)
+    deck_a.shuffled_cards
+    assert deck_a.cards == before
+
+
+@pytest.mark.parametrize("lazy_shuffle", [False, True])
+def test_french_multiplayer_dump_leaves_rng(lazy_shuffle):
+    """
+    Test for the following
+    1) Dumping or printing the deck doesn't draw from its RNG
+    2) So it deals the same cards after a reset as a deck nobody looked at
+    """
+    deck = MultiPlayerDeck(name="French_Multi_Player_Deck_NoJoker", joker_count=0, lazy_shuffle=lazy_shuffle, rng=make_rng(3))
+    untouched = MultiPlayerDeck(name="French_Multi_Player_Deck_NoJoker", joker_count=0, lazy_shuffle=lazy_shuffle, rng=make_rng(3))
+
+    # 1) RNG state
+    state = deck.rng.getstate()
+    assert "shuffled_cards" not in deck.model_dump()
+    repr(deck)
+    assert deck.rng.getstate() == state
+
+    # 2) Reset with the deck's own RNG
+    for each in (deck, untouched):
+        each.reset()
+        each._toggle_dealer_assignment()
+    assert list(deck._take_from_unused(20)) == list(untouched._take_from_unused(20))
+
+
+def test_french_multiplayer_running_counts():
+    """
+    Test for the following
+    1) Running counts match a full rescan of the piles after every kind of move
+    2) version moves on every mutation & the board snapshot is only rebuilt when the board changes
+    """
+    deck = MultiPlayerDeck(name="French_Multi_Player_Deck_NoJoker", joker_count=0)
+    deck._toggle_dealer_assignment()
+
+    def assert_counts():
+        assert deck.unused_count == len(deck.unused)
+        assert deck.board_count == sum(deck.board.values())
+        assert deck.trash_pile_count == len(deck.trash_pile)
+        assert deck.player_hand_count == sum(deck.player_hands.values())
+        assert deck.unused_count + deck.board_count + deck.trash_pile_count + deck.player_hand_count == 52
+
+    # 1) Move cards around
+    version = deck.version
+    deck._give_to_players(deck._take_from_unused(10))
+    deck._add_to_board(deck._take_from_unused(5))
+    snapshot = deck.board_snapshot()
+    deck._add_trash(deck._take_from_unused(3))
+    assert_counts()
+
+    # 2) Board didn't change so neither did the snapshot
+    assert deck.version > version
+    assert deck.board_snapshot() is snapshot
+
+    board_cards = list(deck.board)[:2]
+    deck._replenish_unused(list(deck._remove_from_board(OrderedDict((card, True) for card in board_cards))))
+    hand_cards = list(deck.player_hands)[:4]
+    deck._add_trash(deck._take_from_players(OrderedDict((card, True) for card in hand_cards)).keys())
+    deck._replenish_unused(list(deck._burn_trash(2)))
+    assert_counts()
+    assert deck.board_snapshot() is not snapshot and deck.board_snapshot() == dict(deck.board)
+
+
+def test_french_multiplayer_lazy_shuffle():
+    """
+    Test for the following
+    1) A lazy deck holds the same cards and shuffles nothing until something is drawn
+    2) Same seed, same draws - whether or not the pile got looked at in between
+    3) Replenished cards go to the bottom, under the cards still pending
+    4) Snapshots restore the exact order
+    5) Drawing the whole pile leaves the RNG where settling it would
+    """
+    def lazy_deck(seed):
+        deck = MultiPlayerDeck(name="French_Multi_Player_Deck_Lazy", joker_count=2, lazy_shuffle=True, rng=make_rng(seed))
+        deck._toggle_dealer_assignment()
+        return deck
+
+    # 1) Same cards, nothing settled yet
+    deck = lazy_deck(5)
+    assert deck.unused.pending_count == 54
+    assert Counter(deck.unused_unordered()) == Counter(deck.cards)
+    assert deck.unused.pending_count == 54
+
+    # 2) Looking at the order doesn't change what gets drawn
+    peeked = lazy_deck(5)
+    order = list(peeked.unused)
+    assert peeked.unused.pending_count == 0
+    drawn = list(deck._take_from_unused(7))
+    assert drawn == list(peeked._take_from_unused(7)) == order[::-1][:7]
+    assert list(deck.unused) == order[:-7]
+
+    # 3) Replenish under the pending cards
+    deck = lazy_deck(6)
+    taken = list(deck._take_from_unused(3))
+    deck._replenish_unused(taken)
+    assert list(deck.unused)[:3] == taken
+
+    # 4) Snapshot & restore
+    deck = lazy_deck(7)
+    deck._take_from_unused(2)
+    snapshot = deck.snapshot()
+    expected = list(deck._take_from_unused(10))
+    deck.restore(snapshot)
+    assert list(deck._take_from_unused(10)) == expected
+
+    # 5) RNG state after the last card
+    deck, peeked = lazy_deck(8), lazy_deck(8)
+    list(peeked.unused)
+    assert list(deck._take_from_unused(54)) == list(peeked._take_from_unused(54))
+    assert deck.rng.getstate() == peeked.rng.getstate()
+
+
+@pytest.mark.parametrize("rng_factory", [make_rng, lambda seed: pytest.importorskip("numpy").random.default_rng(seed)])
+def test_french_multiplayer_lazy_shuffle_is_uniform(rng_factory):
+    """Every card is as likely to be drawn first & tenth as with a full shuffle - loose bounds, 5200 decks"""
+    first, tenth = Counter(), Counter()
+    for seed in range(5200):
+        deck = MultiPlayerDeck(name="French_Multi_Player_Deck_Lazy", joker_count=0, lazy_shuffle=True, rng=rng_factory(seed))
+        deck._toggle_dealer_assignment()
+        drawn = deck._take_from_unused(10)
+        first[drawn[0]] += 1
+        tenth[drawn[9]] += 1
+    for counts in (first, tenth):
+        assert len(counts) == 52
+        assert 50 < min(counts.values()) and max(counts.values()) < 160
+
+
+@pytest.mark.parametrize("lazy_shuffle", [False, True])
+def test_french_multiplayer_reset(lazy_shuffle):
+    """
+    Test for the following
+    1) Reset puts every card back into unused with empty piles & counts
+    2) Resetting with a seeded RNG shuffles like a fresh deck built with that RNG
+    """
+    deck = MultiPlayerDeck(name="French_Multi_Player_Deck_NoJoker", joker_count=0, lazy_shuffle=lazy_shuffle, rng=make_rng(1))
+    deck._toggle_dealer_assignment()
+    deck._give_to_players(deck._take_from_unused(10))
+    deck._add_to_board(deck._take_from_unused(5))
+    deck._add_trash(deck._take_from_unused(3))
+    snapshot = deck.board_snapshot()
+    version = deck.version
+
+    # 1) Everything back in unused
+    deck.reset(make_rng(2))
+    assert (deck.unused_count, deck.board_count, deck.trash_pile_count, deck.player_hand_count) == (52, 0, 0, 0)
+    assert not deck.board and not deck.trash_pile and not deck.player_hands
+    assert deck.version > version and deck.board_snapshot() is not snapshot
+    assert Counter(deck.unused_unordered()) == Counter(deck.cards)
+
+    # 2) Same as a fresh deck
+    fresh = MultiPlayerDeck(name="French_Multi_Player_Deck_NoJoker", joker_count=0, lazy_shuffle=lazy_shuffle, rng=make_rng(2))
+    fresh._toggle_dealer_assignment()
+    assert list(deck._take_from_unused(20)) == list(fresh._take_from_unused(20))
+    assert list(deck.unused) == list(fresh.unused)
@@ -0,0 +1,49 @@
+from playingcardsplus.encoding import get_card_encoding
+from playingcardsplus.deck import DeckType, get_card_table
+from playingcardsplus.card import Card, JokerCard, Rank, Suit, Color
+
+import pytest
+
+
+@pytest.mark.parametrize("joker_count", [0, 1, 2, 5])
+def test_card_encoding_round_trip(joker_count):
+    """
+    Test for the following
+    1) IDs are 0..N-1 in card table order and map back and forth
+    2) Regular card IDs are rank_index*4 + suit_index and jokers come after
+    3) IDs don't change when jokers are added
+    """
+    encoding = get_card_encoding(DeckType.FRENCH, joker_count)
+    table = get_card_table(DeckType.FRENCH, joker_count)
+
+    # 1) Round trip
+    assert encoding.size == len(table) == 52 + joker_count
+    assert encoding.decode(encoding.encode(table)) == list(table)
+    assert encoding.encode(table) == list(range(encoding.size))
+
+    # 2) Layout
+    assert encoding.card_to_id[Card(rank=Rank.TWO.value, suit=Suit.CLUBS.value)] == 0
+    assert encoding.card_to_id[Card(rank=Rank.ACE.value, suit=Suit.SPADES.value)] == 51
+    for card_id, card in enumerate(table):
+        if isinstance(card, JokerCard):
+            assert encoding.rank_index[card_id] == encoding.suit_index[card_id] == -1
+            assert card_id == 52 + card.number - 1
+        else:
+            assert card_id == encoding.rank_index[card_id]*4 + encoding.suit_index[card_id]
+            assert list(Color)[encoding.color_index[card_id]] == (Color.RED if card.suit in ("♦", "♥") else Color.BLACK)
+
+    # 3) Stable across joker counts
+    assert get_card_encoding(DeckType.FRENCH, 0).id_to_card == encoding.id_to_card[:52]
+
+
+def test_card_encoding_masks():
+    encoding = get_card_encoding(DeckType.FRENCH, 2)
+    cards = [encoding.id_to_card[i] for i in (53, 0, 17)]
+
+    mask = encoding.to_mask(cards)
+    assert mask == (1 << 0) | (1 << 17) | (1 << 53)
+    assert encoding.from_mask(mask) == [encoding.id_to_card[i] for i in (0, 17, 53)]
+
+    one_hot = encoding.one_hot(cards)
+    assert list(one_hot.keys()) == list(encoding.id_to_card)
+    assert sum(one_hot.values()) == 3
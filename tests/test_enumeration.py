@@ -0,0 +1,65 @@
+from playingcardsplus.MultiplayerGames.games.dynamite import make_dynamite_game, make_dynamite_instruction_set
+
+from itertools import combinations
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from playingcardsplus.MultiplayerGames.enumeration import enumerate_deals, deal_count, suit_symmetries
+
+
+def test_deal_count():
+    assert deal_count(48, [5]) == 1_712_304
+    assert deal_count(10, [2, 3]) == 45 * 56
+    assert deal_count(10, []) == 1
+
+
+@pytest.mark.parametrize("fixed_groups, symmetry_count", [
+    ([], 24), # nothing known - any suit order works
+    ([[48, 49], [46, 47]], 4), # A♣A♦ vs K♥K♠ - swap ♣/♦, swap ♥/♠ or both
+    ([[48, 49, 50, 51]], 24), # all 4 aces are still all 4 aces
+    ([[0]], 6), # 2♣ pins clubs
+])
+def test_suit_symmetries(fixed_groups, symmetry_count):
+    pool = sorted(set(range(52)) - {card_id for group in fixed_groups for card_id in group})
+    symmetries = suit_symmetries(pool, fixed_groups)
+    assert len(symmetries) == symmetry_count
+    assert np.array_equal(symmetries[0], np.arange(52))
+
+
+@pytest.mark.parametrize("pool, slot_sizes, fixed_groups", [
+    (list(range(12)), [3], []),
+    (list(range(20)), [2, 2], [[20, 21]]),
+    (list(range(4, 52)), [2], [[0, 1], [2, 3]]),
+])
+def test_enumeration_covers_every_deal(pool, slot_sizes, fixed_groups):
+    """
+    1) Without suit reduction every deal comes out exactly once
+    2) With it, the weights still add up to every deal & fewer rows come out
+    3) Chunks never go over chunk_size
+    """
+    # 1)
+    plain = np.concatenate([chunk.deals for chunk in enumerate_deals(pool, slot_sizes, fixed_groups, chunk_size=100, reduce_suits=False)])
+    assert plain.shape == (deal_count(len(pool), slot_sizes), sum(slot_sizes))
+    assert len({tuple(deal) for deal in plain.tolist()}) == plain.shape[0]
+    # 2)
+    chunks = list(enumerate_deals(pool, slot_sizes, fixed_groups, chunk_size=100))
+    assert sum(int(chunk.weights.sum()) for chunk in chunks) == deal_count(len(pool), slot_sizes)
+    assert sum(len(chunk.deals) for chunk in chunks) < plain.shape[0]
+    # 3)
+    assert all(len(chunk.deals) <= 100 for chunk in chunks)
+
+
+def test_enumerate_unused_pile():
+    """Every 2 card draw left in a Dynamite game's unused pile, streamed lazily"""
+    game = make_dynamite_game(seed=0)
+    game.start_game(make_dynamite_instruction_set())
+    encoding = game.deck.encoding
+    pool = encoding.encode(game.deck.unused_unordered())
+    hands = [player.hand.card_ids() for player in game.roster]
+    deals = [tuple(deal) for chunk in enumerate_deals(pool, [2], hands, reduce_suits=False) for deal in chunk.deals.tolist()]
+    assert deals == list(combinations(sorted(pool), 2))
+    assert sum(int(chunk.weights.sum()) for chunk in enumerate_deals(pool, [2], hands)) == len(deals)
+
+    with pytest.raises(ValueError):
+        next(enumerate_deals(pool, [len(pool) + 1]))
@@ -1,3 +1,93 @@
+from playingcardsplus.MultiplayerGames.simulator import play_game
+from playingcardsplus.MultiplayerGames.deck import MultiPlayerDeck
+
+from playingcardsplus.MultiplayerGames.games.dynamite import make_dynamite_game, make_dynamite_instruction_set
+
+import random
+import pytest
+
+
+def test_seed_shuffles_unseeded_deck():
+    """
+    Test for the following
+    1) A seeded game whose deck has no RNG of its own gets it shuffled from hand_rng(0) - same seed, same deck
+    2) That's the same deck reset(seed) deals
+    """
+    def unseeded_game(seed):
+        game = make_dynamite_game(seed)
+        return game.model_validate(dict(game, deck=MultiPlayerDeck(name="French_Multi_Player_Deck_NoJoker", joker_count=0)))
+
+    # 1) Same seed, same deck - whatever the module-level random is up to
+    random.seed(1)
+    game = unseeded_game(7)
+    random.seed(2)
+    assert game.snapshot() == unseeded_game(7).snapshot()
+    assert game.snapshot() == make_dynamite_game(7).snapshot()
+
+    # 2) Same as reset
+    play_game(game, make_dynamite_instruction_set(), max_hands=5)
+    game.reset(7)
+    assert game.snapshot() == unseeded_game(7).snapshot()
+
+
+@pytest.mark.parametrize("validate_every", [0, 3])
+def test_trusted_game_records_match(validate_every):
+    """Skipping validation must not change what gets played or recorded"""
+    validated = play_game(make_dynamite_game(seed=21), make_dynamite_instruction_set(), max_hands=15)
+    trusted_game = make_dynamite_game(seed=21, trusted=True, validate_every=validate_every)
+    trusted = play_game(trusted_game, make_dynamite_instruction_set(), max_hands=15)
+
+    assert [record.model_dump() for record in trusted] == [record.model_dump() for record in validated]
+
+
+def test_game_state_follows_deck():
+    """
+    Test for the following
+    1) Game state is reused while the deck hasn't moved
+    2) It's refreshed once a player action changes the deck - ie. a draw
+    """
+    game = make_dynamite_game(seed=3)
+    game.start_game(make_dynamite_instruction_set())
+
+    # 1) Same object
+    state = game.game_state()
+    assert game.game_state() is state
+    assert state.unused_count == len(game.deck.unused) and state.player_hand_count == sum(game.deck.player_hands.values())
+
+    # 2) Draw then look again
+    make_dynamite_instruction_set().draw(player=game.roster[0], dealer=game.dealer, deck=game.deck, aux=None)
+    refreshed = game.game_state()
+    assert refreshed is not state
+    assert refreshed.unused_count == state.unused_count - 1 and refreshed.player_hand_count == state.player_hand_count + 1
+
+
+@pytest.mark.parametrize("history_depth", [0, 1, 4])
+def test_game_history_is_bounded(history_depth):
+    """
+    Test for the following
+    1) History never grows past history_depth however many hands are played
+    2) States are kept oldest first & the latest one is what the last player acted on
+    3) Players get a read-only view, not a copy
+    """
+    game = make_dynamite_game(seed=11, history_depth=history_depth)
+    play_game(game, make_dynamite_instruction_set(), max_hands=10)
+
+    # 1) Bounded
+    history = game.history
+    assert len(history) == history_depth
+
+    # 2) Ordering - nobody puts cards back into unused in Dynamite
+    unused_counts = [state.unused_count for state in history]
+    assert unused_counts == sorted(unused_counts, reverse=True)
+    if history_depth:
+        assert history[-1].unused_count >= game.game_state().unused_count
+
+    # 3) Read-only & live
+    assert game.history is history
+    with pytest.raises(TypeError):
+        history[0] = None
+
+
 # from playingcardsplus.MultiplayerGames.deck import MultiPlayerDeck, Distributee
 # from playingcardsplus.MultiplayerGames.dealer import Dealer, DealerBehavior, CardDistributionMethod
 # from playingcardsplus.MultiplayerGames.rules import Rules
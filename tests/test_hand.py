@@ -0,0 +1,72 @@
+from playingcardsplus.MultiplayerGames.hand import CardCountHand
+from playingcardsplus.MultiplayerGames.player import Player, PlayerBehavior
+from playingcardsplus.MultiplayerGames.deck import MultiPlayerDeck
+from playingcardsplus.card import Card, JokerCard, Rank, Suit
+from playingcardsplus.custom_error import DeckInlclusionError
+
+from collections import defaultdict
+import pytest
+
+
+def test_hand_counts():
+    """
+    Test for the following
+    1) size, rank counts & mask follow cards coming in and going out
+    2) Writing False takes a card away like Dynamite does
+    3) Only held cards show up as keys
+    """
+    deck = MultiPlayerDeck(name="French_Multi_Player_Deck_Joker", joker_count=2)
+    encoding = deck.encoding
+    hand = CardCountHand()
+
+    # 1) In & out
+    sevens = [Card(rank=Rank.SEVEN.value, suit=suit.value) for suit in Suit]
+    for card in sevens:
+        hand.add(card)
+    hand.add(JokerCard(color="black", number=2))
+    assert hand.size == len(hand) == 5
+    assert hand.holds_all_of(Rank.SEVEN) and hand.rank_count("7") == 4
+    assert hand.mask == encoding.to_mask(sevens + [JokerCard(color="black", number=2)])
+
+    # 2) Dynamite style removal
+    hand[sevens[0]] = False
+    assert hand.size == 4 and not hand.holds_all_of(Rank.SEVEN)
+    assert hand[sevens[0]] == 0
+
+    # 3) Reading doesn't add anything
+    assert hand[Card(rank=Rank.ACE.value, suit=Suit.SPADES.value)] == 0
+    assert list(hand) == sevens[1:] + [JokerCard(color="black", number=2)]
+    assert sevens[0] not in hand and sevens[1] in hand
+
+    with pytest.raises(DeckInlclusionError):
+        hand.remove(sevens[0])
+    with pytest.raises(KeyError):
+        hand[Card(rank="eleven", suit=Suit.SPADES.value)]
+    with pytest.raises(KeyError):
+        del hand[sevens[0]]
+    del hand[sevens[1]]
+    assert sevens[1] not in hand and hand.size == 3
+
+
+def test_player_wraps_hand():
+    """A defaultdict hand handed to a Player is turned into a CardCountHand with the same counts"""
+    initial_hand = defaultdict(int)
+    initial_hand[Card(rank=Rank.TWO.value, suit=Suit.CLUBS.value)] += 2
+    initial_hand[Card(rank=Rank.KING.value, suit=Suit.HEARTS.value)] += 0
+    player = Player(name="foo", initial_hand=initial_hand, initial_score=0, behvior=PlayerBehavior(name="noop", soul={}))
+
+    assert isinstance(player.hand, CardCountHand)
+    assert dict(player.hand) == {Card(rank=Rank.TWO.value, suit=Suit.CLUBS.value): 2}
+    player._remove_card(Card(rank=Rank.TWO.value, suit=Suit.CLUBS.value))
+    assert player.hand.size == 1
+
+
+def test_hand_bytes_round_trip():
+    """Counts past what a byte holds survive to_bytes() & restore(), jokers included"""
+    hand = CardCountHand()
+    hand.add(Card(rank=Rank.TWO.value, suit=Suit.CLUBS.value), count=300)
+    hand.add(JokerCard(color="red", number=1))
+    restored = CardCountHand()
+    restored.restore(hand.to_bytes())
+    assert dict(restored) == dict(hand)
+    assert restored.size == 301 and restored.mask == hand.mask
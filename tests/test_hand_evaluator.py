@@ -0,0 +1,99 @@
+from playingcardsplus.MultiplayerGames.games.texas_holdem import TexasHoldem, HoldemInstructionSet, HOLDEM_RULES, HOLDEM_OPERATIONS, BOARD_CARD_COUNT
+from playingcardsplus.MultiplayerGames.games.poker_hands import evaluate_best
+from playingcardsplus.MultiplayerGames.dealer import Dealer, DealerBehavior
+from playingcardsplus.MultiplayerGames.deck import MultiPlayerDeck
+from playingcardsplus.MultiplayerGames.player import Player, PlayerBehavior
+from playingcardsplus.rng import make_rng
+
+from collections import defaultdict
+import random
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from playingcardsplus.MultiplayerGames.games import hand_evaluator
+from playingcardsplus.MultiplayerGames.games.hand_evaluator import HandEvaluator, load_tables, build_tables, TABLE_VERSION
+
+
+@pytest.mark.parametrize("card_count", [5, 6, 7])
+def test_lookup_matches_reference(card_count):
+    """
+    1) Single hands score the same as trying every 5 card combination
+    2) So do batches
+    """
+    rng = random.Random(card_count)
+    hands = [rng.sample(range(52), card_count) for _ in range(3000)]
+    reference = [evaluate_best(hand) for hand in hands]
+    evaluator = HandEvaluator()
+    # 1)
+    assert [evaluator.evaluate(hand) for hand in hands] == reference
+    # 2)
+    assert list(evaluator.evaluate_batch(np.asarray(hands))) == reference
+
+
+def test_tables_cached_on_disk(tmp_path):
+    """
+    1) First load builds the tables & saves them
+    2) Next load reads the same tables back
+    3) A broken cache file gets rebuilt
+    """
+    # 1)
+    tables = load_tables(tmp_path)
+    path = tmp_path / "hand_tables_v{}.npz".format(TABLE_VERSION)
+    assert path.exists()
+    # 2)
+    loaded = load_tables(tmp_path)
+    for built, saved in zip(tables, loaded):
+        assert np.array_equal(built, saved)
+    # 3)
+    path.write_bytes(b"not an npz")
+    assert np.array_equal(load_tables(tmp_path).rank_keys, build_tables().rank_keys)
+
+
+@pytest.mark.parametrize("failing", ["savez", "replace"])
+def test_failed_cache_write_cleans_up(tmp_path, monkeypatch, failing):
+    """A cache that can't be written still gives the tables & leaves no temp file behind"""
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(hand_evaluator.np if failing == "savez" else hand_evaluator.os, failing, fail)
+    assert np.array_equal(load_tables(tmp_path).rank_keys, build_tables().rank_keys)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_texas_holdem_scores_at_showdown():
+    """
+    1) Nothing to score before the flop
+    2) After the river every player's score is their best hand out of hole cards & board, and the game is over
+    3) Except for a player who folded - they score nothing
+    """
+    roster = [
+        Player(name="player_{}".format(i), initial_hand=defaultdict(int), initial_score=0, behvior=PlayerBehavior(name="check", soul={"model": lambda arg: []}))
+        for i in range(4)
+    ]
+    game = TexasHoldem(
+        name="Texas Hold'em",
+        dealer=Dealer(name="Ordinary Dealer", initial_behavior=DealerBehavior(name="Normal Fair", fair=True)),
+        deck=MultiPlayerDeck(name="French_Multi_Player_Deck_NoJoker", joker_count=0, rng=make_rng(3)),
+        roster=roster,
+        rules=HOLDEM_RULES,
+        scoreboard={player: 0 for player in roster},
+        game_data_path="",
+        seed=3,
+    )
+    instruction_set = HoldemInstructionSet(HOLDEM_OPERATIONS)
+
+    # 1)
+    game.start_game(instruction_set)
+    assert set(game.scoreboard.values()) == {0}
+    assert not game.is_over()
+    # 2)
+    instruction_set.fold(game.roster[0], game.dealer, game.deck, None)
+    while not game.is_over():
+        game.next_hand(instruction_set)
+    assert game.hand_index == 3 # pre-flop, flop, turn, river
+    assert game.is_over() and game.deck.board_count == BOARD_CARD_COUNT
+    board_ids = game.deck.encoding.encode(card for card, present in game.deck.board.items() if present)
+    for player in game.roster[1:]:
+        assert game.scoreboard[player] == evaluate_best(player.hand.card_ids() + board_ids)
+    # 3)
+    assert game.scoreboard[game.roster[0]] == 0
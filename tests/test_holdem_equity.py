@@ -0,0 +1,113 @@
+from playingcardsplus.card import Card, Rank, Suit
+from playingcardsplus.custom_error import DuplicateCardError
+from playingcardsplus.MultiplayerGames.games.texas_holdem import HOLE_CARD_COUNT, BOARD_CARD_COUNT
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from playingcardsplus.MultiplayerGames.games.holdem_equity import holdem_equity
+
+
+def card(name: str) -> Card:
+    ranks = {"T": Rank.TEN, "J": Rank.JACK, "Q": Rank.QUEEN, "K": Rank.KING, "A": Rank.ACE}
+    suits = {"c": Suit.CLUBS, "d": Suit.DIAMONDS, "h": Suit.HEARTS, "s": Suit.SPADES}
+    rank = ranks[name[0]] if name[0] in ranks else Rank(name[0])
+    return Card(rank=rank.value, suit=suits[name[1]].value)
+
+
+def cards(*names: str):
+    return [card(name) for name in names]
+
+
+def test_hand_shape_from_rules():
+    assert (HOLE_CARD_COUNT, BOARD_CARD_COUNT) == (2, 5)
+
+
+def test_preflop_equity():
+    """
+    1) AA is about an 82% favourite against KK
+    2) Win + tie shares & equities add up
+    3) Same seed gives the same result
+    """
+    result = holdem_equity([cards("Ac", "Ad"), cards("Kh", "Ks")], max_samples=20_000, batch_size=5_000, seed=1)
+    # 1)
+    assert result.samples == 20_000
+    assert result.equity[0] == pytest.approx(0.82, abs=0.02)
+    # 2)
+    assert sum(result.equity) == pytest.approx(1.0)
+    assert result.win[0] + result.win[1] + result.tie[0] == pytest.approx(1.0)
+    assert result.tie[0] == result.tie[1]
+    # 3)
+    assert holdem_equity([cards("Ac", "Ad"), cards("Kh", "Ks")], max_samples=20_000, batch_size=5_000, seed=1) == result
+
+
+@pytest.mark.parametrize("board, equity", [
+    (cards("2c", "7d", "9h", "Js", "3d"), (1.0, 0.0)), # pair of aces holds
+    (cards("Kc", "7d", "9h", "Js", "2d"), (0.0, 1.0)), # set of kings
+    (cards("Tc", "Jd", "Qh", "Kc", "Ad"), (0.5, 0.5)), # straight on the board
+])
+def test_complete_board_is_exact(board, equity):
+    """
+    1) The only possible deal is the empty one
+    2) Sampling it gets the same answer with no uncertainty - the first batch is enough
+    """
+    hole_cards = [cards("Ac", "Ah"), cards("Kh", "Ks")]
+    # 1)
+    result = holdem_equity(hole_cards, board=board)
+    assert result.exact and result.samples == 1
+    assert result.equity == equity
+    # 2)
+    result = holdem_equity(hole_cards, board=board, max_samples=1_000, batch_size=100, target_ci=0.01, exact=False)
+    assert not result.exact
+    assert result.equity == equity
+    assert result.ci_half_width == 0.0
+    assert result.samples == 100
+
+
+def test_exact_equity():
+    """
+    1) On the turn there are few enough rivers to try them all
+    2) Exact AA vs KK preflop - suit isomorphism keeps it quick
+    3) Sampling lands close to the exact answer
+    """
+    # 1)
+    result = holdem_equity([cards("Ac", "Ad"), None], board=cards("2c", "7d", "9h", "Kd"))
+    assert result.exact and result.ci_half_width == 0.0
+    assert result.samples == 1035 * 44 # opponent's 2 out of 46, then the river
+    # 2)
+    exact = holdem_equity([cards("Ac", "Ad"), cards("Kh", "Ks")], exact=True)
+    assert exact.samples == 1_712_304
+    assert exact.equity[0] == pytest.approx(0.8126, abs=1e-4)
+    assert exact.win[0] + exact.win[1] + exact.tie[0] == pytest.approx(1.0)
+    # 3)
+    sampled = holdem_equity([cards("Ac", "Ad"), cards("Kh", "Ks")], max_samples=40_000, seed=2)
+    assert not sampled.exact
+    assert abs(sampled.equity[0] - exact.equity[0]) <= sampled.ci_half_width * 2
+
+
+def test_unknown_opponents_and_early_stopping():
+    """
+    1) Unknown hole cards get dealt too - AA beats a random hand about 85% of the time
+    2) Stops once the confidence interval is narrow enough
+    """
+    result = holdem_equity([cards("Ac", "Ad"), None], max_samples=200_000, batch_size=2_000, target_ci=0.01, seed=3)
+    assert result.equity[0] == pytest.approx(0.85, abs=0.02)
+    assert result.ci_half_width <= 0.01
+    assert result.samples < 200_000
+
+
+def test_invalid_inputs():
+    with pytest.raises(DuplicateCardError):
+        holdem_equity([cards("Ac", "Ad"), cards("Ac", "Ks")])
+    with pytest.raises(DuplicateCardError):
+        holdem_equity([cards("Ac", "Ad"), None], dead=cards("Ad"))
+    with pytest.raises(ValueError):
+        holdem_equity([cards("Ac", "Ad")])
+    with pytest.raises(ValueError):
+        holdem_equity([cards("Ac"), None])
+
+
+def test_process_pool_matches_serial():
+    kwargs = dict(hole_cards=[cards("Ac", "Kc"), cards("Qh", "Qs"), None], board=cards("2c", "7c", "Qd"), max_samples=6_000, batch_size=1_000, seed=7)
+    assert holdem_equity(worker_count=2, **kwargs) == holdem_equity(**kwargs)
@@ -0,0 +1,62 @@
+from playingcardsplus.MultiplayerGames.inference import InferenceBroker
+from playingcardsplus.MultiplayerGames.simulator import play_game
+
+from playingcardsplus.MultiplayerGames.games.dynamite import make_dynamite_game, make_dynamite_instruction_set, dynamite_policy
+
+import pytest
+
+
+def batched_dynamite_policy(requests):
+    """Same decisions as each player's own behavior - just made a batch at a time"""
+    return [dynamite_policy((request.current_game_state, request.player.hand, request.historical_states, request.cheating_states)) for request in requests]
+
+
+@pytest.mark.parametrize("max_batch_size, max_in_flight", [(1, None), (4, 2), (16, None)])
+def test_broker_matches_sequential_play(max_batch_size, max_in_flight):
+    """
+    1) Every game comes back once with the same records as playing it on its own
+    2) Decisions were actually batched across games
+    """
+    game_count, max_hands = 6, 8
+    instruction_set = make_dynamite_instruction_set()
+    broker = InferenceBroker(policy=batched_dynamite_policy, max_batch_size=max_batch_size, max_in_flight=max_in_flight)
+    results = list(broker.run((make_dynamite_game(seed=seed) for seed in range(game_count)), instruction_set, max_hands=max_hands))
+
+    # 1) Same records
+    assert sorted(result.game_index for result in results) == list(range(game_count))
+    for result in results:
+        assert result.seed == result.game_index
+        expected = play_game(make_dynamite_game(seed=result.seed), instruction_set, max_hands=max_hands)
+        assert [record.model_dump() for record in result.records] == [record.model_dump() for record in expected]
+
+    # 2) Batching
+    report = broker.report
+    assert report.game_count == game_count
+    assert report.request_count == sum(len(result.records) for result in results) * 3
+    assert report.mean_batch_size <= max_batch_size
+    if max_batch_size > 1:
+        assert report.mean_batch_size > 1
+
+
+def test_observation_policy_calls_model_once_per_batch():
+    """The model gets one (batch, ...) observation per broker batch & each row decodes to one player's actions"""
+    np = pytest.importorskip("numpy")
+    from playingcardsplus.MultiplayerGames.inference import ObservationPolicy
+    from playingcardsplus.MultiplayerGames.observation import ObservationEncoder
+    from playingcardsplus.MultiplayerGames.instructions import Instruction
+
+    batch_sizes = []
+    def model(observation):
+        batch_sizes.append(observation.planes.shape[0])
+        return observation.scalars[:, 0] # how much is left in unused
+
+    def decode(unused_share, request):
+        return [(Instruction(operation="draw"), None)] if unused_share * 52 >= request.current_game_state.player_count else []
+
+    broker = InferenceBroker(policy=ObservationPolicy(ObservationEncoder(), model, decode), max_batch_size=8)
+    results = list(broker.run((make_dynamite_game(seed=seed) for seed in range(4)), make_dynamite_instruction_set(), max_hands=5))
+
+    assert len(results) == 4
+    assert len(batch_sizes) == broker.report.batch_count
+    assert sum(batch_sizes) == broker.report.request_count
+    assert max(batch_sizes) == 4 # one decision per game waiting at a time
@@ -0,0 +1,85 @@
+from playingcardsplus.MultiplayerGames.instructions import Instruction, InstructionSet, InstructionSetImplementer, compile_instruction_set
+from playingcardsplus.MultiplayerGames.simulator import play_game
+from playingcardsplus.custom_error import UnknownInstructionError
+
+from playingcardsplus.MultiplayerGames.games.dynamite import make_dynamite_game, make_dynamite_instruction_set, dynamite_policy, DYNAMITE_OPERATIONS
+
+import copy
+import pickle
+
+import pytest
+
+
+class FooImplementer(InstructionSetImplementer):
+    def foo(self, player, dealer, deck, aux):
+        return "foo!"
+
+
+def test_compile_instruction_set():
+    """
+    Test for the following
+    1) Opcodes follow sorted operation names & handlers are the implementer's bound methods
+    2) Operations the implementer doesn't have fail at compile time
+    3) Unknown instructions, out of range opcodes & booleans are rejected
+    """
+    # 1) Compiles
+    implementer = make_dynamite_instruction_set()
+    compiled = implementer.compile()
+    assert compiled.operations == ("claim", "draw", "eliminate", "throw")
+    assert compiled.opcode(Instruction(operation="draw")) == compiled.opcode("draw") == compiled.opcode(1) == 1
+    assert compiled.handlers[compiled.opcodes["eliminate"]] == implementer.eliminate
+
+    # 2) Missing implementation
+    with pytest.raises(UnknownInstructionError):
+        compile_instruction_set(InstructionSet({Instruction(operation="foo"), Instruction(operation="bar")}), FooImplementer(None))
+
+    # 3) Unknown at dispatch time
+    with pytest.raises(UnknownInstructionError):
+        compiled.opcode(Instruction(operation="foo"))
+    for opcode in (-1, True, False):
+        with pytest.raises(UnknownInstructionError):
+            compiled.opcode(opcode)
+
+
+def test_compiled_instruction_set_is_read_only():
+    """
+    Test for the following
+    1) The dispatch table can't be changed
+    2) Copies & pickles still work - deep copies share the table, pickles rebuild it
+    """
+    compiled = make_dynamite_instruction_set().compile()
+
+    # 1) Read-only
+    with pytest.raises(TypeError):
+        compiled.opcodes["draw"] = 0
+
+    # 2) Copy & pickle
+    assert copy.deepcopy(compiled) is compiled
+    unpickled = pickle.loads(pickle.dumps(compiled))
+    assert unpickled.operations == compiled.operations and dict(unpickled.opcodes) == dict(compiled.opcodes)
+    with pytest.raises(TypeError):
+        unpickled.opcodes["draw"] = 0
+
+
+def test_game_accepts_opcodes():
+    """Players handing in opcodes play the exact same game as ones handing in Instructions"""
+    implementer = make_dynamite_instruction_set()
+    opcodes = implementer.compile(DYNAMITE_OPERATIONS).opcodes
+
+    def opcode_policy(arg):
+        return [(opcodes[instruction.operation], aux) for (instruction, aux) in dynamite_policy(arg)]
+
+    by_instruction = play_game(make_dynamite_game(seed=4), implementer, max_hands=6)
+    game = make_dynamite_game(seed=4)
+    for player in game.roster:
+        player.behavior.soul["model"] = opcode_policy
+    by_opcode = play_game(game, implementer, max_hands=6)
+    assert [record.model_dump() for record in by_opcode] == [record.model_dump() for record in by_instruction]
+
+
+def test_game_rejects_unknown_instruction():
+    game = make_dynamite_game(seed=4)
+    for player in game.roster:
+        player.behavior.soul["model"] = lambda arg: [(Instruction(operation="cheat"), None)]
+    with pytest.raises(UnknownInstructionError):
+        game.start_game(make_dynamite_instruction_set())
@@ -0,0 +1,92 @@
+from playingcardsplus.MultiplayerGames.data import CheatingState
+from playingcardsplus.MultiplayerGames.hand import CardCountHand
+from playingcardsplus.card import JokerCard
+from playingcardsplus.MultiplayerGames.simulator import play_game
+
+from playingcardsplus.MultiplayerGames.games.dynamite import make_dynamite_game, make_dynamite_instruction_set
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from playingcardsplus.MultiplayerGames.observation import ObservationEncoder, ObservationInput
+
+
+def test_observation_encoding():
+    """
+    Test for the following
+    1) Hand plane holds the player's cards & scalars follow the game state
+    2) A plain dict hand encodes the same as the Player's CardCountHand
+    3) Cheating planes show unused (top = 1), trash pile & only the other players' hands
+    """
+    game = make_dynamite_game(seed=5)
+    play_game(game, make_dynamite_instruction_set(), max_hands=3)
+    game_state = game.game_state()
+    player = game.roster[0]
+    encoder = ObservationEncoder(deck_type=game.deck.type, joker_count=game.deck.joker_count)
+
+    # 1) Plain observation
+    observation = encoder.encode(game_state, player.hand)
+    assert observation.planes.shape == encoder.spec.plane_shape
+    assert observation.planes[0].sum() == player.hand.size
+    assert set(np.flatnonzero(observation.planes[0])) == set(player.hand.card_ids())
+    assert observation.scalars[0] == pytest.approx(game_state.unused_count / 52)
+
+    # 2) Any mapping works
+    assert np.array_equal(encoder.encode(game_state, dict(player.hand)).planes, encoder.encode(game_state, player.hand).planes)
+
+    # 3) Cheating
+    cheating_encoder = ObservationEncoder(include_cheating=True)
+    cheating_state = CheatingState(
+        unused=list(game.deck.unused),
+        trash_pile=list(game.deck.trash_pile),
+        player_hands={other.name: list(other.hand) for other in game.roster},
+    )
+    planes = cheating_encoder.encode(game_state, player.hand, cheating_state=cheating_state, player_name=player.name).planes
+    encoding = game.deck.encoding
+    assert planes[2, encoding.card_to_id[game.deck.unused[-1]]] == 1
+    assert np.count_nonzero(planes[2]) == len(game.deck.unused)
+    assert np.count_nonzero(planes[3]) == len(game.deck.trash_pile)
+    assert np.count_nonzero(planes[4]) == sum(other.hand.size for other in game.roster[1:])
+    assert not np.any(planes[4] * planes[0])
+
+
+def test_observation_rejects_unknown_jokers():
+    """A hand holding more jokers than the encoder was built for raises ValueError - whether it's a CardCountHand or a dict"""
+    game = make_dynamite_game(seed=5)
+    hand = CardCountHand()
+    hand.add(JokerCard(color="black", number=2))
+    encoder = ObservationEncoder()
+    for each in (hand, dict(hand)):
+        with pytest.raises(ValueError):
+            encoder.encode(game.game_state(), each)
+    assert ObservationEncoder(joker_count=2).encode(game.game_state(), hand).planes[0].sum() == 1
+
+
+def test_observation_batch_buffers():
+    """
+    1) Row i of a batch is the same as encoding item i alone
+    2) Batches reuse the encoder's buffer unless `out` is given
+    """
+    games = [make_dynamite_game(seed=seed) for seed in range(4)]
+    instruction_set = make_dynamite_instruction_set()
+    for game in games:
+        game.start_game(instruction_set)
+    items = [ObservationInput(game.game_state(), player.hand) for game in games for player in game.roster]
+    encoder = ObservationEncoder()
+
+    # 1) Same as one at a time
+    batch = encoder.encode_batch(items)
+    assert batch.planes.shape == (len(items),) + encoder.spec.plane_shape
+    assert encoder.flatten(batch).shape == (len(items), encoder.spec.flat_size)
+    for index, item in enumerate(items):
+        single = ObservationEncoder().encode(item.game_state, item.hand)
+        assert np.array_equal(batch.planes[index], single.planes)
+        assert np.array_equal(batch.scalars[index], single.scalars)
+
+    # 2) Buffers
+    assert np.shares_memory(encoder.encode_batch(items[:2]).planes, batch.planes)
+    out = encoder.allocate(len(items))
+    assert not np.shares_memory(encoder.encode_batch(items, out=out).planes, batch.planes)
+    with pytest.raises(ValueError):
+        encoder.encode_batch(items, out=encoder.allocate(1))
@@ -0,0 +1,54 @@
+from playingcardsplus.MultiplayerGames.games.poker_hands import HandCategory, evaluate_five, evaluate_best, score_category
+
+import random
+import pytest
+
+
+def ids(*cards: str):
+    """'As' -> card ID, rank index * 4 + suit index with suits in ♣ ♦ ♥ ♠ order"""
+    ranks, suits = "23456789TJQKA", "cdhs"
+    return [ranks.index(card[0]) * 4 + suits.index(card[1]) for card in cards]
+
+
+@pytest.mark.parametrize("cards, category", [
+    (ids("As", "Ks", "Qs", "Js", "Ts"), HandCategory.STRAIGHT_FLUSH),
+    (ids("9c", "9d", "9h", "9s", "2c"), HandCategory.FOUR_OF_A_KIND),
+    (ids("3c", "3d", "3h", "8s", "8c"), HandCategory.FULL_HOUSE),
+    (ids("2h", "7h", "9h", "Jh", "Kh"), HandCategory.FLUSH),
+    (ids("Ac", "2d", "3h", "4s", "5c"), HandCategory.STRAIGHT),
+    (ids("Qc", "Qd", "Qh", "4s", "5c"), HandCategory.THREE_OF_A_KIND),
+    (ids("Qc", "Qd", "4h", "4s", "5c"), HandCategory.TWO_PAIR),
+    (ids("Qc", "Qd", "4h", "7s", "5c"), HandCategory.PAIR),
+    (ids("Qc", "2d", "4h", "7s", "5c"), HandCategory.HIGH_CARD),
+])
+def test_hand_categories(cards, category):
+    assert score_category(evaluate_five(cards)) == category
+
+
+def test_hand_ordering():
+    """
+    1) The wheel is the lowest straight
+    2) Kickers break ties & suits don't
+    3) Best of 7 picks the best 5
+    """
+    # 1)
+    assert evaluate_five(ids("Ac", "2d", "3h", "4s", "5c")) < evaluate_five(ids("2c", "3d", "4h", "5s", "6c"))
+    # 2)
+    assert evaluate_five(ids("Ac", "Ad", "Kh", "7s", "5c")) > evaluate_five(ids("Ah", "As", "Qh", "7s", "5c"))
+    assert evaluate_five(ids("Ac", "Ad", "Kh", "7s", "5c")) == evaluate_five(ids("Ah", "As", "Kc", "7d", "5h"))
+    # 3)
+    assert score_category(evaluate_best(ids("2c", "7d", "Ah", "Kh", "Qh", "Jh", "Th"))) == HandCategory.STRAIGHT_FLUSH
+
+
+def test_batch_matches_reference():
+    """Vectorized 7 card scores are the same as trying every 5 card combination"""
+    np = pytest.importorskip("numpy")
+    from playingcardsplus.MultiplayerGames.games.poker_hands import evaluate_seven_batch
+
+    rng = random.Random(0)
+    hands = [rng.sample(range(52), 7) for _ in range(2000)]
+    # Make sure the rarer categories show up
+    hands += [ids("As", "Ks", "Qs", "Js", "Ts", "9s", "2c"), ids("9c", "9d", "9h", "9s", "Kc", "Kd", "Kh"),
+              ids("3c", "3d", "3h", "8s", "8c", "8d", "2c"), ids("Ac", "2c", "3c", "4c", "5c", "Kd", "Kh")]
+    scores = evaluate_seven_batch(np.asarray(hands))
+    assert list(scores) == [evaluate_best(hand) for hand in hands]
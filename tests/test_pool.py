@@ -0,0 +1,85 @@
+from playingcardsplus.MultiplayerGames.pool import GamePool
+from playingcardsplus.MultiplayerGames.simulator import play_game
+from playingcardsplus.MultiplayerGames.data_stream import CollectibleDataReader
+
+from playingcardsplus.MultiplayerGames.games.dynamite import make_dynamite_game, make_dynamite_instruction_set
+
+import pytest
+
+
+@pytest.mark.parametrize("lazy_shuffle", [False, True])
+def test_reset_game_plays_like_a_fresh_one(lazy_shuffle):
+    """
+    Test for the following
+    1) A played game reset to a seed is in the same state as a game built from that seed
+    2) It plays out the same & keeps its deck, dealer & players
+    """
+    instruction_set = make_dynamite_instruction_set()
+    game = make_dynamite_game(seed=4, lazy_shuffle=lazy_shuffle, history_depth=2)
+    play_game(game, instruction_set, max_hands=12)
+    deck, dealer, roster = game.deck, game.dealer, list(game.roster)
+
+    # 1) Same state
+    game.reset(seed=9)
+    fresh = make_dynamite_game(seed=9, lazy_shuffle=lazy_shuffle, history_depth=2)
+    assert game.snapshot() == fresh.snapshot()
+    assert game.hand_index == 0 and len(game.history) == 0
+
+    # 2) Same game, same objects
+    records = play_game(game, instruction_set, max_hands=12)
+    assert [record.model_dump() for record in records] == [record.model_dump() for record in play_game(fresh, instruction_set, max_hands=12)]
+    assert game.deck is deck and game.dealer is dealer and all(a is b for a, b in zip(game.roster, roster))
+
+
+def test_game_pool():
+    """
+    Test for the following
+    1) Games are only built when there's no idle game for the key
+    2) Keys are kept apart & max_idle caps what's kept
+    """
+    pool = GamePool(max_idle=1)
+
+    # 1) Build once, then reuse
+    game = pool.acquire("dynamite", 1, make_dynamite_game)
+    pool.release("dynamite", game)
+    assert pool.acquire("dynamite", 2, make_dynamite_game) is game
+    assert game.seed == 2
+    assert (pool.built_count, pool.reused_count) == (1, 1)
+
+    # 2) Other keys build their own
+    other = pool.acquire("dynamite_4", 3, lambda seed: make_dynamite_game(seed, player_count=4))
+    assert other is not game and len(other.roster) == 4
+    pool.release("dynamite", game)
+    pool.release("dynamite", make_dynamite_game(seed=5))
+    assert pool.idle_count("dynamite") == 1 and pool.idle_count() == 1
+    pool.clear()
+    assert pool.idle_count() == 0
+
+
+def test_reset_game_data_path(tmp_path):
+    """
+    Test for the following
+    1) Without a new path, the next game appends to the same file & its hand indices start over
+    2) With one, the next game goes to the new file
+    """
+    instruction_set = make_dynamite_instruction_set()
+    first_path, second_path = tmp_path / "first.pcpd", tmp_path / "second.pcpd"
+    game = make_dynamite_game(seed=1)
+    game.game_data_path = str(first_path)
+    game.stream_data = True
+
+    # 1) Same file
+    first = play_game(game, instruction_set, max_hands=3)
+    game.reset(seed=2)
+    second = play_game(game, instruction_set, max_hands=3)
+    game.close_data_stream()
+    with CollectibleDataReader(str(first_path)) as reader:
+        assert [record.hand_index for record in reader] == list(range(len(first))) + list(range(len(second)))
+
+    # 2) New file
+    game.reset(seed=3, game_data_path=str(second_path))
+    third = play_game(game, instruction_set, max_hands=3)
+    game.close_data_stream()
+    assert game.game_data_path == str(second_path)
+    with CollectibleDataReader(str(second_path)) as reader:
+        assert [record.hand_index for record in reader] == list(range(len(third)))
@@ -0,0 +1,40 @@
+from playingcardsplus.MultiplayerGames.deck import MultiPlayerDeck
+from playingcardsplus.rng import derive_seed, make_rng, spawn_seeds
+
+import random
+import pytest
+
+
+def test_seeded_decks_are_reproducible():
+    """
+    Test for the following
+    1) Same seed, same shuffle - and the module-level random state is left alone
+    2) Different seeds, different shuffles
+    """
+    random.seed(0)
+    global_state = random.getstate()
+
+    # 1) Same seed
+    deck_a = MultiPlayerDeck(name="French_Multi_Player_Deck_A", joker_count=0, rng=make_rng(derive_seed(42, 0)))
+    deck_b = MultiPlayerDeck(name="French_Multi_Player_Deck_B", joker_count=0, rng=make_rng(derive_seed(42, 0)))
+    assert list(deck_a.unused) == list(deck_b.unused)
+    assert random.getstate() == global_state
+
+    # 2) Different seeds
+    deck_c = MultiPlayerDeck(name="French_Multi_Player_Deck_C", joker_count=0, rng=make_rng(derive_seed(42, 1)))
+    assert list(deck_a.unused) != list(deck_c.unused)
+
+
+def test_numpy_generator_as_rng():
+    np = pytest.importorskip("numpy")
+    deck_a = MultiPlayerDeck(name="French_Multi_Player_Deck_A", joker_count=2, rng=np.random.Generator(np.random.Philox(7)))
+    deck_b = MultiPlayerDeck(name="French_Multi_Player_Deck_B", joker_count=2, rng=np.random.Generator(np.random.Philox(7)))
+    assert list(deck_a.unused) == list(deck_b.unused)
+    assert sorted(deck_a.unused, key=str) == sorted(deck_a.cards, key=str)
+
+
+def test_spawned_seeds_are_independent():
+    seeds = spawn_seeds(2024, 64)
+    assert len(set(seeds)) == 64
+    assert seeds == spawn_seeds(2024, 64)
+    assert derive_seed(2024, 3, 0) != derive_seed(2024, 3, 1)
@@ -13,11 +13,11 @@ It could be done I think we can get away by constraining some x and y values and
 """
 
 
-from playingcardsplus.MultiplayerGames.rules import Rules
+from playingcardsplus.MultiplayerGames.rules import Rules, RuleViolation, RuleViolationKind
 from playingcardsplus.MultiplayerGames.instructions import InstructionSet, Instruction
 from playingcardsplus.MultiplayerGames.deck import Distributee
 from playingcardsplus.dealer import CardDistributionMethod
-from playingcardsplus.custom_error import RuleIllFormedError, PlayerRangeError, CardDistributionError
+from playingcardsplus.custom_error import RuleIllFormedError, PlayerRangeError, CardDistributionError, RuleViolationError
 
 from typing_extensions import Tuple, Dict, List
 from pydantic import ValidationError
@@ -270,3 +270,93 @@ params_border.extend(params_almost_valid)
 def test_borderline_rules(kwargs, expected_exception):
     with expected_exception:
         Rules(**kwargs)
+
+
+@pytest.mark.parametrize("kwargs", params_valid)
+def test_deal_plan_memoized(kwargs):
+    """
+    1) Compile plans for every early hand & a few hands past them
+    2) Same (player count, hand) -> the very same plan object, every steady state hand shares one plan
+    3) Every plan draws exactly the cards its segments hand out and player ops cover the player segment
+    """
+    rules = Rules(**kwargs)
+    early_hands = len(rules.cards_per_player_early_hands)
+    per_player = [cards for cards in (*rules.cards_per_player_early_hands, rules.cards_per_player_hand_i) if isinstance(cards, dict)]
+    for player_count in range(rules.player_range[0], rules.player_range[1] + 1):
+        if any(player_count not in cards for cards in per_player):
+            # Per player counts that don't cover this many players - nothing to deal them
+            with pytest.raises(RuleViolationError):
+                rules.deal_plan(player_count=player_count, hand_index=0)
+            continue
+        plans = [rules.deal_plan(player_count=player_count, hand_index=hand_index) for hand_index in range(early_hands + 3)]
+        for hand_index, plan in enumerate(plans):
+            assert rules.deal_plan(player_count=player_count, hand_index=hand_index) is plan
+            assert plan.total == sum(segment.length for segment in plan.segments)
+            player_segment = [segment for segment in plan.segments if segment.destination == Distributee.PLAYER][0]
+            dealt = sorted(index for op in plan.player_ops for index in range(op.start, op.stop, op.stride))
+            assert dealt == list(range(player_segment.start, player_segment.start + player_segment.length))
+        assert all(plan is plans[early_hands] for plan in plans[early_hands:])
+
+
+def test_deal_plan_player_out_of_range():
+    rules = Rules(**params_valid[0])
+    with pytest.raises(RuleViolationError):
+        rules.deal_plan(player_count=rules.player_range[1] + 1, hand_index=0)
+
+
+def test_computed_fields_cached():
+    """
+    1) Card counts come back the same every time, model_dump included - as copies, so editing them doesn't touch the cache
+    2) model_copy with an update works them out again from the new values
+    """
+    rules = Rules(**params_valid[0])
+    # 1)
+    early_hands, hand_i = rules.total_cards_distributed_early_hands, rules.total_cards_distributed_hand_i
+    assert rules.total_cards_distributed_early_hands == early_hands
+    assert rules.total_cards_distributed_hand_i is not hand_i
+    hand_i.clear()
+    early_hands.clear()
+    early_hands, hand_i = rules.total_cards_distributed_early_hands, rules.total_cards_distributed_hand_i
+    assert early_hands and hand_i
+    dumped = rules.model_dump()
+    assert dumped["total_cards_distributed_early_hands"] == early_hands
+    assert dumped["total_cards_distributed_hand_i"] == hand_i
+    # 2)
+    copied = rules.model_copy(update={"board_distribution_hand_i": rules.board_distribution_hand_i + 1})
+    assert copied.total_cards_distributed_hand_i == {player_count: cards + 1 for player_count, cards in hand_i.items()}
+    assert rules.total_cards_distributed_hand_i == hand_i
+
+
+# Everything validate_many covers - pydantic's own type checks aren't part of it
+params_validate_many = [(kwargs, does_not_raise()) for kwargs in params_valid] + params_invalid_card_distribution + params_border + [
+    params_invalid_player_range[3], params_invalid[-1]
+] + params_invalid_distribution_method_and_ordering
+
+
+def test_validate_many_matches_construction():
+    """
+    1) A variant has no violations exactly when Rules(**params) builds
+    2) Violations say what went wrong without raising
+    """
+    # 1)
+    violations = Rules.validate_many(kwargs for kwargs, _ in params_validate_many)
+    assert len(violations) == len(params_validate_many)
+    for (kwargs, expected_exception), found in zip(params_validate_many, violations):
+        try:
+            Rules(**kwargs)
+            built = True
+        except (ValidationError, RuleIllFormedError, PlayerRangeError, CardDistributionError):
+            built = False
+        assert built == (found == ())
+
+    # 2)
+    kinds = lambda params: {violation.kind for violation in Rules.validate_many([params])[0]}
+    assert kinds(params_invalid_player_range[3][0]) == {RuleViolationKind.PLAYER_RANGE}
+    assert kinds(params_invalid[-1][0]) == {RuleViolationKind.EARLY_HANDS_LENGTH}
+    assert kinds(params_almost_valid[0][0]) == {RuleViolationKind.HAND_I_CARDS}
+    assert kinds(params_invalid_card_distribution[1][0]) >= {RuleViolationKind.EARLY_HAND_CARDS}
+    early, = [violation for violation in Rules.validate_many([params_invalid_card_distribution[1][0]])[0] if violation.kind == RuleViolationKind.EARLY_HAND_CARDS]
+    assert (early.hand, early.player_count, early.shortfall) == (0, 5, 5 + 100 + 1 - 52)
+    assert kinds({"deck_size": 52}) == {RuleViolationKind.MISSING_FIELD}
+    malformed = dict(params_valid[0], cards_per_player_hand_i="five")
+    assert Rules.validate_many([malformed])[0] == (RuleViolation(RuleViolationKind.MALFORMED, field="cards_per_player_hand_i"),)
@@ -0,0 +1,133 @@
+import pickle
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from playingcardsplus.MultiplayerGames.shared_state import (
+    ArenaLayout, ArenaStatus, SharedGameArena, read_snapshot, run_into_arena, write_row,
+)
+from playingcardsplus.MultiplayerGames.simulator import play_game
+from playingcardsplus.rng import derive_seed
+
+from playingcardsplus.MultiplayerGames.games.dynamite import make_dynamite_game, make_dynamite_instruction_set
+
+
+def test_layout_fits_game():
+    """Every pile can hold the whole deck, one hands & scores row per player"""
+    layout = ArenaLayout.for_game(make_dynamite_game(seed=1, player_count=4))
+    assert layout == ArenaLayout(card_count=52, player_count=4)
+    assert layout.dtype["unused"].shape == (52,)
+    assert layout.dtype["unused"].base == np.uint8
+    assert layout.dtype["hands"].shape == (4, 52)
+    assert layout.dtype["board_mask"].shape == (7,)
+
+
+@pytest.mark.parametrize("hands_played", [0, 5, 40])
+def test_row_round_trip(hands_played):
+    """
+    Test for the following
+    1) A row restores into another game as the exact same state - stakes & folds included
+    2) Masks match the pile card IDs
+    3) Status & hand count are stored
+    """
+    game = make_dynamite_game(seed=7)
+    if hands_played:
+        play_game(game, make_dynamite_instruction_set(), max_hands=hands_played)
+    game.roster[0]._add_stake(25)
+    game.roster[1]._fold()
+    with SharedGameArena.create(ArenaLayout.for_game(game), row_count=3) as arena, arena.view() as rows:
+        row = rows[1]
+        write_row(row, game, status=ArenaStatus.HAND_LIMIT, hand_count=hands_played)
+
+        # 1) Round trip
+        restored = make_dynamite_game(seed=99)
+        restored.restore(read_snapshot(row, game.deck.encoding))
+        assert restored.snapshot() == game.snapshot()
+
+        # 2) Masks
+        encoding = game.deck.encoding
+        for pile in ("board", "player_hands"):
+            bits = np.unpackbits(row[pile + "_mask"], bitorder="little")[:encoding.size]
+            assert set(np.flatnonzero(bits).tolist()) == set(encoding.encode(getattr(game.deck, pile)))
+
+        # 3) Status, untouched rows stay empty
+        assert rows["status"].tolist() == [ArenaStatus.EMPTY, ArenaStatus.HAND_LIMIT, ArenaStatus.EMPTY]
+        assert int(row["hand_count"]) == hands_played
+
+
+@pytest.mark.parametrize("worker_count, chunk_size", [(0, None), (2, 3)])
+def test_run_into_arena_matches_play_game(worker_count, chunk_size):
+    """
+    Test for the following
+    1) Row i holds game i played from derive_seed(root_seed, i), whatever the worker count
+    2) Every row got written & the report adds up
+    """
+    implementer = make_dynamite_instruction_set()
+    layout = ArenaLayout.for_game(make_dynamite_game(seed=0))
+    with SharedGameArena.create(layout, row_count=8) as arena:
+        report = run_into_arena(arena, make_dynamite_game, implementer, worker_count=worker_count, chunk_size=chunk_size, root_seed=3, max_hands=20)
+
+        rows = arena.copy_rows()
+
+    # 1) Same as playing them here
+    hand_count = 0
+    for row_index in range(8):
+        game = make_dynamite_game(derive_seed(3, row_index))
+        records = play_game(game, implementer, max_hands=20)
+        hand_count += len(records)
+        assert read_snapshot(rows[row_index], game.deck.encoding) == game.snapshot()
+        assert int(rows["hand_count"][row_index]) == len(records)
+
+    # 2) Rows & report
+    assert set(rows["status"].tolist()) <= {ArenaStatus.FINISHED, ArenaStatus.HAND_LIMIT}
+    assert report.game_count == 8
+    assert report.hand_count == hand_count
+
+
+def test_arena_lifecycle():
+    """
+    Test for the following
+    1) The arena itself can't be pickled
+    2) Attaching by name sees the same memory
+    3) Closing refuses while a view() is open
+    4) A with block's own error isn't hidden by that refusal
+    5) Closing the owner frees the block - copied rows outlive it
+    """
+    arena = SharedGameArena.create(ArenaLayout(card_count=52, player_count=2), row_count=2)
+    name = arena.name
+
+    # 1) Pickling
+    with pytest.raises(TypeError):
+        pickle.dumps(arena)
+
+    # 2) Attach
+    with SharedGameArena.attach(name, arena.layout, arena.row_count) as attached, attached.view() as rows:
+        rows["scores"][1] = (4, 5)
+    assert arena.copy_rows()["scores"][1].tolist() == [4, 5]
+
+    # 3) Open view
+    with arena.view() as rows:
+        with pytest.raises(BufferError):
+            arena.close()
+        assert rows["scores"][1].tolist() == [4, 5]
+
+    # 4) Error inside the with block
+    other = SharedGameArena.create(arena.layout, row_count=1)
+    open_view = other.view()
+    open_view.__enter__()
+    with pytest.raises(KeyError):
+        with other:
+            raise KeyError("from the with block")
+    open_view.__exit__(None, None, None)
+    other.close()
+
+    # 5) Close
+    kept = arena.copy_rows()
+    arena.close()
+    assert kept["scores"][1].tolist() == [4, 5]
+    with pytest.raises(ValueError):
+        with arena.view():
+            pass
+    with pytest.raises(FileNotFoundError):
+        SharedGameArena.attach(name, arena.layout, arena.row_count)
@@ -0,0 +1,60 @@
+from playingcardsplus.MultiplayerGames.simulator import Simulator, play_game
+from playingcardsplus.rng import make_rng
+
+from playingcardsplus.MultiplayerGames.games.dynamite import make_dynamite_game, make_dynamite_instruction_set
+
+import pytest
+
+
+def test_play_game_is_reproducible():
+    """Same seed, same game - hand by hand"""
+    records_a = play_game(make_dynamite_game(seed=11), make_dynamite_instruction_set(), max_hands=30)
+    records_b = play_game(make_dynamite_game(seed=11), make_dynamite_instruction_set(), max_hands=30)
+    assert records_a == records_b
+    assert 1 <= len(records_a) <= 30
+
+
+@pytest.mark.parametrize("worker_count, chunk_size, reuse_games", [(0, None, False), (2, 3, False), (0, None, True), (2, 3, True)])
+def test_simulator_runs_every_game(worker_count, chunk_size, reuse_games):
+    """
+    Test for the following
+    1) Every game comes back once, each built from its own seed
+    2) Results don't depend on the worker count or on games being reused
+    3) Throughput gets reported
+    """
+    simulator = Simulator(
+        game_factory=make_dynamite_game,
+        instruction_implementer=make_dynamite_instruction_set(),
+        game_count=8,
+        worker_count=worker_count,
+        chunk_size=chunk_size,
+        root_seed=3,
+        max_hands=20,
+        reuse_games=reuse_games,
+    )
+    results = sorted(simulator.run(), key=lambda result: result.game_index)
+
+    # 1) Every game once
+    assert [result.game_index for result in results] == list(range(8))
+    assert len({result.seed for result in results}) == 8
+
+    # 2) Same as playing them here
+    for result in results[:3]:
+        assert result.records == play_game(make_dynamite_game(result.seed), make_dynamite_instruction_set(), max_hands=20)
+
+    # 3) Report
+    assert simulator.report.game_count == 8
+    assert simulator.report.hand_count == sum(len(result.records) for result in results)
+    assert simulator.report.games_per_second > 0
+
+
+def test_simulator_reuse_needs_resettable_factory():
+    """reuse_games refuses a factory whose games a reset wouldn't reproduce - here the deck gets an extra shuffle"""
+    def reshuffled_game(seed):
+        game = make_dynamite_game(seed)
+        game.deck.reset(make_rng(seed + 1))
+        return game
+
+    simulator = Simulator(reshuffled_game, make_dynamite_instruction_set(), game_count=4, worker_count=0, reuse_games=True)
+    with pytest.raises(ValueError):
+        list(simulator.run())
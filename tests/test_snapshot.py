@@ -0,0 +1,120 @@
+from playingcardsplus.MultiplayerGames.deck import DeckBackend
+from playingcardsplus.MultiplayerGames.simulator import play_game
+
+from playingcardsplus.MultiplayerGames.games.dynamite import make_dynamite_game, make_dynamite_instruction_set
+
+import pickle
+
+
+def test_snapshot_restore_round_trip():
+    """
+    Test for the following
+    1) Playing on then restoring puts every pile, hand, score & the hand index back
+    2) Replaying from the restored state plays out exactly like the first time
+    3) Snapshots are small & picklable
+    """
+    instruction_set = make_dynamite_instruction_set()
+    game = make_dynamite_game(seed=21, history_depth=3)
+    game.start_game(instruction_set)
+    snapshot = game.snapshot()
+    piles = (list(game.deck.unused), dict(game.deck.board), list(game.deck.trash_pile), dict(game.deck.player_hands))
+    hands = [dict(player.hand) for player in game.roster]
+
+    # 1) Play on, then go back
+    first_line = [game.next_hand(instruction_set) for _ in range(3)]
+    game.restore(snapshot)
+    assert (list(game.deck.unused), dict(game.deck.board), list(game.deck.trash_pile), dict(game.deck.player_hands)) == piles
+    assert [dict(player.hand) for player in game.roster] == hands
+    assert game.hand_index == 0 and len(game.history) == 0
+    assert game.deck.player_hand_count == sum(player.hand.size for player in game.roster)
+
+    # 2) Same line again
+    second_line = [game.next_hand(instruction_set) for _ in range(3)]
+    assert [record.model_dump() for record in first_line] == [record.model_dump() for record in second_line]
+
+    # 3) Compact
+    assert pickle.loads(pickle.dumps(snapshot)) == snapshot
+    assert len(pickle.dumps(snapshot)) < 1024
+
+
+def test_fork_is_independent():
+    """
+    1) A fork starts from the same state
+    2) Playing the fork doesn't touch the original & vice versa
+    3) The fork has its own RNGs
+    """
+    instruction_set = make_dynamite_instruction_set()
+    game = make_dynamite_game(seed=8)
+    game.start_game(instruction_set)
+
+    # 1) Same state
+    forked = game.fork()
+    assert forked.snapshot() == game.snapshot()
+    assert forked.deck is not game.deck and all(a is not b for a, b in zip(forked.roster, game.roster))
+
+    # 2) Independent
+    before = game.snapshot()
+    play_game(forked, instruction_set, max_hands=5)
+    assert game.snapshot() == before
+    assert forked.snapshot() != before
+    forked_after = forked.snapshot()
+    game.next_hand(instruction_set)
+    assert forked.snapshot() == forked_after
+
+    # 3) Own RNG state - reshuffling the fork leaves the original's stream alone
+    rng_state = game.deck.rng.getstate()
+    forked.deck.reset()
+    assert forked.deck.rng is not game.deck.rng
+    assert game.deck.rng.getstate() == rng_state
+
+
+def test_lazy_shuffle_game():
+    """
+    Test for the following
+    1) A lazily shuffled game is reproducible from its seed & recording hands doesn't settle the pile
+    2) Snapshots don't change what happens next - a game that got snapshotted plays on like one that didn't
+    """
+    instruction_set = make_dynamite_instruction_set()
+
+    # 1) Reproducible & still lazy
+    records = play_game(make_dynamite_game(seed=13, lazy_shuffle=True), instruction_set, max_hands=10)
+    game = make_dynamite_game(seed=13, lazy_shuffle=True)
+    assert [record.model_dump() for record in play_game(game, instruction_set, max_hands=10)] == [record.model_dump() for record in records]
+    assert game.deck.unused.pending_count == game.deck.unused_count
+
+    # 2) Snapshotting settles the pile but draws stay the same
+    game = make_dynamite_game(seed=13, lazy_shuffle=True)
+    game.start_game(instruction_set)
+    snapshot = game.snapshot()
+    assert game.deck.unused.pending_count == 0
+    played = [game.next_hand(instruction_set) for _ in range(len(records) - 1)]
+    assert [record.model_dump() for record in played] == [record.model_dump() for record in records[1:]]
+    game.restore(snapshot)
+    assert game.snapshot() == snapshot
+
+
+def test_bitset_backend_game():
+    """
+    Test for the following
+    1) A game on the bitset backend plays out exactly like one on the piles backend
+    2) Snapshot, restore & fork work on it - the fork gets its own piles
+    """
+    instruction_set = make_dynamite_instruction_set()
+
+    # 1) Same game
+    records = play_game(make_dynamite_game(seed=17), instruction_set, max_hands=15)
+    game = make_dynamite_game(seed=17, backend=DeckBackend.BITSET)
+    assert [record.model_dump() for record in play_game(game, instruction_set, max_hands=15)] == [record.model_dump() for record in records]
+
+    # 2) Snapshot, restore & fork
+    game = make_dynamite_game(seed=17, backend=DeckBackend.BITSET)
+    game.start_game(instruction_set)
+    snapshot = game.snapshot()
+    forked = game.fork()
+    forked.next_hand(instruction_set)
+    assert game.snapshot() == snapshot
+    game.next_hand(instruction_set)
+    assert game.snapshot() == forked.snapshot()
+    game.restore(snapshot)
+    assert game.snapshot() == snapshot
+    assert game.deck.unused_count + game.deck.board_count + game.deck.trash_pile_count + game.deck.player_hand_count == len(game.deck)
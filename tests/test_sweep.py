@@ -0,0 +1,112 @@
+from playingcardsplus.MultiplayerGames.rules import Rules, RuleViolation, RuleViolationKind
+from playingcardsplus.MultiplayerGames.sweep import Sweep, STATISTICS, rule_variants, rules_params, rules_key
+
+from playingcardsplus.MultiplayerGames.games.dynamite import DYNAMITE_RULES, make_dynamite_game_for_rules, make_dynamite_instruction_set
+
+import pytest
+
+
+AXES = {
+    "cards_per_player_early_hands": [[5], [7], [30]], # 30 cards for up to 5 players can't be dealt
+    "player_range": [(2, 3), (3, 5), (4, 2)], # (4, 2) is backwards
+}
+
+
+def make_sweep(**kwargs) -> Sweep:
+    return Sweep(
+        game_factory=make_dynamite_game_for_rules,
+        instruction_implementer=make_dynamite_instruction_set(),
+        base=rules_params(DYNAMITE_RULES),
+        axes=AXES,
+        games_per_variant=6,
+        max_hands=40,
+        **kwargs,
+    )
+
+
+def test_rule_variants_and_keys():
+    """
+    1) Every combination of the axes, last axis fastest
+    2) Same Rules -> same key, different Rules or settings -> different key
+    """
+    # 1)
+    variants = list(rule_variants({"deck_size": 52}, {"a": [1, 2], "b": [3, 4]}))
+    assert [(variant["a"], variant["b"]) for variant in variants] == [(1, 3), (1, 4), (2, 3), (2, 4)]
+    assert all(variant["deck_size"] == 52 for variant in variants)
+    # 2)
+    rebuilt = Rules(**rules_params(DYNAMITE_RULES))
+    assert rules_key(rebuilt) == rules_key(DYNAMITE_RULES)
+    assert rules_key(DYNAMITE_RULES, 10) != rules_key(DYNAMITE_RULES, 20)
+    assert rules_key(DYNAMITE_RULES.model_copy(update={"deck_size": 54})) != rules_key(DYNAMITE_RULES)
+
+
+def test_sweep_prunes_and_aggregates():
+    """
+    1) Invalid variants are pruned with their violations & never played
+    2) One row per valid variant & player count in its range, every column the same length
+    3) Statistics make sense for every row
+    4) Same table with a process pool
+    """
+    result = make_sweep(worker_count=0).run()
+    # 1)
+    assert result.report.variant_count == 9
+    pruned = {(tuple(swept["cards_per_player_early_hands"]), swept["player_range"]): {violation.kind for violation in violations}
+              for swept, violations in result.pruned}
+    assert RuleViolationKind.PLAYER_RANGE in pruned[((5,), (4, 2))]
+    assert RuleViolationKind.EARLY_HAND_CARDS in pruned[((30,), (3, 5))]
+    # 2)
+    assert 9 - len(result.pruned) == 4
+    assert sorted(zip(result.columns["player_range"], result.columns["player_count"])) == sorted([((2, 3), 2), ((2, 3), 3), ((3, 5), 3), ((3, 5), 4), ((3, 5), 5)] * 2)
+    assert list(result.columns) == ["rules_key", "player_count", *AXES, *STATISTICS]
+    assert all(len(column) == len(result) for column in result.columns.values())
+    assert len(set(result.columns["rules_key"])) == len(result) == 10
+    assert result.report.simulated_game_count == 10 * 6
+    # 3)
+    for row in result.rows():
+        assert row["game_count"] == 6
+        assert 1 <= row["min_hands"] <= row["mean_hands"] <= row["max_hands"] <= 40
+        assert 0 <= row["exhaustion_rate"] <= 1 and 0 <= row["hand_limit_rate"] <= 1
+    # 4)
+    assert make_sweep(worker_count=2).run().columns == result.columns
+
+
+def test_sweep_cache_is_incremental(tmp_path):
+    """
+    1) First run plays every valid variant & writes them to the cache
+    2) Rerun plays nothing & gives the same table
+    3) A wider sweep only plays the new variants
+    """
+    cache_path = str(tmp_path / "sweep.jsonl")
+    # 1)
+    first = make_sweep(worker_count=0, cache_path=cache_path).run()
+    assert first.report.cached_count == 0
+    # 2)
+    again = make_sweep(worker_count=0, cache_path=cache_path).run()
+    assert again.report.cached_count == len(first) and again.report.simulated_game_count == 0
+    assert again.columns == first.columns
+    # 3)
+    wider = Sweep(
+        game_factory=make_dynamite_game_for_rules, instruction_implementer=make_dynamite_instruction_set(), base=rules_params(DYNAMITE_RULES),
+        axes={**AXES, "cards_per_player_early_hands": AXES["cards_per_player_early_hands"] + [[6]]},
+        games_per_variant=6, max_hands=40, worker_count=0, cache_path=cache_path,
+    ).run()
+    assert wider.report.cached_count == len(first)
+    assert wider.report.simulated_game_count == (len(wider) - len(first)) * 6
+
+
+def test_sweep_player_counts():
+    """
+    1) player_counts picks which player counts get played, variants none of them fit are pruned
+    2) games_per_variant has to be at least 1
+    """
+    # 1)
+    result = make_sweep(worker_count=0, player_counts=[2, 5]).run()
+    assert sorted(set(zip(result.columns["player_range"], result.columns["player_count"]))) == [((2, 3), 2), ((3, 5), 5)]
+    assert result.report.pruned_count == 5
+    result = make_sweep(worker_count=0, player_counts=[2]).run()
+    assert set(result.columns["player_range"]) == {(2, 3)}
+    assert result.report.pruned_count == 7
+    assert all(violations == (RuleViolation(RuleViolationKind.PLAYER_RANGE, field="player_counts"),) for swept, violations in result.pruned if swept["player_range"] == (3, 5) and swept["cards_per_player_early_hands"] != [30])
+    # 2)
+    with pytest.raises(ValueError):
+        Sweep(make_dynamite_game_for_rules, make_dynamite_instruction_set(), base=rules_params(DYNAMITE_RULES), axes=AXES, games_per_variant=0)
@@ -0,0 +1,104 @@
+from playingcardsplus.MultiplayerGames.games.texas_holdem import TexasHoldem, HoldemInstructionSet, HOLDEM_RULES, HOLDEM_OPERATIONS
+from playingcardsplus.MultiplayerGames.dealer import Dealer, DealerBehavior
+from playingcardsplus.MultiplayerGames.deck import MultiPlayerDeck
+from playingcardsplus.MultiplayerGames.player import Player, PlayerBehavior
+from playingcardsplus.custom_error import RuleViolationError
+from playingcardsplus.rng import make_rng
+
+from collections import defaultdict
+import pytest
+
+
+def make_players(count: int):
+    return [
+        Player(name="player_{}".format(i), initial_hand=defaultdict(int), initial_score=0, behvior=PlayerBehavior(name="check", soul={"model": lambda arg: []}))
+        for i in range(count)
+    ]
+
+
+def make_holdem_game(seed: int, player_count: int = 3) -> TexasHoldem:
+    roster = make_players(player_count)
+    return TexasHoldem(
+        name="Texas Hold'em",
+        dealer=Dealer(name="Ordinary Dealer", initial_behavior=DealerBehavior(name="Normal Fair", fair=True)),
+        deck=MultiPlayerDeck(name="French_Multi_Player_Deck_NoJoker", joker_count=0, rng=make_rng(seed)),
+        roster=roster,
+        rules=HOLDEM_RULES,
+        scoreboard={player: 0 for player in roster},
+        game_data_path="",
+        seed=seed,
+    )
+
+
+def test_holdem_betting():
+    """
+    Test for the following
+    1) Bets add up per player & into the pot
+    2) A folded player can't bet, check or fold again
+    3) Bets have to be a positive number of chips
+    4) Another game's players start with nothing in the pot
+    """
+    instruction_set = HoldemInstructionSet(HOLDEM_OPERATIONS)
+    compiled = instruction_set.compile()
+    handlers = dict(zip(compiled.operations, compiled.handlers))
+    players = make_players(3)
+
+    # 1) Betting
+    handlers["bet"](players[0], None, None, 10)
+    handlers["bet"](players[1], None, None, 10)
+    handlers["check"](players[2], None, None, None)
+    assert handlers["bet"](players[0], None, None, 20) == 30
+    assert players[0].stake == 30
+    assert instruction_set.pot(players) == 40
+
+    # 2) Folding
+    handlers["fold"](players[1], None, None, None)
+    assert players[1].folded and not players[0].folded
+    for operation, aux in (("bet", 5), ("check", None), ("fold", None)):
+        with pytest.raises(RuleViolationError):
+            handlers[operation](players[1], None, None, aux)
+    assert instruction_set.pot(players) == 40
+
+    # 3) Bet amounts
+    for aux in (0, -5, 2.5, True, None):
+        with pytest.raises(RuleViolationError):
+            handlers["bet"](players[2], None, None, aux)
+
+    # 4) Next game
+    next_players = make_players(3)
+    assert instruction_set.pot(next_players) == 0
+    assert not any(player.folded for player in next_players)
+
+
+def test_holdem_betting_follows_game():
+    """
+    Test for the following
+    1) Snapshots & restore rewind the pot & who's folded
+    2) A fork starts with the same pot & folds, and betting on it leaves the original alone
+    3) Reset clears the pot & lets a folded player back in
+    """
+    instruction_set = HoldemInstructionSet(HOLDEM_OPERATIONS)
+    compiled = instruction_set.compile()
+    handlers = dict(zip(compiled.operations, compiled.handlers))
+    game = make_holdem_game(seed=4)
+    game.start_game(instruction_set)
+    handlers["bet"](game.roster[0], None, None, 10)
+
+    # 1) Snapshot & restore
+    snapshot = game.snapshot()
+    handlers["bet"](game.roster[0], None, None, 5)
+    handlers["fold"](game.roster[1], None, None, None)
+    game.restore(snapshot)
+    assert instruction_set.pot(game.roster) == 10 and not game.roster[1].folded
+    handlers["fold"](game.roster[1], None, None, None)
+
+    # 2) Fork
+    forked = game.fork()
+    assert instruction_set.pot(forked.roster) == 10 and forked.roster[1].folded
+    handlers["bet"](forked.roster[2], None, None, 7)
+    assert instruction_set.pot(forked.roster) == 17 and instruction_set.pot(game.roster) == 10
+
+    # 3) Reset
+    game.reset(5)
+    assert instruction_set.pot(game.roster) == 0 and not any(player.folded for player in game.roster)
+    handlers["check"](game.roster[1], None, None, None)
@@ -0,0 +1,84 @@
+from playingcardsplus.MultiplayerGames.instructions import Instruction
+from playingcardsplus.MultiplayerGames.simulator import play_game
+from playingcardsplus.rng import derive_seed
+
+from playingcardsplus.MultiplayerGames.games.dynamite import make_dynamite_game, make_dynamite_instruction_set, dynamite_policy
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from playingcardsplus.MultiplayerGames.vector_env import VectorEnv, ShardedVectorEnv
+
+
+def policy_actions(env):
+    """Rules-based Dynamite decisions for every env's current player"""
+    actions = []
+    for game, player_index in zip(env.games, env.state.current_player):
+        player = game.roster[player_index]
+        actions.append(dynamite_policy((game.game_state(), player.hand, [], [])))
+    return actions
+
+
+def test_vector_env_steps_and_resets():
+    """
+    Test for the following
+    1) reset() gives one observation per env & every env waits on its first player
+    2) A finished game matches playing the same seed on its own, then the env starts over on a new game
+    3) Rewards add up to the change in scores
+    4) reset() moves every env on to a game it hasn't played, reset(seed) starts over from that root seed
+    """
+    num_envs, max_hands = 3, 4
+    env = VectorEnv(make_dynamite_game, make_dynamite_instruction_set(), num_envs=num_envs, root_seed=9, max_hands=max_hands)
+
+    # 1) Reset
+    observation = env.reset()
+    assert observation.planes.shape == (num_envs,) + env.encoder.spec.plane_shape
+    assert list(env.state.current_player) == [0] * num_envs
+    assert [game.seed for game in env.games] == [derive_seed(9, env_index, 0) for env_index in range(num_envs)]
+
+    # 2) & 3) Play until every env has finished a game
+    finished = {}
+    while len(finished) < num_envs:
+        previous_scores = env.state.scores.copy()
+        result = env.step(policy_actions(env))
+        for env_index in range(num_envs):
+            if result.dones[env_index]:
+                finished.setdefault(env_index, result.infos[env_index])
+                last_scores = result.infos[env_index]["records"][-1].scores
+                assert list(previous_scores[env_index] + result.rewards[env_index]) == [last_scores["player_{}".format(i)] for i in range(3)]
+            else:
+                assert np.array_equal(previous_scores[env_index] + result.rewards[env_index], env.state.scores[env_index])
+
+    for env_index, info in finished.items():
+        expected = play_game(make_dynamite_game(info["seed"]), make_dynamite_instruction_set(), max_hands=max_hands)
+        assert [record.model_dump() for record in info["records"]] == [record.model_dump() for record in expected]
+    assert all(episode >= 1 for episode in env.state.episode)
+    assert env.games[0].seed == derive_seed(9, 0, int(env.state.episode[0]))
+
+    # 4) Resetting again
+    episodes = env.state.episode.copy()
+    env.reset()
+    assert list(env.state.episode) == list(episodes + 1)
+    assert [game.seed for game in env.games] == [derive_seed(9, env_index, int(episodes[env_index]) + 1) for env_index in range(num_envs)]
+    env.reset(seed=9)
+    assert list(env.state.episode) == [0] * num_envs
+    assert [game.seed for game in env.games] == [derive_seed(9, env_index, 0) for env_index in range(num_envs)]
+
+
+def test_sharded_vector_env_matches():
+    """Sharding across processes gives the same observations, rewards & dones as the in-process env"""
+    instruction_set = make_dynamite_instruction_set()
+    env = VectorEnv(make_dynamite_game, instruction_set, num_envs=4, max_hands=3)
+    with ShardedVectorEnv(make_dynamite_game, instruction_set, num_envs=4, shard_count=2, max_hands=3) as sharded:
+        assert np.array_equal(env.reset().planes, sharded.reset().planes)
+        for _ in range(12):
+            actions = policy_actions(env)
+            local, remote = env.step(actions), sharded.step(actions)
+            assert np.array_equal(local.observation.planes, remote.observation.planes)
+            assert np.array_equal(local.observation.scalars, remote.observation.scalars)
+            assert np.array_equal(local.rewards, remote.rewards)
+            assert np.array_equal(local.dones, remote.dones)
+            assert np.array_equal(env.state.scores, sharded.state.scores)
+        assert np.array_equal(env.reset(seed=5).planes, sharded.reset(seed=5).planes)
+        assert np.array_equal(env.state.episode, sharded.state.episode)